@@ -0,0 +1,261 @@
+"""API HTTP/JSON tanpa UI untuk pencarian multi-sumber.
+
+    search-api --workers 4 --port 8000
+    uvicorn api:app --workers 4
+
+    GET /search?q=deep+learning&max_results=20&sources=CrossRef,Semantic+Scholar&scorer=...
+    GET /search?q=(cnn+OR+rnn)+image;+transformer&combine=intersect
+    GET /search?q=deep+learning&approximate=1   # top-k perkiraan, sumber berhenti lebih awal
+    GET /search/stream?q=...            # NDJSON; SSE jika Accept: text/event-stream atau format=sse
+    GET /health                         # status circuit breaker dan latensi per sumber
+
+API key ScienceDirect / IEEE Xplore dikirim lewat header X-ScienceDirect-Key dan
+X-IEEE-Key. Tanpa parameter sources dipakai semua sumber remote; indeks lokal ("Local")
+hanya jika dipilih. Beberapa kata kunci (OR, "|", ";") dicari sekaligus dan digabung menurut
+combine=union|intersect; skor per kata kunci ada di field Scores. Sumber yang melewati
+batas waktu adaptifnya dicantumkan di "incomplete" (hasil yang sudah masuk tetap dipakai).
+Adapter sumber, cache dan ranking sama dengan yang dipakai app.py; setiap worker uvicorn
+punya loop, cache memori dan circuit breaker sendiri, sedangkan cache SQLite dipakai bersama.
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from metrics import get_metrics
+from query import COMBINE_MODES, UNION, expand_query
+from ranking import DEFAULT_SCORER, SCORERS
+from result_store import ResultEntry, new_shared_store, query_key
+from search import TopKMerge, iter_search
+from sources import SOURCES, default_sources
+
+MAX_RESULTS_LIMIT = 1000
+DEFAULT_MAX_RESULTS = 10
+API_KEY_HEADERS = {"ScienceDirect": "x-sciencedirect-key", "IEEE Xplore": "x-ieee-key"}
+HEALTH_STATUS = {"closed": "ok", "half-open": "degraded", "open": "down"}
+BOOLEAN_VALUES = {"1": True, "true": True, "yes": True, "0": False, "false": False, "no": False}
+
+_results = new_shared_store()
+
+
+class BadRequest(Exception):
+    pass
+
+
+# Parameter pencarian dari query string; BadRequest jika tidak valid
+def search_params(request):
+    params = request.query_params
+    keyword = params.get("q", "").strip()
+    if not keyword:
+        raise BadRequest("parameter q wajib diisi")
+    try:
+        max_results = int(params.get("max_results", DEFAULT_MAX_RESULTS))
+    except ValueError:
+        raise BadRequest("max_results harus bilangan bulat")
+    if not 1 <= max_results <= MAX_RESULTS_LIMIT:
+        raise BadRequest(f"max_results harus antara 1 dan {MAX_RESULTS_LIMIT}")
+    scorer = params.get("scorer", DEFAULT_SCORER)
+    if scorer not in SCORERS:
+        raise BadRequest(f"scorer tidak dikenal: {scorer}")
+    sources = default_sources()
+    if params.get("sources"):
+        sources = [name.strip() for name in params["sources"].split(",") if name.strip()]
+        unknown = [name for name in sources if name not in SOURCES]
+        if unknown:
+            raise BadRequest(f"sumber tidak dikenal: {', '.join(unknown)}")
+    combine = params.get("combine", UNION)
+    if combine not in COMBINE_MODES:
+        raise BadRequest(f"combine harus salah satu dari: {', '.join(COMBINE_MODES)}")
+    approximate = BOOLEAN_VALUES.get(params.get("approximate", "0").lower())
+    if approximate is None:
+        raise BadRequest("approximate harus 1/0, true/false atau yes/no")
+    api_keys = {name: request.headers.get(header) for name, header in API_KEY_HEADERS.items()}
+    return keyword, max_results, sources, scorer, combine, api_keys, approximate
+
+
+def _error(message, status=400):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def _records(results):
+    return [ref.to_dict() for ref in results]
+
+
+def _active_sources(sources, api_keys):
+    return [name for name in sources if SOURCES[name].is_enabled(api_keys.get(name))]
+
+
+# Pencarian penuh (sinkron, dijalankan di threadpool); hasil sama dipakai ulang dari result store
+def _run_search(keyword, max_results, sources, scorer, combine, api_keys, approximate):
+    key = query_key(keyword, max_results, _active_sources(sources, api_keys), scorer, combine,
+                    api_keys, approximate)
+    entry = _results.get(key)
+    if entry is not None:
+        return entry.results, {}, [], True
+    merger = TopKMerge(keyword, max_results, scorer, combine, approximate)
+    errors, partial = {}, []
+    for batch in iter_search(keyword, max_results, api_keys, sources=sources,
+                             should_stop=merger.should_stop):
+        if batch.error is not None:
+            errors[batch.source] = batch.error
+            if batch.partial:
+                partial.append(batch.source)
+            continue
+        merger.add(batch)
+    results = merger.results()
+    # Hasil yang belum lengkap (sumber terlambat) tidak disimpan untuk permintaan berikutnya
+    if results and not partial:
+        _results.put(key, ResultEntry(results))
+    return results, errors, partial, False
+
+
+async def search(request):
+    try:
+        keyword, max_results, sources, scorer, combine, api_keys, approximate = \
+            search_params(request)
+    except BadRequest as e:
+        return _error(str(e))
+    start = time.monotonic()
+    with get_metrics().timer("api_request_seconds", endpoint="search"):
+        results, errors, partial, cached = await run_in_threadpool(
+            _run_search, keyword, max_results, sources, scorer, combine, api_keys, approximate)
+    return JSONResponse({
+        "query": keyword, "terms": list(expand_query(keyword)), "max_results": max_results,
+        "scorer": scorer, "combine": combine, "approximate": approximate, "cached": cached,
+        "elapsed": time.monotonic() - start, "errors": errors,
+        "incomplete": sorted(set(partial)), "results": _records(results),
+    })
+
+
+# Event per batch sumber, lalu satu event "done" berisi hasil gabungan yang sudah diperingkat
+def _stream_events(keyword, max_results, sources, scorer, combine, api_keys, approximate):
+    start = time.monotonic()
+    merger = TopKMerge(keyword, max_results, scorer, combine, approximate)
+    errors, partial = {}, []
+    for batch in iter_search(keyword, max_results, api_keys, sources=sources,
+                             should_stop=merger.should_stop):
+        if batch.error is not None:
+            errors[batch.source] = batch.error
+            if batch.partial:
+                partial.append(batch.source)
+            yield "error", {"source": batch.source, "keyword": batch.keyword, "error": batch.error,
+                            "partial": batch.partial, "elapsed": batch.elapsed}
+            continue
+        merger.add(batch)
+        yield "batch", {"source": batch.source, "keyword": batch.keyword,
+                        "complete": batch.complete, "elapsed": batch.elapsed,
+                        "results": _records(batch.results)}
+    results = merger.results()
+    yield "done", {"query": keyword, "elapsed": time.monotonic() - start, "errors": errors,
+                   "incomplete": sorted(set(partial)), "results": _records(results)}
+
+
+# Iterasi generator sinkron di thread. Klien yang memutus koneksi tidak menunggu next()
+# yang sedang berjalan; generator baru ditutup (membatalkan sumber yang belum selesai)
+# setelah next() itu kembali, di thread terpisah, sehingga close() tidak pernah berjalan
+# bersamaan dengan next() ("generator already executing")
+async def iterate_events(events):
+    loop = asyncio.get_running_loop()
+    lock = threading.Lock()
+    done = object()
+
+    def step():
+        with lock:
+            return next(events, done)
+
+    def close():
+        with lock:
+            events.close()
+
+    try:
+        while True:
+            item = await loop.run_in_executor(None, step)
+            if item is done:
+                return
+            yield item
+    finally:
+        threading.Thread(target=close, name="stream-close", daemon=True).start()
+
+
+def _ndjson(event, data):
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def search_stream(request):
+    try:
+        params = search_params(request)
+    except BadRequest as e:
+        return _error(str(e))
+    sse = (request.query_params.get("format") == "sse"
+           or "text/event-stream" in request.headers.get("accept", ""))
+    encode = _sse if sse else _ndjson
+
+    async def body():
+        get_metrics().incr("api_streams_total", format="sse" if sse else "ndjson")
+        stream = iterate_events(_stream_events(*params))
+        try:
+            async for event, data in stream:
+                yield encode(event, data)
+        finally:
+            await stream.aclose()
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type,
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def source_health(name, source, timings, failures):
+    state = source.breaker.state
+    latency = timings.get(name, {})
+    return {
+        "status": HEALTH_STATUS[state], "breaker": state, "remote": source.remote,
+        "requires_key": source.requires_key, "failures": failures.get(name, 0),
+        "latency_p50": latency.get("p50"), "latency_p95": latency.get("p95"),
+    }
+
+
+async def health(request):
+    metrics = get_metrics()
+    timings = {row["source"]: row for row in metrics.timings()
+               if row["metric"] == "source_latency_seconds"}
+    failures = {row["source"]: row["value"] for row in metrics.counters()
+                if row["metric"] == "source_failures_total"}
+    sources = {name: source_health(name, source, timings, failures)
+               for name, source in SOURCES.items()}
+    statuses = {item["status"] for item in sources.values()}
+    status = "ok" if statuses == {"ok"} else "down" if statuses == {"down"} else "degraded"
+    return JSONResponse({"status": status, "pid": os.getpid(), "sources": sources})
+
+
+app = Starlette(routes=[
+    Route("/search", search),
+    Route("/search/stream", search_stream),
+    Route("/health", health),
+])
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API HTTP/JSON pencarian jurnal multi-sumber")
+    parser.add_argument("--host", default=os.environ.get("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("API_WORKERS", "1")),
+                        help="jumlah proses worker uvicorn")
+    args = parser.parse_args(argv)
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
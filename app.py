@@ -1,448 +1,272 @@
+import time
+
 import streamlit as st
 import requests
-import pandas as pd
-from concurrent.futures import ThreadPoolExecutor
-from fuzzywuzzy import fuzz
-from scholarly import scholarly
+
+from assets import page_head
+from metrics import get_metrics, start_exporters
 
 # Konfigurasi halaman
 st.set_page_config(page_title="Pencarian Jurnal Ilmiah", page_icon="🔍", layout="centered")
 
-# Gaya CSS untuk tampilan responsif
-st.markdown("""
-    <style>
-        :root {
-            --primary: #6a11ff;
-            --secondary: #2575fc;
-            --accent: #ff2d55;
-            --background: linear-gradient(45deg, #f3f7ff 0%, #f9fbfd 100%);
-            --text: #2c3e50;
-            --card-bg: rgba(255, 255, 255, 0.95);
-            --shadow: 0 8px 32px rgba(31, 38, 135, 0.15);
-        }
-
-        @keyframes float {
-            0% { transform: translateY(0px); }
-            50% { transform: translateY(-10px); }
-            100% { transform: translateY(0px); }
-        }
-
-        .title {
-            text-align: center;
-            background: linear-gradient(45deg, var(--primary), var(--secondary));
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            font-size: 2.5rem;
-            font-weight: 800;
-            margin: 1.5rem 0;
-            letter-spacing: -1px;
-            animation: float 4s ease-in-out infinite;
-        }
-
-        .result-card {
-            background: var(--card-bg);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 1.5rem;
-            margin: 1rem 0;
-            box-shadow: var(--shadow);
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            border: 1px solid rgba(255, 255, 255, 0.18);
-            position: relative;
-            overflow: hidden;
-        }
-
-        .result-card:hover {
-            transform: translateY(-5px) scale(1.02);
-            box-shadow: 0 12px 40px rgba(31, 38, 135, 0.25);
-        }
-
-        .result-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(
-                90deg,
-                transparent,
-                rgba(255, 255, 255, 0.4),
-                transparent
-            );
-            transition: 0.5s;
-        }
-
-        .result-card:hover::before {
-            left: 100%;
-        }
-
-        .result-card h4 {
-            color: var(--primary);
-            margin-bottom: 0.8rem;
-            font-size: 1.3rem;
-            font-weight: 700;
-        }
-
-        .result-card p {
-            margin: 0.4rem 0;
-            color: var(--text);
-            font-size: 0.95rem;
-        }
-
-        .result-card a {
-            position: relative;
-            display: inline-block;
-            margin-top: 1rem;
-            padding: 0.6rem 1.5rem;
-            background: linear-gradient(45deg, var(--primary), var(--secondary));
-            color: white !important;
-            border-radius: 8px;
-            overflow: hidden;
-            transition: 0.4s;
-            border: none;
-            font-weight: 600;
-            text-decoration: none !important;
-        }
-
-        .result-card a::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(
-                90deg,
-                transparent,
-                rgba(255, 255, 255, 0.4),
-                transparent
-            );
-            transition: 0.5s;
-        }
-
-        .result-card a:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(var(--primary), 0.3);
-        }
-
-        .result-card a:hover::before {
-            left: 100%;
-        }
-
-        /* Responsive Design */
-        @media (max-width: 768px) {
-            .title {
-                font-size: 2rem;
-            }
-            
-            .result-card {
-                margin: 0.8rem 0;
-                padding: 1.2rem;
-            }
-            
-            .result-card h4 {
-                font-size: 1.1rem;
-            }
-        }
-
-        /* Loading Animation */
-        .loading-spinner {
-            width: 50px;
-            height: 50px;
-            border: 5px solid #f3f3f3;
-            border-top: 5px solid var(--primary);
-            border-radius: 50%;
-            animation: spin 1s linear infinite;
-            margin: 2rem auto;
-        }
-
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-
-        /* Dark Mode Support */
-        @media (prefers-color-scheme: dark) {
-            :root {
-                --background: linear-gradient(45deg, #1a1a1a 0%, #2d2d2d 100%);
-                --text: #ffffff;
-                --card-bg: rgba(40, 40, 40, 0.95);
-                --shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-            }
-            
-            .result-card {
-                border: 1px solid rgba(255, 255, 255, 0.1);
-            }
-        }
-    </style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-    <style>
-        .loading-container {
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 100px; /* Bisa disesuaikan */
-        }
-
-        .blinking {
-            animation: blink 1.5s infinite;
-            font-size: 24px;
-            font-weight: bold;
-            color: #3498db; /* Warna biru */
-        }
-
-        @keyframes blink {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-    </style>
-
-    <div class="loading-container">
-        <h3 class="blinking">🔄 pengetahuan di jari mu - bintang</h3>
-    </div>
-""", unsafe_allow_html=True)
-
-
-# ... (CSS tetap sama seperti sebelumnya)
-
-# Ganti fungsi fuzzy_match dengan:
-# Hapus python-Levenshtein jika ada
-def fuzzy_match(title1, title2):
-    # Gunakan ratio sederhana tanpa token sort
-    return fuzz.ratio(title1.lower(), title2.lower()) if title1 and title2 else 0
+# CSS dan judul dikirim lebih dulu, sebelum inti pencarian diimpor saat cold start
+st.markdown(page_head(), unsafe_allow_html=True)
+
+# Endpoint /metrics (METRICS_PORT) dan dump JSONL (METRICS_DUMP_PATH), sekali per proses
+start_exporters()
+
+# Inti pencarian. Modul berat (pandas, numpy, ekspor, pengayaan, result store) baru
+# diimpor di bagian yang memakainya; lihat benchmarks/import_time.py
+from cache import get_cache  # noqa: E402
+from http_client import get_session  # noqa: E402
+from query import INTERSECT, UNION, expand_query  # noqa: E402
+from ranking import DEFAULT_SCORER, SCORERS  # noqa: E402
+from render import PAGE_SIZE, cards_page_html  # noqa: E402
+from sources import SOURCES, default_sources  # noqa: E402
 
 
 # Fungsi untuk mengecek koneksi
 def check_connection(url):
     try:
-        requests.head(url, timeout=5)
+        get_session().head(url, timeout=5)
         return True
     except requests.ConnectionError:
         return False
 
-# Fungsi pencarian di berbagai sumber
-def search_google_scholar(keyword, max_results):
-    try:
-        results = []
-        search_query = scholarly.search_pubs(keyword)
-        for _ in range(max_results):
-            try:
-                paper = next(search_query)
-                results.append({
-                    "Title": paper['bib'].get('title', 'Unknown'),
-                    "Authors": ", ".join(paper['bib'].get('author', [])),
-                    "Journal": paper['bib'].get('venue', 'Unknown'),
-                    "Year": paper['bib'].get('year', 'N/A'),  # Diperbaiki di sini
-                    "Link": paper.get('pub_url', 'N/A'),
-                    "Source": "Google Scholar"
-                })
-            except StopIteration:
-                break
-        return results
-    except Exception as e:
-        st.error(f"Error Google Scholar: {str(e)}")
-        return []
-def search_crossref(keyword, max_results):
-    try:
-        url = f"https://api.crossref.org/works?query={keyword}&rows={max_results}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return [{
-               "Title": item.get("title", [""])[0] if item.get("title") else "Unknown",
-                "Authors": ", ".join([f"{author.get('given', '')} {author.get('family', '')}" 
-                                    for author in item.get("author", [])]),
-                "Journal": item.get("container-title", ["Unknown"])[0],
-                "Year": item.get("published-print", {}).get("date-parts", [[None]])[0][0],
-                "Link": f"https://doi.org/{item.get('DOI', 'N/A')}",
-                "Source": "CrossRef"
-            } for item in data.get('message', {}).get('items', [])]
-        return []
-    except Exception as e:
-        st.error(f"Error Crossref: {str(e)}")
-        return []
-
-def search_semantic_scholar(keyword, max_results):
-    try:
-        url = f"https://api.semanticscholar.org/graph/v1/paper/search?query={keyword}&limit={max_results}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return [{
-                "Title": item.get("title", "Unknown"),
-                "Authors": ", ".join([a.get("name", "Unknown") for a in item.get("authors", [])]),
-                "Journal": item.get("venue", "Unknown"),
-                "Year": item.get("year", "N/A"),
-                "Link": f"https://www.semanticscholar.org/paper/{item.get('paperId', 'N/A')}",
-                "Source": "Semantic Scholar"
-            } for item in data.get('data', [])]
-        return []
-    except Exception as e:
-        st.error(f"Error Semantic Scholar: {str(e)}")
-        return []
-
-def search_sciencedirect(keyword, max_results, api_key):
-    if not api_key:
-        return []
-    try:
-        url = f"https://api.elsevier.com/content/search/sciencedirect?query={keyword}&count={max_results}"
-        headers = {"X-ELS-APIKey": api_key}
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            return [{
-                "Title": item.get("dc:title", "Unknown"),
-                "Authors": item.get("dc:creator", "Unknown"),
-                "Journal": item.get("prism:publicationName", "Unknown"),
-                "Year": item.get("prism:coverDate", "N/A")[:4],
-                "Link": item.get("link", [{}])[0].get("@href", "N/A"),
-                "Source": "ScienceDirect"
-            } for item in data.get('search-results', {}).get('entry', [])]
-        return []
-    except Exception as e:
-        st.error(f"Error ScienceDirect: {str(e)}")
-        return []
-
-def search_ieee_xplore(keyword, max_results, api_key):
-    if not api_key:
-        return []
-    try:
-        url = f"http://ieeexploreapi.ieee.org/api/v1/search/articles?querytext={keyword}&max_records={max_results}&apikey={api_key}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return [{
-                "Title": item.get("title", "Unknown"),
-                "Authors": ", ".join([author.get("full_name", "Unknown") 
-                                    for author in item.get("authors", [])]),  # Diperbaiki di sini
-                "Journal": item.get("publication_title", "Unknown"),
-                "Year": item.get("publication_year", "N/A"),
-                "Link": item.get("document_link", "N/A"),
-                "Source": "IEEE Xplore"
-            } for item in data.get('articles', [])]
-        return []
-    except Exception as e:
-        st.error(f"Error IEEE Xplore: {str(e)}")
-        return []
-
-# Fungsi pencarian paralel
-def parallel_search(keyword, max_results, sd_key, ieee_key):
-    references = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [
-            executor.submit(search_google_scholar, keyword, max_results),
-            executor.submit(search_crossref, keyword, max_results),
-            executor.submit(search_semantic_scholar, keyword, max_results),
-            executor.submit(search_sciencedirect, keyword, max_results, sd_key),
-            executor.submit(search_ieee_xplore, keyword, max_results, ieee_key)
-        ]
-        
-        for future in futures:
-            try:
-                references.extend(future.result())
-            except Exception as e:
-                st.error(f"Error in search: {str(e)}")
-
-    # Menghitung relevansi dan mengurutkan
-    for ref in references:
-        ref["Relevance"] = fuzz.token_sort_ratio(ref["Title"].lower(), keyword.lower())
-    
-    # Menghapus duplikat berdasarkan judul
-    seen = set()
-    unique_refs = []
-    for ref in references:
-        title = ref["Title"].lower()
-        if title not in seen:
-            seen.add(title)
-            unique_refs.append(ref)
-    
-    return sorted(unique_refs, key=lambda x: x["Relevance"], reverse=True)[:max_results]
-
-# Letakkan bagian CSS di paling atas sebelum elemen UI lainnya
-st.markdown("""
-    <style>
-        :root {
-            --primary: #6a11ff !important;
-            --secondary: #2575fc !important;
-            --accent: #ff2d55 !important;
-            --background: linear-gradient(45deg, #f3f7ff 0%, #f9fbfd 100%) !important;
-            --text: #2c3e50 !important;
-            --card-bg: rgba(255, 255, 255, 0.95) !important;
-            --shadow: 0 8px 32px rgba(31, 38, 135, 0.15) !important;
-        }
-        
-        /* Tambahkan !important untuk override style Streamlit default */
-        .title {
-            text-align: center !important;
-            background: linear-gradient(45deg, var(--primary), var(--secondary)) !important;
-            -webkit-background-clip: text !important;
-            -webkit-text-fill-color: transparent !important;
-            font-size: 2.5rem !important;
-            font-weight: 800 !important;
-            margin: 1.5rem 0 !important;
-            letter-spacing: -1px !important;
-            animation: float 4s ease-in-out infinite !important;
-        }
-        
-        /* Tambahkan meta viewport untuk responsif */
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </style>
-""", unsafe_allow_html=True)
-
-# Kemudian tambahkan element UI
-st.markdown("""
-    <h1 class='title'>🔍 Sistem Pencarian Referensi Jurnal Ilmiah Multi-Sumber dengan Integrasi Google Scholar, CrossRef, dan Semantic Scholar serta Peringkat Relevansi Berbasis Fuzzy Matching</h1>
-    <hr>
-""", unsafe_allow_html=True)
-
 # Sidebar
 #import streamlit as st
 st.sidebar.header("⚙️ Pengaturan Pencarian")
-# Input kata kunci
-keyword = st.sidebar.text_input("Masukkan kata kunci pencarian:")
+# Input kata kunci; beberapa kata kunci dipisah OR, "|" atau ";" dicari sekaligus
+keyword = st.sidebar.text_input("Masukkan kata kunci pencarian:",
+                                help='Beberapa kata kunci: "deep learning OR neural network", '
+                                     '"(cnn | rnn) image" atau "transformer; bert"')
 # Input jumlah hasil dengan batasan yang fleksibel
 max_results = st.sidebar.number_input("Jumlah hasil per sumber:", min_value=1, max_value=1000, value=5, step=1)
+# Pilihan sumber; pilih "Local" untuk mencari di indeks lokal (mis. tanpa akses internet)
+enabled_sources = st.sidebar.multiselect("Sumber pencarian:", list(SOURCES), default=default_sources())
+# Pilihan metode peringkat relevansi
+scorer = st.sidebar.selectbox("Metode peringkat relevansi:", list(SCORERS),
+                              index=list(SCORERS).index(DEFAULT_SCORER))
+# Cara menggabungkan hasil jika ada beberapa kata kunci
+COMBINE_OPTIONS = {"Gabungan (salah satu kata kunci)": UNION, "Irisan (semua kata kunci)": INTERSECT}
+combine = COMBINE_OPTIONS[st.sidebar.radio("Gabungkan hasil beberapa kata kunci:", list(COMBINE_OPTIONS))]
+# Top-k perkiraan: sumber terurut dihentikan lebih awal dari taksiran skor halaman pertamanya
+approximate = st.sidebar.checkbox("⚡ Hentikan sumber lebih awal (top-k perkiraan)",
+                                  help="Lebih sedikit halaman yang diambil; urutan hasil bisa "
+                                       "sedikit berbeda dari peringkat penuh")
 # Input API Key opsional untuk sumber tertentu
 sd_key = st.sidebar.text_input("ScienceDirect API Key (opsional):", type="password")
 ieee_key = st.sidebar.text_input("IEEE Xplore API Key (opsional):", type="password")
 
 st.sidebar.info("🔑 API Key diperlukan untuk ScienceDirect & IEEE Xplore (opsional)")
 
+# Status circuit breaker tiap sumber
+BREAKER_ICONS = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}
+with st.sidebar.expander("📡 Status sumber"):
+    for name, source in SOURCES.items():
+        state = source.breaker.state
+        st.write(f"{BREAKER_ICONS[state]} {name}: {state}")
+
+cache_stats = get_cache().stats
+st.sidebar.caption(
+    f"🗄️ Cache: {cache_stats['memory_hits']} hit memori, {cache_stats['disk_hits']} hit disk, "
+    f"{cache_stats['misses']} miss ({get_cache().hit_rate():.0%})"
+)
+
+TABLE_COLUMNS = ['Title', 'Authors', 'Journal', 'Year', 'Source', 'Relevance']
+# Jeda (detik) antar pemeriksaan progres pengayaan metadata
+ENRICH_POLL_INTERVAL = 0.5
+# Jeda minimum (detik) antar penggabungan dan render hasil sementara selama pencarian
+RESULTS_REFRESH_INTERVAL = 1.0
+
+
+# Hasil pencarian bersama untuk semua sesi dalam proses ini
+@st.cache_resource
+def get_shared_results():
+    from result_store import new_shared_store
+    return new_shared_store()
+
+
+# Result store sesi dibuat saat pertama dipakai, bukan di setiap halaman baru
+def session_results():
+    if "result_store" not in st.session_state:
+        from result_store import new_session_store
+        st.session_state["result_store"] = new_session_store()
+    return st.session_state["result_store"]
+
+
+# Menampilkan tabel dan kartu hasil; hanya `visible` kartu pertama yang dibangun.
+# `df` diberikan jika DataFrame sudah ada di result store
+def render_results(container, results, results_key, visible, df=None):
+    from records import score_columns, to_frame
+    metrics = get_metrics()
+    if df is None:
+        with metrics.timer("stage_seconds", stage="dataframe"):
+            df = to_frame(results, TABLE_COLUMNS + ["Scores"])
+    with container, metrics.timer("stage_seconds", stage="render"):
+        # Tampilkan tabel; query dengan beberapa kata kunci mendapat kolom skor per kata kunci
+        st.subheader("📊 Hasil Pencarian Terstruktur")
+        st.dataframe(df[TABLE_COLUMNS + score_columns(df.columns)], hide_index=True)
+
+        # Tampilkan kartu hasil
+        st.subheader("📚 Tampilan Hasil Detail")
+        st.markdown(cards_page_html(results_key, results, visible), unsafe_allow_html=True)
+    return df
+
+
+def load_more_cards():
+    st.session_state["visible_cards"] += PAGE_SIZE
+
+
 if st.sidebar.button("🚀 Jalankan Pencarian"):
+    from result_store import ResultEntry, query_key
+    from search import TopKMerge, iter_search
+
+    api_keys = {"ScienceDirect": sd_key, "IEEE Xplore": ieee_key}
+    active_sources = [name for name in enabled_sources if SOURCES[name].is_enabled(api_keys.get(name))]
+    search_key = query_key(keyword, max_results, active_sources, scorer, combine, api_keys,
+                           approximate)
+    store, shared = session_results(), get_shared_results()
+    # Pencarian yang sama (di sesi ini atau sesi lain) dipakai ulang tanpa menghubungi sumber;
+    # hasil yang belum lengkap (sumber terlambat) dicari ulang
+    entry = store.get(search_key) or shared.get(search_key)
+    if entry is not None and entry.partial:
+        entry = None
     if not keyword:
         st.warning("Silakan masukkan kata kunci pencarian!")
+    elif entry is not None:
+        store.put(search_key, entry)
+        st.session_state["active_search"] = search_key
     else:
-        with st.spinner("🕵️‍♂️ Mencari di berbagai database jurnal..."):
-            results = parallel_search(keyword, max_results, sd_key, ieee_key)
-            
-            if results:
-                st.success(f"🎉 Ditemukan {len(results)} hasil relevan!")
-                df = pd.DataFrame(results)
-                
-                # Tampilkan tabel
-                st.subheader("📊 Hasil Pencarian Terstruktur")
-                st.dataframe(df[['Title', 'Authors', 'Journal', 'Year', 'Source', 'Relevance']])
-                
-                # Tampilkan kartu hasil
-                st.subheader("📚 Tampilan Hasil Detail")
-                for idx, row in df.iterrows():
-                    st.markdown(f"""
-                    <div class="result-card">
-                        <h4>{row['Title']}</h4>
-                        <p><b>Penulis:</b> {row['Authors']}</p>
-                        <p><b>Jurnal:</b> {row['Journal']} ({row['Year']})</p>
-                        <p><b>Sumber:</b> {row['Source']} | Relevansi: {row['Relevance']}%</p>
-                        <a href="{row['Link']}" target="_blank">📖 Buka Artikel</a>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Ekspor hasil
-                st.subheader("💾 Ekspor Hasil")
-                st.download_button("Unduh sebagai CSV", df.to_csv(index=False), "hasil_pencarian.csv")
-                st.download_button("Unduh sebagai JSON", df.to_json(indent=2), "hasil_pencarian.json")
-            else:
-                st.error("😞 Tidak ditemukan hasil yang sesuai")
\ No newline at end of file
+        terms = expand_query(keyword)
+        multi = len(terms) > 1
+        if multi:
+            st.caption("🔀 Kata kunci: " + " · ".join(terms))
+        status = st.empty()
+        results_area = st.empty()
+        merger = TopKMerge(keyword, max_results, scorer, combine, approximate)
+        results = []
+        partial = []
+        last_refresh = 0.0
+        with st.spinner("🕵️‍♂️ Mencari di berbagai database jurnal..."), \
+                get_metrics().timer("query_seconds"):
+            # Hasil sementara ditampilkan saat batch pertama tiba, lalu paling sering tiap
+            # RESULTS_REFRESH_INTERVAL detik; batch lain hanya dimasukkan ke heap top-k
+            for batch in iter_search(keyword, max_results, api_keys, sources=enabled_sources,
+                                     should_stop=merger.should_stop):
+                if batch.error is not None:
+                    label = f"{batch.source} ({batch.keyword})" if multi else batch.source
+                    if batch.partial:
+                        partial.append(label)
+                        st.warning(f"⏱️ {label} {batch.error}, hasilnya belum lengkap")
+                    else:
+                        st.error(f"Error {label}: {batch.error}")
+                    continue
+                if not batch.results:
+                    continue
+                merger.add(batch)
+                if time.monotonic() - last_refresh < RESULTS_REFRESH_INTERVAL:
+                    continue
+                results = merger.results()
+                progress = "selesai" if batch.complete else "mengirim hasil"
+                status.info(f"⏳ {batch.source} {progress} ({batch.elapsed:.1f} detik), "
+                            f"{len(results)} hasil sementara...")
+                render_results(results_area.container(), results, None, PAGE_SIZE)
+                last_refresh = time.monotonic()
+            results = merger.results()
+
+        # Hasil akhir disimpan di result store agar interaksi widget tidak memicu pencarian ulang
+        results_area.empty()
+        if results:
+            entry = ResultEntry(results, partial)
+            store.put(search_key, entry)
+            if not partial:
+                shared.put(search_key, entry)
+            st.session_state["active_search"] = search_key
+            status.empty()
+        else:
+            st.session_state.pop("active_search", None)
+            status.error("😞 Tidak ditemukan hasil yang sesuai")
+
+entry = None
+if "active_search" in st.session_state:
+    entry = session_results().get(st.session_state["active_search"])
+if entry is not None:
+    from export import EXPORTERS, export_file, get_cached_export
+    from result_store import SORT_OPTIONS
+
+    # Urutan, filter dan paginasi dihitung dari hasil tersimpan, tanpa pencarian ulang
+    sort_col, source_col, text_col = st.columns([1, 2, 2])
+    sort_by = sort_col.selectbox("Urutkan:", list(SORT_OPTIONS))
+    all_sources = entry.sources()
+    shown_sources = source_col.multiselect("Filter sumber:", all_sources, default=all_sources)
+    title_filter = text_col.text_input("Filter judul:")
+    year_range = entry.year_range()
+    years = None
+    if year_range is not None and year_range[0] < year_range[1]:
+        years = st.slider("Tahun:", year_range[0], year_range[1], year_range)
+        if tuple(years) == year_range:
+            years = None
+    rendered_version = entry.version
+    view = entry.view(sort_by, None if len(shown_sources) == len(all_sources) else shown_sources,
+                      years, title_filter)
+    results = view.results
+    if st.session_state.get("visible_view") != view.filter_key:
+        st.session_state["visible_view"] = view.filter_key
+        st.session_state["visible_cards"] = PAGE_SIZE
+
+    st.success(f"🎉 Ditemukan {len(entry.results)} hasil relevan!"
+               + (f" ({len(results)} sesuai filter)" if len(results) < len(entry.results) else ""))
+    if entry.partial:
+        st.caption(f"⏱️ Belum lengkap, melewati batas waktu: {', '.join(entry.partial)}. "
+                   "Jalankan pencarian lagi untuk mencoba ulang.")
+    visible = st.session_state["visible_cards"]
+    render_results(st.container(), results, view.key, visible, view.frame)
+    if visible < len(results):
+        st.caption(f"Menampilkan {visible} dari {len(results)} kartu")
+        st.button("⬇️ Muat lebih banyak", on_click=load_more_cards)
+
+    # Ekspor hasil: file dibuat hanya saat diminta, lalu disimpan per himpunan hasil
+    st.subheader("💾 Ekspor Hasil")
+    export_format = st.selectbox("Format ekspor:", list(EXPORTERS))
+    results_key = view.key
+    if st.button("📦 Siapkan file ekspor"):
+        with st.spinner("Menyiapkan file..."):
+            export_file(results_key, results, export_format)
+    export_path = get_cached_export(results_key, export_format)
+    if export_path is not None:
+        exporter = EXPORTERS[export_format]
+        with open(export_path, "rb") as export_data:
+            st.download_button(f"Unduh sebagai {export_format}", export_data,
+                               f"hasil_pencarian.{exporter.extension}", mime=exporter.mime)
+
+# Panel diagnostik: latensi per sumber/tahap, jumlah hasil, error dan cache
+# (isi expander tetap dijalankan saat tertutup, jadi pandas baru diimpor jika ada data)
+with st.expander("🩺 Diagnostik performa"):
+    metrics = get_metrics()
+    timings = metrics.timings()
+    if timings:
+        import pandas as pd
+
+        st.caption("Latensi (detik) per sumber dan tahap, persentil dari observasi terakhir")
+        st.dataframe(pd.DataFrame(timings))
+    counters = metrics.counters()
+    if counters:
+        import pandas as pd
+
+        st.caption("Jumlah hasil, error dan lookup cache")
+        st.dataframe(pd.DataFrame(counters))
+    st.caption(f"Hit rate cache: {get_cache().hit_rate():.0%}")
+
+# Pengayaan metadata (DOI, jurnal, tahun) berjalan di latar belakang; setiap tahap yang
+# melengkapi record memicu rerun sehingga tabel dan kartu yang tampil ikut diperbarui
+if entry is not None:
+    enrichment = entry.start_enrichment()
+    if not enrichment.done() or entry.version != rendered_version:
+        note = st.empty()
+        while not enrichment.done() and entry.version == rendered_version:
+            note.caption("🔎 Melengkapi metadata (DOI, jurnal, tahun) di latar belakang...")
+            time.sleep(ENRICH_POLL_INTERVAL)
+        note.empty()
+        if entry.version != rendered_version:
+            st.rerun()
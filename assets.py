@@ -0,0 +1,231 @@
+from functools import lru_cache
+
+# Gaya CSS untuk tampilan responsif
+PAGE_CSS = """
+        :root {
+            --primary: #6a11ff;
+            --secondary: #2575fc;
+            --accent: #ff2d55;
+            --background: linear-gradient(45deg, #f3f7ff 0%, #f9fbfd 100%);
+            --text: #2c3e50;
+            --card-bg: rgba(255, 255, 255, 0.95);
+            --shadow: 0 8px 32px rgba(31, 38, 135, 0.15);
+        }
+
+        @keyframes float {
+            0% { transform: translateY(0px); }
+            50% { transform: translateY(-10px); }
+            100% { transform: translateY(0px); }
+        }
+
+        .title {
+            text-align: center;
+            background: linear-gradient(45deg, var(--primary), var(--secondary));
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            font-size: 2.5rem;
+            font-weight: 800;
+            margin: 1.5rem 0;
+            letter-spacing: -1px;
+            animation: float 4s ease-in-out infinite;
+        }
+
+        .result-card {
+            background: var(--card-bg);
+            backdrop-filter: blur(10px);
+            border-radius: 15px;
+            padding: 1.5rem;
+            margin: 1rem 0;
+            box-shadow: var(--shadow);
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+            border: 1px solid rgba(255, 255, 255, 0.18);
+            position: relative;
+            overflow: hidden;
+        }
+
+        .result-card:hover {
+            transform: translateY(-5px) scale(1.02);
+            box-shadow: 0 12px 40px rgba(31, 38, 135, 0.25);
+        }
+
+        .result-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: -100%;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(
+                90deg,
+                transparent,
+                rgba(255, 255, 255, 0.4),
+                transparent
+            );
+            transition: 0.5s;
+        }
+
+        .result-card:hover::before {
+            left: 100%;
+        }
+
+        .result-card h4 {
+            color: var(--primary);
+            margin-bottom: 0.8rem;
+            font-size: 1.3rem;
+            font-weight: 700;
+        }
+
+        .result-card p {
+            margin: 0.4rem 0;
+            color: var(--text);
+            font-size: 0.95rem;
+        }
+
+        .result-card a {
+            position: relative;
+            display: inline-block;
+            margin-top: 1rem;
+            padding: 0.6rem 1.5rem;
+            background: linear-gradient(45deg, var(--primary), var(--secondary));
+            color: white !important;
+            border-radius: 8px;
+            overflow: hidden;
+            transition: 0.4s;
+            border: none;
+            font-weight: 600;
+            text-decoration: none !important;
+        }
+
+        .result-card a::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: -100%;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(
+                90deg,
+                transparent,
+                rgba(255, 255, 255, 0.4),
+                transparent
+            );
+            transition: 0.5s;
+        }
+
+        .result-card a:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 5px 15px rgba(var(--primary), 0.3);
+        }
+
+        .result-card a:hover::before {
+            left: 100%;
+        }
+
+        /* Responsive Design */
+        @media (max-width: 768px) {
+            .title {
+                font-size: 2rem;
+            }
+            
+            .result-card {
+                margin: 0.8rem 0;
+                padding: 1.2rem;
+            }
+            
+            .result-card h4 {
+                font-size: 1.1rem;
+            }
+        }
+
+        /* Loading Animation */
+        .loading-spinner {
+            width: 50px;
+            height: 50px;
+            border: 5px solid #f3f3f3;
+            border-top: 5px solid var(--primary);
+            border-radius: 50%;
+            animation: spin 1s linear infinite;
+            margin: 2rem auto;
+        }
+
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
+
+        /* Dark Mode Support */
+        @media (prefers-color-scheme: dark) {
+            :root {
+                --background: linear-gradient(45deg, #1a1a1a 0%, #2d2d2d 100%);
+                --text: #ffffff;
+                --card-bg: rgba(40, 40, 40, 0.95);
+                --shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
+            }
+            
+            .result-card {
+                border: 1px solid rgba(255, 255, 255, 0.1);
+            }
+        }
+
+        .loading-container {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            height: 100px; /* Bisa disesuaikan */
+        }
+
+        .blinking {
+            animation: blink 1.5s infinite;
+            font-size: 24px;
+            font-weight: bold;
+            color: #3498db; /* Warna biru */
+        }
+
+        @keyframes blink {
+            0% { opacity: 1; }
+            50% { opacity: 0.5; }
+            100% { opacity: 1; }
+        }
+
+        /* Override style Streamlit default */
+        :root {
+            --primary: #6a11ff !important;
+            --secondary: #2575fc !important;
+            --accent: #ff2d55 !important;
+            --background: linear-gradient(45deg, #f3f7ff 0%, #f9fbfd 100%) !important;
+            --text: #2c3e50 !important;
+            --card-bg: rgba(255, 255, 255, 0.95) !important;
+            --shadow: 0 8px 32px rgba(31, 38, 135, 0.15) !important;
+        }
+        
+        /* Tambahkan !important untuk override style Streamlit default */
+        .title {
+            text-align: center !important;
+            background: linear-gradient(45deg, var(--primary), var(--secondary)) !important;
+            -webkit-background-clip: text !important;
+            -webkit-text-fill-color: transparent !important;
+            font-size: 2.5rem !important;
+            font-weight: 800 !important;
+            margin: 1.5rem 0 !important;
+            letter-spacing: -1px !important;
+            animation: float 4s ease-in-out infinite !important;
+        }
+"""
+
+LOADING_BANNER = """
+
+    <div class="loading-container">
+        <h3 class="blinking">🔄 pengetahuan di jari mu - bintang</h3>
+    </div>
+"""
+
+HEADER = """
+    <h1 class='title'>🔍 Sistem Pencarian Referensi Jurnal Ilmiah Multi-Sumber dengan Integrasi Google Scholar, CrossRef, dan Semantic Scholar serta Peringkat Relevansi Berbasis Fuzzy Matching</h1>
+    <hr>
+"""
+
+
+# CSS, banner dan judul digabung sekali per proses dan dikirim dalam satu elemen markdown
+@lru_cache(maxsize=None)
+def page_head():
+    return f"<style>{PAGE_CSS}</style>{LOADING_BANNER}{HEADER}"
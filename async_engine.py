@@ -0,0 +1,149 @@
+import asyncio
+import queue
+import threading
+import time
+
+from metrics import get_metrics
+from resilience import ServiceClock
+from sources import MIN_SOURCE_DEADLINE, SourceBatch
+
+# Batas jumlah pemanggilan sumber yang berjalan bersamaan di seluruh proses
+MAX_CONCURRENCY = 32
+
+_loop = None
+_loop_lock = threading.Lock()
+_semaphore = None
+_DONE = object()
+
+
+def is_available():
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Satu event loop per proses di thread latar, dipakai bersama oleh semua sesi Streamlit
+def get_loop():
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="search-loop", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def _get_semaphore():
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def _stream_source(name, source, keyword, max_results, api_key, start, emit, clock,
+                         deadline):
+    async with _get_semaphore():
+        # Batas waktu adaptif dihitung saat job mendapat slot engine, bukan saat diantrekan
+        clock.start(source.deadline(max_results, deadline))
+        pages = source.aiter_pages(keyword, max_results, api_key, clock)
+        try:
+            async for page in pages:
+                emit(SourceBatch(name, page, None, time.monotonic() - start, False, keyword))
+        finally:
+            await pages.aclose()
+    emit(SourceBatch(name, [], None, time.monotonic() - start, True, keyword))
+
+
+async def _gather_batches(jobs, max_results, deadline, emit, handles):
+    start = time.monotonic()
+    tasks, clocks = {}, {}
+    for name, source, api_key, keyword in jobs:
+        clock = ServiceClock()
+        task = asyncio.ensure_future(_stream_source(name, source, keyword, max_results, api_key,
+                                                    start, emit, clock, deadline))
+        tasks[task] = (name, keyword)
+        clocks[task] = clock
+    handles.update((job, task) for task, job in tasks.items())
+    pending = set(tasks)
+    try:
+        while pending:
+            # Sumber yang melewati batas adaptifnya (jam layanan) atau `deadline` (jam dinding)
+            # dihentikan; halaman yang sudah terkirim tetap dipakai dan ditandai partial
+            elapsed = time.monotonic() - start
+            remaining = {task: clocks[task].remaining(deadline - elapsed) for task in pending}
+            expired = {task for task in pending if remaining[task] <= 0 and not task.done()}
+            for task in expired:
+                task.cancel()
+                name, keyword = tasks[task]
+                limit = deadline if elapsed >= deadline else clocks[task].limit
+                get_metrics().incr("source_timeouts_total", source=name)
+                emit(SourceBatch(name, [], f"melebihi batas waktu {limit:.1f} detik",
+                                 elapsed, True, keyword, True))
+            pending -= expired
+            if not pending:
+                break
+            # Job yang baru mulai saat menunggu punya batas >= MIN_SOURCE_DEADLINE dari sekarang
+            timeout = max(0, min(min(remaining.values()), MIN_SOURCE_DEADLINE))
+            done, pending = await asyncio.wait(pending, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    # Dihentikan pemanggil (should_stop): ditutup sebagai batch terakhir
+                    name, keyword = tasks[task]
+                    emit(SourceBatch(name, [], None, time.monotonic() - start, True, keyword))
+                    continue
+                error = task.exception()
+                if error is not None:
+                    name, keyword = tasks[task]
+                    emit(SourceBatch(name, [], str(error), time.monotonic() - start, True, keyword))
+    finally:
+        # Sumber yang ditinggalkan pemanggil dibatalkan, bukan dibiarkan jalan
+        for task in pending:
+            task.cancel()
+        emit(_DONE)
+
+
+# Menjalankan jobs (name, source, api_key, keyword) di loop bersama dan menghasilkan
+# SourceBatch per halaman secara sinkron sesuai urutan selesai. on_result(name, keyword,
+# hasil) dipanggil dengan seluruh hasil satu job setelah semua halamannya selesai.
+# should_stop(name, keyword) diperiksa setelah pemanggil memproses tiap batch; job
+# yang tidak dibutuhkan lagi dibatalkan beserta halaman yang belum diambil, dan
+# hasil parsialnya tidak diteruskan ke on_result.
+def iter_batches(jobs, max_results, deadline, on_result=None, should_stop=None):
+    if not jobs:
+        return
+    loop = get_loop()
+    batches = queue.Queue()
+    handles = {}
+    future = asyncio.run_coroutine_threadsafe(
+        _gather_batches(jobs, max_results, deadline, batches.put, handles), loop
+    )
+    collected = {}
+    active = {(name, keyword) for name, _, _, keyword in jobs}
+    stopped = set()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                break
+            job = (batch.source, batch.keyword)
+            if batch.complete:
+                active.discard(job)
+            if batch.error is None:
+                collected.setdefault(job, []).extend(batch.results)
+                if batch.complete and on_result is not None and job not in stopped:
+                    on_result(batch.source, batch.keyword, collected[job])
+            yield batch
+            if should_stop is None:
+                continue
+            for job in [job for job in active if should_stop(*job)]:
+                active.discard(job)
+                stopped.add(job)
+                loop.call_soon_threadsafe(handles[job].cancel)
+        future.result()
+    finally:
+        future.cancel()
@@ -0,0 +1,241 @@
+"""Mode batch tanpa UI: menjalankan banyak kata kunci sekaligus.
+
+    search-batch keywords.txt -o hasil.jsonl --max-results 100 --concurrency 8
+    search-batch keywords.txt -o hasil_parquet/ --format parquet --rate 2
+
+File kata kunci berisi satu kata kunci per baris (baris kosong dan '#' diabaikan),
+atau JSONL dengan field "keyword". Kata kunci yang selesai dicatat di file
+checkpoint sehingga menjalankan ulang perintah yang sama akan melanjutkan.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from export import FIELDS, INT_FIELDS, export_record, flat_record
+from query import COMBINE_MODES, UNION, canonical_key
+from ranking import DEFAULT_SCORER, SCORERS
+from resilience import RateLimiter
+from search import parallel_search
+from sources import SOURCES
+
+# Jumlah kata kunci yang dijalankan bersamaan
+DEFAULT_CONCURRENCY = 4
+# Jumlah kata kunci Parquet yang ditampung sebelum ditulis sebagai satu file part
+PARQUET_FLUSH_EVERY = 50
+
+
+# Kata kunci yang kanoniknya sama (beda spasi/huruf besar) hanya dijalankan sekali
+def read_keywords(path):
+    keywords = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if path.endswith(".jsonl"):
+                line = str(json.loads(line).get("keyword", "")).strip()
+            key = canonical_key(line)
+            if key and key not in seen:
+                seen.add(key)
+                keywords.append(line)
+    return keywords
+
+
+# Checkpoint: satu kata kunci (JSON string) per baris, ditambahkan setelah hasilnya tertulis
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {json.loads(line) for line in f if line.strip()}
+
+    def mark(self, keywords):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for keyword in keywords:
+                f.write(json.dumps(keyword, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(keywords)
+
+
+def _record(keyword, ref, to_record=export_record):
+    return {"Keyword": keyword, **to_record(ref)}
+
+
+# Menulis hasil per kata kunci ke file JSONL yang terus ditambahkan
+class JsonLinesWriter:
+    def __init__(self, path):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, keyword, results):
+        for ref in results:
+            self._file.write(json.dumps(_record(keyword, ref), ensure_ascii=False) + "\n")
+        self._file.flush()
+        return [keyword]
+
+    def flush(self):
+        return []
+
+    def close(self):
+        self._file.close()
+
+
+# Menulis hasil sebagai dataset Parquet: direktori berisi file part-NNNNN.parquet
+class ParquetWriter:
+    def __init__(self, path, flush_every=PARQUET_FLUSH_EVERY):
+        import pyarrow as pa
+
+        self._pa = pa
+        self.path = path
+        self.flush_every = flush_every
+        self.schema = pa.schema([("Keyword", pa.string())] + [
+            (field, pa.int64() if field in INT_FIELDS else pa.string()) for field in FIELDS])
+        os.makedirs(path, exist_ok=True)
+        self._part = len([name for name in os.listdir(path) if name.endswith(".parquet")])
+        self._rows = []
+        self._pending = []
+
+    def write(self, keyword, results):
+        for ref in results:
+            row = _record(keyword, ref, flat_record)
+            self._rows.append({key: value if key in INT_FIELDS or value is None else str(value)
+                               for key, value in row.items()})
+        self._pending.append(keyword)
+        if len(self._pending) >= self.flush_every:
+            return self.flush()
+        return []
+
+    # Mengembalikan kata kunci yang hasilnya sudah aman di disk
+    def flush(self):
+        import pyarrow.parquet as pq
+
+        if not self._pending:
+            return []
+        table = self._pa.Table.from_pylist(self._rows, schema=self.schema)
+        target = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+        pq.write_table(table, target + ".tmp")
+        os.replace(target + ".tmp", target)
+        self._part += 1
+        flushed, self._rows, self._pending = self._pending, [], []
+        return flushed
+
+    def close(self):
+        pass
+
+
+def open_writer(path, output_format):
+    if output_format == "parquet":
+        return ParquetWriter(path)
+    return JsonLinesWriter(path)
+
+
+# Menjalankan semua kata kunci dengan batas konkurensi dan laju global; hasil
+# ditulis dan di-checkpoint satu per satu dari thread utama
+def run_batch(keywords, writer, checkpoint, max_results, concurrency=DEFAULT_CONCURRENCY,
+              rate=None, api_keys=None, scorer=None, sources=None, log=print, combine=UNION,
+              approximate=False):
+    api_keys = api_keys or {}
+    limiter = RateLimiter(rate) if rate else None
+    pending_keywords = [keyword for keyword in keywords if keyword not in checkpoint.done]
+    if len(pending_keywords) < len(keywords):
+        log(f"Melanjutkan: {len(keywords) - len(pending_keywords)} kata kunci sudah selesai")
+
+    failed = []
+    errors_lock = threading.Lock()
+
+    def one_keyword(keyword):
+        if limiter is not None:
+            limiter.acquire()
+        errors = []
+
+        def on_error(source, error):
+            with errors_lock:
+                errors.append(f"{source}: {error}")
+
+        results = parallel_search(keyword, max_results, api_keys.get("ScienceDirect"),
+                                  api_keys.get("IEEE Xplore"), on_error, scorer, sources, combine,
+                                  approximate)
+        return results, errors
+
+    done = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        queue = iter(pending_keywords)
+        futures = {}
+
+        # Hanya `concurrency` kata kunci yang diantrekan, sisanya menunggu giliran
+        def submit_next():
+            keyword = next(queue, None)
+            if keyword is not None:
+                futures[pool.submit(one_keyword, keyword)] = keyword
+
+        for _ in range(concurrency):
+            submit_next()
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                keyword = futures.pop(future)
+                submit_next()
+                done += 1
+                try:
+                    results, errors = future.result()
+                except Exception as e:
+                    failed.append(keyword)
+                    log(f"[{done}/{len(pending_keywords)}] {keyword!r}: gagal ({e})")
+                    continue
+                checkpoint.mark(writer.write(keyword, results))
+                note = f", error: {'; '.join(errors)}" if errors else ""
+                log(f"[{done}/{len(pending_keywords)}] {keyword!r}: {len(results)} hasil{note}")
+    checkpoint.mark(writer.flush())
+    log(f"Selesai dalam {time.perf_counter() - start:.1f}s, {len(failed)} kata kunci gagal")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pencarian jurnal batch tanpa UI")
+    parser.add_argument("keywords", help="file kata kunci (.txt satu per baris, atau .jsonl)")
+    parser.add_argument("-o", "--output", required=True, help="file .jsonl atau direktori Parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"),
+                        help="format keluaran (bawaan: dari ekstensi --output)")
+    parser.add_argument("--max-results", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="jumlah kata kunci yang dijalankan bersamaan")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="batas kata kunci baru per detik (bawaan: tanpa batas)")
+    parser.add_argument("--sources", nargs="*", choices=list(SOURCES), default=None)
+    parser.add_argument("--scorer", choices=list(SCORERS), default=DEFAULT_SCORER)
+    parser.add_argument("--combine", choices=COMBINE_MODES, default=UNION,
+                        help="penggabungan baris dengan beberapa kata kunci (OR, |, ;)")
+    parser.add_argument("--approximate-topk", action="store_true",
+                        help="hentikan sumber terurut lebih awal memakai taksiran batas skor")
+    parser.add_argument("--sd-key", default=os.environ.get("SCIENCEDIRECT_API_KEY"))
+    parser.add_argument("--ieee-key", default=os.environ.get("IEEE_API_KEY"))
+    parser.add_argument("--checkpoint", help="file checkpoint (bawaan: <output>.checkpoint)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("parquet" if args.output.rstrip("/").endswith(".parquet")
+                                    or args.output.endswith("/") else "jsonl")
+    checkpoint = Checkpoint(args.checkpoint or args.output.rstrip("/") + ".checkpoint")
+    keywords = read_keywords(args.keywords)
+    writer = open_writer(args.output, output_format)
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    try:
+        failed = run_batch(keywords, writer, checkpoint, args.max_results, args.concurrency,
+                           args.rate, {"ScienceDirect": args.sd_key, "IEEE Xplore": args.ieee_key},
+                           args.scorer, args.sources, log, args.combine, args.approximate_topk)
+    finally:
+        writer.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import json
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+# Cara setiap sumber memecah halaman (nama parameter count/offset) dan
+# membungkus/membuka daftar item mentah dalam respons JSON-nya
+class ReplayFormat:
+    def __init__(self, slug, count_param, offset_param, wrap, unwrap, offset_base=0):
+        self.slug = slug
+        self.count_param = count_param
+        self.offset_param = offset_param
+        self.wrap = wrap
+        self.unwrap = unwrap
+        self.offset_base = offset_base
+
+    def fixture_path(self, fixtures_dir=FIXTURES_DIR):
+        return os.path.join(fixtures_dir, f"{self.slug}.json")
+
+
+FORMATS = {
+    "CrossRef": ReplayFormat(
+        "crossref", "rows", "offset",
+        wrap=lambda items, total: {"message": {"total-results": total, "items": items}},
+        unwrap=lambda data: (data["message"]["items"], data["message"].get("total-results")),
+    ),
+    "Semantic Scholar": ReplayFormat(
+        "semanticscholar", "limit", "offset",
+        wrap=lambda items, total: {"total": total, "data": items},
+        unwrap=lambda data: (data.get("data", []), data.get("total")),
+    ),
+    "ScienceDirect": ReplayFormat(
+        "sciencedirect", "count", "start",
+        wrap=lambda items, total: {"search-results": {"opensearch:totalResults": str(total),
+                                                      "entry": items}},
+        unwrap=lambda data: (data["search-results"].get("entry", []),
+                             data["search-results"].get("opensearch:totalResults")),
+    ),
+    "IEEE Xplore": ReplayFormat(
+        "ieee", "max_records", "start_record", offset_base=1,
+        wrap=lambda items, total: {"total_records": total, "articles": items},
+        unwrap=lambda data: (data.get("articles", []), data.get("total_records")),
+    ),
+    # Google Scholar di-scrape (HTML), jadi yang direkam adalah record hasil normalisasi
+    "Google Scholar": ReplayFormat(
+        "scholar", "count", "offset",
+        wrap=lambda items, total: {"total": total, "records": items},
+        unwrap=lambda data: (data.get("records", []), data.get("total")),
+    ),
+}
+
+
+def load_fixture(name, fixtures_dir=FIXTURES_DIR):
+    path = FORMATS[name].fixture_path(fixtures_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixture(name, keyword, items, fixtures_dir=FIXTURES_DIR):
+    os.makedirs(fixtures_dir, exist_ok=True)
+    with open(FORMATS[name].fixture_path(fixtures_dir), "w", encoding="utf-8") as f:
+        json.dump({"source": name, "keyword": keyword, "total": len(items), "items": items}, f)
@@ -0,0 +1,107 @@
+"""Penjaga waktu impor cold start aplikasi Streamlit.
+
+    python -m benchmarks.import_time                  # gagal (exit 1) jika melewati batas
+    python -m benchmarks.import_time --budget-ms 300 --top 15
+
+Modul yang diimpor di level atas app.py diimpor di interpreter baru dengan
+`python -X importtime` setelah streamlit, sehingga yang diukur hanya biaya milik
+aplikasi. Selain itu app.py dijalankan sekali tanpa interaksi (streamlit AppTest)
+di interpreter lain, agar impor di dalam blok yang tetap dieksekusi (mis. isi
+expander yang tertutup) ikut terlihat. Gagal jika totalnya melewati anggaran atau
+jika ada modul berat (pandas, numpy, rapidfuzz, scholarly, ...) yang terimpor
+sebelum ada pencarian.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+DEFAULT_BUDGET_MS = 250
+APP_TIMEOUT = 60
+# Modul yang baru boleh diimpor setelah ada hasil pencarian / sumbernya dipakai
+LAZY_MODULES = ("pandas", "numpy", "pyarrow", "scholarly", "selenium", "fake_useragent",
+                "fuzzywuzzy", "rapidfuzz", "export", "enrich", "result_store", "search", "scholar_pool")
+
+
+# Modul yang diimpor di level atas app.py (impor di dalam fungsi/blok if tidak dihitung)
+def cold_imports(path=APP_PATH):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return [module for module in dict.fromkeys(modules) if module != "streamlit"]
+
+
+# Baris -X importtime setelah streamlit: (nama, mikrodetik kumulatif, level)
+def measure(modules):
+    code = "import streamlit\n" + "".join(f"import {module}\n" for module in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows, after_streamlit = [], False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if after_streamlit:
+            rows.append((name, int(cumulative), level))
+        elif level == 0 and name == "streamlit":
+            after_streamlit = True
+    return rows
+
+
+# Menjalankan app.py sekali seperti kunjungan pertama; modul LAZY_MODULES yang terimpor
+def run_app(path=APP_PATH):
+    code = ("import json, sys\n"
+            "from streamlit.testing.v1 import AppTest\n"
+            f"app = AppTest.from_file({path!r}, default_timeout={APP_TIMEOUT}).run()\n"
+            "print(json.dumps({'modules': [m for m in %r if m in sys.modules],\n"
+            "                  'errors': [e.value for e in app.exception]}))\n" % (LAZY_MODULES,))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    return report["modules"], report["errors"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Penjaga waktu impor cold start app.py")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="batas total waktu impor modul aplikasi (milidetik)")
+    parser.add_argument("--top", type=int, default=10, help="jumlah impor terlama yang ditampilkan")
+    args = parser.parse_args(argv)
+
+    modules = cold_imports()
+    rows = measure(modules)
+    total_ms = sum(cumulative for _, cumulative, level in rows if level == 0) / 1000
+    print(f"Impor cold start app.py: {', '.join(modules)}")
+    print(f"Total: {total_ms:.1f} ms (anggaran {args.budget_ms:.0f} ms)")
+    for name, cumulative, _ in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"waktu impor {total_ms:.1f} ms melewati anggaran {args.budget_ms:.0f} ms")
+    eager, errors = run_app()
+    eager = set(eager) | ({name.split(".")[0] for name, _, _ in rows} & set(LAZY_MODULES))
+    failures.extend(f"app.py gagal dijalankan: {error}" for error in errors)
+    if eager:
+        failures.append(f"modul berat terimpor saat cold start: {', '.join(sorted(eager))}")
+    for failure in failures:
+        print(f"GAGAL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Benchmark offline pipeline pencarian terhadap fixture yang diputar ulang.
+
+    python -m benchmarks.record --synthetic        # sekali, jika belum ada fixture
+    python -m benchmarks.run --concurrency 1 10 100 --max-results 5 100 1000
+
+Semua sumber diarahkan ke StubServer lokal sehingga hasilnya bisa diulang
+tanpa jaringan; latensi dan tingkat kegagalan diatur lewat argumen.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Cache dan indeks lokal benchmark dipisah dari milik aplikasi
+_workdir = tempfile.mkdtemp(prefix="search-bench-")
+os.environ.setdefault("SEARCH_CACHE_PATH", os.path.join(_workdir, "cache.sqlite"))
+os.environ.setdefault("LOCAL_INDEX_PATH", os.path.join(_workdir, "local_index.sqlite"))
+
+from benchmarks.formats import FIXTURES_DIR  # noqa: E402
+from benchmarks.stub_server import StubServer  # noqa: E402
+from cache import get_cache  # noqa: E402
+from http_client import http_get  # noqa: E402
+from metrics import get_metrics, percentile  # noqa: E402
+from records import to_frame, to_references  # noqa: E402
+from render import card_html  # noqa: E402
+from resilience import CircuitBreaker, UpstreamError  # noqa: E402
+from search import TopKMerge, iter_search  # noqa: E402
+from sources import SOURCES  # noqa: E402
+
+BENCH_API_KEYS = {"ScienceDirect": "bench", "IEEE Xplore": "bench"}
+REPORTED_STAGES = ("json_decode", "normalize", "scoring", "dedup", "sort", "dataframe", "render")
+
+
+def _replay_scholar(stub):
+    source = SOURCES["Google Scholar"]
+    url = stub.url_for("Google Scholar")
+
+    def fetch_page(keyword, count, offset, api_key=None):
+        response = http_get(url, params={"count": count, "offset": offset})
+        if response.status_code != 200:
+            raise UpstreamError(source.name, response.status_code)
+        data = response.json()
+        return to_references(data["records"]), data["total"]
+
+    source.fetch_page = fetch_page
+
+
+# Mengarahkan semua sumber yang punya fixture ke stub server
+def point_sources_at(stub, keep_rate_limits=False):
+    for name in stub.sources():
+        source = SOURCES[name]
+        if name == "Google Scholar":
+            _replay_scholar(stub)
+        else:
+            source.url = stub.url_for(name)
+        if not keep_rate_limits:
+            source.limiter = None
+    return stub.sources()
+
+
+def _stage_p50(metrics):
+    stages = {}
+    for row in metrics.timings():
+        if row["metric"] == "stage_seconds" and row.get("stage") in REPORTED_STAGES:
+            stages.setdefault(row["stage"], []).append(row["p50"])
+    return {stage: max(values) for stage, values in stages.items()}
+
+
+def run_scenario(sources, concurrency, max_results, queries, engine, trace_memory=False,
+                 approximate=False):
+    get_cache().clear()
+    metrics = get_metrics()
+    metrics.reset()
+    for name in sources:
+        SOURCES[name].breaker = CircuitBreaker()
+
+    errors = []
+    latencies = []
+
+    # Satu query lengkap: fan-out, merge, DataFrame dan HTML kartu seperti di UI
+    def one_query(keyword):
+        start = time.perf_counter()
+        merger = TopKMerge(keyword, max_results, approximate=approximate)
+        for batch in iter_search(keyword, max_results, BENCH_API_KEYS, engine=engine, sources=sources,
+                                 should_stop=merger.should_stop):
+            if batch.error is not None:
+                errors.append(batch.error)
+            merger.add(batch)
+        results = merger.results()
+        with metrics.timer("stage_seconds", stage="dataframe"):
+            to_frame(results)
+        with metrics.timer("stage_seconds", stage="render"):
+            "".join(card_html(ref) for ref in results)
+        latencies.append(time.perf_counter() - start)
+        return len(results)
+
+    # Kata kunci unik per query agar cache tidak ikut terukur
+    keywords = [f"benchmark query {i}" for i in range(queries)]
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        counts = list(pool.map(one_query, keywords))
+    wall = time.perf_counter() - wall_start
+    peak_mb = None
+    if trace_memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return {
+        "concurrency": concurrency,
+        "max_results": max_results,
+        "queries": queries,
+        "engine": engine,
+        "wall_s": wall,
+        "throughput_qps": queries / wall if wall else 0.0,
+        "latency_p50_s": percentile(latencies, 0.5),
+        "latency_p95_s": percentile(latencies, 0.95),
+        "latency_max_s": max(latencies) if latencies else 0.0,
+        "results_avg": sum(counts) / len(counts) if counts else 0,
+        "errors": len(errors),
+        "stage_p50_s": _stage_p50(metrics),
+        "traced_peak_mb": peak_mb,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def format_row(row):
+    stages = " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in row["stage_p50_s"].items())
+    memory = f" peak={row['traced_peak_mb']:.1f}MB" if row["traced_peak_mb"] is not None else ""
+    return (f"c={row['concurrency']:<4} n={row['max_results']:<5} {row['engine']:<6} "
+            f"p50={row['latency_p50_s']:.3f}s p95={row['latency_p95_s']:.3f}s "
+            f"max={row['latency_max_s']:.3f}s {row['throughput_qps']:.1f} q/s "
+            f"hasil={row['results_avg']:.0f} error={row['errors']} "
+            f"rss={row['max_rss_mb']:.0f}MB{memory}\n    {stages}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline parallel_search")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--max-results", type=int, nargs="+", default=[5, 100, 1000])
+    parser.add_argument("--queries", type=int, default=None,
+                        help="jumlah query per skenario (bawaan: 2 x concurrency)")
+    parser.add_argument("--engine", choices=("async", "thread"), default="async")
+    parser.add_argument("--latency", type=float, default=0.05, help="latensi rata-rata stub (detik)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--keep-rate-limits", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true", help="ukur puncak memori (tracemalloc)")
+    parser.add_argument("--approximate-topk", action="store_true",
+                        help="hentikan sumber terurut memakai taksiran batas skor (TopKMerge)")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args(argv)
+
+    stub = StubServer(args.fixtures, args.latency, args.jitter, args.failure_rate).start()
+    sources = point_sources_at(stub, args.keep_rate_limits)
+    if not sources:
+        sys.exit(f"Tidak ada fixture di {args.fixtures}; jalankan python -m benchmarks.record dahulu")
+
+    rows = []
+    try:
+        for max_results in args.max_results:
+            for concurrency in args.concurrency:
+                queries = args.queries or 2 * concurrency
+                row = run_scenario(sources, concurrency, max_results, queries, args.engine,
+                                   args.trace_memory, args.approximate_topk)
+                rows.append(row)
+                print(format_row(row), flush=True)
+    finally:
+        stub.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
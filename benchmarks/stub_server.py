@@ -0,0 +1,84 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.formats import FORMATS, load_fixture
+
+
+# Server HTTP lokal yang memutar ulang fixture per sumber, dengan latensi
+# dan tingkat kegagalan (HTTP 503) yang bisa diatur
+class StubServer:
+    def __init__(self, fixtures_dir, latency=0.05, jitter=0.02, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes = {}
+        for name, fmt in FORMATS.items():
+            fixture = load_fixture(name, fixtures_dir)
+            if fixture is not None:
+                self._routes[f"/{fmt.slug}"] = (fmt, fixture["items"])
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def sources(self):
+        return [name for name, fmt in FORMATS.items() if f"/{fmt.slug}" in self._routes]
+
+    def url_for(self, name):
+        return f"{self.base_url}/{FORMATS[name].slug}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _delay_and_fail(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self._rng.gauss(self.latency, self.jitter))
+            fail = self._rng.random() < self.failure_rate
+        time.sleep(delay)
+        return fail
+
+    def respond(self, path, query):
+        route = self._routes.get(path.rstrip("/"))
+        if route is None:
+            return 404, {"error": "fixture tidak ditemukan"}
+        if self._delay_and_fail():
+            return 503, {"error": "kegagalan yang disuntikkan"}
+        fmt, items = route
+        count = int(query.get(fmt.count_param, 10))
+        offset = int(query.get(fmt.offset_param, fmt.offset_base)) - fmt.offset_base
+        return 200, fmt.wrap(items[offset:offset + count], len(items))
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, payload = stub.respond(url.path, query)
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,125 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from query import canonical_key
+from records import to_references
+
+CACHE_PATH = os.environ.get("SEARCH_CACHE_PATH", "search_cache.sqlite")
+MEMORY_SIZE = 256
+DISK_SIZE = 5000
+
+# TTL (detik) per sumber; Google Scholar paling mahal dan paling jarang berubah
+SOURCE_TTL = {
+    "Google Scholar": 24 * 3600,
+    "CrossRef": 6 * 3600,
+    "Semantic Scholar": 6 * 3600,
+    "ScienceDirect": 12 * 3600,
+    "IEEE Xplore": 12 * 3600,
+}
+DEFAULT_TTL = 3600
+
+
+# Bentuk lain dari query yang sama ("Deep  Learning", "deep learning ") berbagi satu entri.
+# credential: sidik API key (SourceAdapter.credential) untuk sumber ber-API key, sehingga
+# hasil yang diambil dengan key satu pengguna tidak diberikan ke pemanggil lain
+def make_key(source, keyword, max_results, credential=None):
+    key = [source, canonical_key(keyword), int(max_results)]
+    return json.dumps(key if credential is None else key + [credential])
+
+
+# Cache dua tingkat: LRU di memori + SQLite di disk, keduanya dibatasi ukurannya
+class ResultCache:
+    def __init__(self, path=CACHE_PATH, memory_size=MEMORY_SIZE, disk_size=DISK_SIZE):
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._db.commit()
+
+    def get(self, source, keyword, max_results, credential=None):
+        key = make_key(source, keyword, max_results, credential)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[1]
+
+            row = self._db.execute(
+                "SELECT value, expires FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                value = to_references(json.loads(row[0]))
+                self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self._remember(key, row[1], value)
+                self.stats["disk_hits"] += 1
+                return value
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, source, keyword, max_results, results, credential=None):
+        key = make_key(source, keyword, max_results, credential)
+        now = time.time()
+        expires = now + SOURCE_TTL.get(source, DEFAULT_TTL)
+        with self._lock:
+            self._remember(key, expires, results)
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps([ref.to_dict() for ref in results]), expires, now),
+            )
+            self._evict_disk(now)
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def hit_rate(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def _remember(self, key, expires, value):
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self._db.execute("DELETE FROM results WHERE expires <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.disk_size,),
+        )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# Satu instance cache per proses, dipakai bersama oleh semua sesi Streamlit
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+    return _cache
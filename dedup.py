@@ -0,0 +1,169 @@
+import random
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+
+from rapidfuzz import fuzz
+
+# Skor fuzzy minimum agar dua judul dianggap duplikat
+DUPLICATE_THRESHOLD = 92
+
+# MinHash/LSH: BANDS x ROWS permutasi; judul masuk kandidat jika satu band sama
+BANDS = 6
+ROWS = 3
+# Token yang muncul di lebih dari proporsi ini (mis. kata kunci pencarian) diabaikan saat blocking
+COMMON_TOKEN_RATIO = 0.5
+# Judul pendek yang sebagian besar berisi kata kunci tersisa terlalu sedikit token setelah
+# token umum dibuang. Di bawah batas ini blocking memakai shingle karakter dari sisa judul
+# dengan band yang lebih pendek, sehingga judul yang hanya berbeda akhiran/satu huruf
+# tetap menjadi kandidat
+MIN_BLOCKING_TOKENS = 3
+SHINGLE_SIZE = 3
+SHINGLE_ROWS = 2
+# Bucket yang terlalu besar dilewati agar perbandingan tetap mendekati linear
+MAX_BUCKET_SIZE = 50
+
+_PRIME = (1 << 61) - 1
+# Koefisien acak (seed tetap, sama di semua proses); koefisien yang linear terhadap indeks
+# membuat nilai minimum antar permutasi saling berkorelasi
+_random = random.Random(0x5EED)
+_PERMUTATIONS = [(_random.randrange(1, _PRIME), _random.randrange(_PRIME))
+                 for _ in range(BANDS * ROWS)]
+_DOI_PATTERN = re.compile(r"(10\.\d{4,9}/\S+)", re.IGNORECASE)
+_EMPTY_VALUES = (None, "", "Unknown", "N/A")
+
+
+def fuzzy_match(title1, title2):
+    # Gunakan ratio sederhana tanpa token sort
+    return fuzz.ratio(title1.lower(), title2.lower()) if title1 and title2 else 0
+
+
+def normalize_title(title):
+    title = unicodedata.normalize("NFKD", title or "")
+    title = "".join(ch for ch in title if not unicodedata.combining(ch))
+    title = re.sub(r"[^\w\s]", " ", title.lower())
+    return " ".join(title.split())
+
+
+def extract_doi(ref):
+    for value in (ref.get("DOI"), ref.get("Link")):
+        if value:
+            match = _DOI_PATTERN.search(str(value))
+            if match:
+                return match.group(1).rstrip(".").lower()
+    return None
+
+
+def _shingles(text, size=SHINGLE_SIZE):
+    return {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+
+
+def _minhash(tokens):
+    hashes = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+# Union-find atas indeks referensi; dois[root] = DOI kelompok (None jika belum ada).
+# Dua kelompok dengan DOI berbeda tidak pernah digabung, walau judulnya sama/mirip
+class _UnionFind:
+    def __init__(self, dois):
+        self.parent = list(range(len(dois)))
+        self.dois = list(dois)
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return
+        doi_i, doi_j = self.dois[root_i], self.dois[root_j]
+        if doi_i and doi_j and doi_i != doi_j:
+            return
+        root, child = min(root_i, root_j), max(root_i, root_j)
+        self.parent[child] = root
+        self.dois[root] = doi_i or doi_j
+
+
+# Menggabungkan satu kelompok duplikat: ambil record paling relevan,
+# isi field kosong dari record lain dan catat semua sumbernya
+def _merge_group(group):
+    best = max(group, key=lambda ref: ref.get("Relevance", 0))
+    merged = best.copy()
+    for ref in group:
+        for field, value in ref.items():
+            if merged.get(field) in _EMPTY_VALUES and value not in _EMPTY_VALUES:
+                merged[field] = value
+    sources = []
+    for ref in group:
+        for source in str(ref.get("Source", "")).split(", "):
+            if source and source not in sources:
+                sources.append(source)
+    merged["Source"] = ", ".join(sources)
+    # Skor per kata kunci dari semua anggota kelompok, diambil yang tertinggi
+    scores = {}
+    for ref in group:
+        for term, score in (ref.get("Scores") or {}).items():
+            scores[term] = max(score, scores.get(term, score))
+    if scores:
+        merged["Scores"] = scores
+    return merged
+
+
+# Menghapus duplikat: DOI sebagai kunci utama, judul ternormalisasi sebagai kunci
+# kedua, lalu fuzzy matching hanya di dalam bucket LSH (bukan semua pasangan)
+def deduplicate(references, threshold=DUPLICATE_THRESHOLD):
+    if not references:
+        return []
+    dois = [extract_doi(ref) for ref in references]
+    groups = _UnionFind(dois)
+    titles = [normalize_title(ref.get("Title")) for ref in references]
+
+    # DOI dulu untuk semua referensi, baru judul, agar kelompok sudah membawa DOI-nya
+    exact_keys = {}
+    for keys in (dois, titles):
+        for i, key in enumerate(keys):
+            if not key or key == "unknown":
+                continue
+            if key in exact_keys:
+                groups.union(exact_keys[key], i)
+            else:
+                exact_keys[key] = i
+
+    token_sets = [set(title.split()) for title in titles]
+    document_freq = defaultdict(int)
+    for tokens in token_sets:
+        for token in tokens:
+            document_freq[token] += 1
+    common_limit = max(2, COMMON_TOKEN_RATIO * len(references))
+
+    buckets = defaultdict(list)
+    for i, title in enumerate(titles):
+        if groups.find(i) != i or title in ("", "unknown"):
+            continue
+        rare = [token for token in title.split() if document_freq[token] <= common_limit]
+        if len(set(rare)) >= MIN_BLOCKING_TOKENS:
+            signature, rows = _minhash(set(rare)), ROWS
+        else:
+            signature, rows = _minhash(_shingles(" ".join(rare) or title)), SHINGLE_ROWS
+        for band in range(len(signature) // rows):
+            buckets[(rows, band, *signature[band * rows:(band + 1) * rows])].append(i)
+
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > MAX_BUCKET_SIZE:
+            continue
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if groups.find(i) == groups.find(j):
+                    continue
+                if fuzzy_match(titles[i], titles[j]) >= threshold:
+                    groups.union(i, j)
+
+    grouped = defaultdict(list)
+    for i, ref in enumerate(references):
+        grouped[groups.find(i)].append(ref)
+    return [group[0] if len(group) == 1 else _merge_group(group) for group in grouped.values()]
@@ -0,0 +1,268 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import CACHE_PATH
+from dedup import DUPLICATE_THRESHOLD, extract_doi, fuzzy_match, normalize_title
+from http_client import http_get, http_post
+from metrics import get_metrics
+from records import join_authors, normalize_year
+from sources import SOURCES
+
+S2_BATCH_URL = "https://api.semanticscholar.org/graph/v1/paper/batch"
+S2_BATCH_FIELDS = "externalIds,venue,year,journal,authors"
+CROSSREF_URL = "https://api.crossref.org/works"
+CROSSREF_SELECT = "DOI,title,container-title,published-print,published-online,issued,author"
+# Ukuran batch: Semantic Scholar menerima hingga 500 id, DOI CrossRef dibatasi panjang URL
+S2_BATCH_SIZE = 500
+CROSSREF_DOI_BATCH = 40
+# Pencarian DOI berdasarkan judul (satu permintaan per record) dibatasi per himpunan hasil
+MAX_TITLE_LOOKUPS = 25
+# TTL cache pengayaan: metadata hampir tidak berubah; hasil "tidak ditemukan" lebih singkat
+ENRICH_TTL = 30 * 24 * 3600
+MISS_TTL = 24 * 3600
+ENRICH_WORKERS = 2
+
+_EMPTY_VALUES = (None, "", "Unknown", "N/A")
+_S2_ID_PATTERN = re.compile(r"semanticscholar\.org/paper/([0-9a-f]{40})", re.IGNORECASE)
+
+_enricher = None
+_enricher_lock = threading.Lock()
+
+
+def _truncated(value):
+    return str(value).rstrip().endswith(("…", "..."))
+
+
+def _missing(ref):
+    journal = ref.get("Journal")
+    return {
+        "DOI": extract_doi(ref) is None,
+        "Year": ref.get("Year") is None,
+        "Journal": journal in _EMPTY_VALUES or _truncated(journal),
+        "Authors": ref.get("Authors") in _EMPTY_VALUES,
+    }
+
+
+def needs_enrichment(ref):
+    return any(_missing(ref).values())
+
+
+# Mengisi hanya field yang kosong/terpotong; True jika record berubah
+def apply_fields(ref, fields):
+    changed = False
+    for field, missing in _missing(ref).items():
+        value = fields.get(field)
+        if missing and value not in _EMPTY_VALUES:
+            ref[field] = value
+            changed = True
+    return changed
+
+
+def _s2_id(ref):
+    match = _S2_ID_PATTERN.search(str(ref.get("Link") or ""))
+    return match.group(1) if match else None
+
+
+def _s2_fields(paper):
+    journal = (paper.get("journal") or {}).get("name") or paper.get("venue")
+    authors = join_authors(author.get("name", "") for author in paper.get("authors") or [])
+    return {"DOI": (paper.get("externalIds") or {}).get("DOI"), "Year": paper.get("year"),
+            "Journal": journal, "Authors": authors}
+
+
+def _crossref_fields(item):
+    year = None
+    for field in ("published-print", "published-online", "issued"):
+        year = normalize_year((item.get(field, {}).get("date-parts") or [[None]])[0][0])
+        if year:
+            break
+    authors = join_authors(f"{a.get('given', '')} {a.get('family', '')}"
+                           for a in item.get("author", []))
+    return {"DOI": item.get("DOI"), "Year": year, "Journal": (item.get("container-title") or [None])[0],
+            "Authors": authors}
+
+
+# Cache hasil pengayaan per DOI / id Semantic Scholar / judul, di SQLite yang sama dengan cache hasil
+class EnrichmentCache:
+    def __init__(self, path=CACHE_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS enrichment ("
+                         "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)")
+        self._db.commit()
+
+    def get_many(self, keys):
+        keys = list(set(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, value FROM enrichment WHERE expires > ? AND key IN "
+                    f"({','.join('?' * len(chunk))})", (time.time(), *chunk)).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def set_many(self, items):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO enrichment (key, value, expires) VALUES (?, ?, ?)",
+                [(key, json.dumps(fields), now + (ENRICH_TTL if fields else MISS_TTL))
+                 for key, fields in items.items()])
+            self._db.commit()
+
+
+# Kunci per layanan: "s2:<id>" / "s2:DOI:<doi>" untuk Semantic Scholar,
+# "doi:<doi>" dan "title:<judul>" untuk CrossRef
+def _s2_key(ref):
+    s2_id, doi = _s2_id(ref), extract_doi(ref)
+    if s2_id:
+        return f"s2:{s2_id}"
+    return f"s2:DOI:{doi}" if doi else None
+
+
+def _doi_key(ref):
+    doi = extract_doi(ref)
+    return f"doi:{doi}" if doi else None
+
+
+def _title_key(ref):
+    title = normalize_title(ref.get("Title"))
+    if extract_doi(ref) is None and title and title != "unknown":
+        return f"title:{title}"
+    return None
+
+
+def _group(pending, key_fn):
+    refs_by_key = {}
+    for ref in pending:
+        key = key_fn(ref)
+        if key:
+            refs_by_key.setdefault(key, []).append(ref)
+    return refs_by_key
+
+
+# Tahap pengayaan di latar belakang: DOI dan field yang hilang dilengkapi lewat
+# panggilan batch (Semantic Scholar /paper/batch, filter DOI CrossRef), bukan per record
+class Enricher:
+    def __init__(self, cache=None, workers=ENRICH_WORKERS):
+        self.cache = cache or EnrichmentCache()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+
+    # on_update(jumlah_record_berubah) dipanggil setiap tahap yang mengubah record
+    def submit(self, references, on_update=None):
+        return self._executor.submit(self.enrich, references, on_update)
+
+    def enrich(self, references, on_update=None):
+        pending = [ref for ref in references if needs_enrichment(ref)]
+        # Kunci yang sudah terjawab dari cache (termasuk "tidak ditemukan") tidak dicari ulang
+        known = set()
+        total = 0
+        for stage in (self._from_cache, self._from_semantic_scholar, self._from_crossref_dois,
+                      self._from_crossref_titles):
+            if not pending:
+                break
+            name = stage.__name__[len("_from_"):]
+            try:
+                with get_metrics().timer("stage_seconds", stage=f"enrich_{name}"):
+                    changed = stage(pending, known)
+            except Exception as e:
+                # Pengayaan bersifat tambahan: tahap yang gagal dilewati tanpa menggagalkan hasil
+                get_metrics().incr("enrich_errors_total", stage=name, error=type(e).__name__)
+                continue
+            pending = [ref for ref in pending if needs_enrichment(ref)]
+            if changed:
+                total += changed
+                if on_update is not None:
+                    on_update(changed)
+        get_metrics().incr("enriched_records_total", total)
+        return total
+
+    def _apply(self, refs_by_key, found, remember=True):
+        changed = 0
+        for key, fields in found.items():
+            for ref in refs_by_key.get(key, []):
+                changed += apply_fields(ref, fields)
+        if remember:
+            self.cache.set_many(found)
+        return changed
+
+    def _from_cache(self, pending, known):
+        refs_by_key = {}
+        for key_fn in (_s2_key, _doi_key, _title_key):
+            for key, refs in _group(pending, key_fn).items():
+                refs_by_key.setdefault(key, []).extend(refs)
+        found = self.cache.get_many(refs_by_key)
+        known.update(found)
+        return self._apply(refs_by_key, found, remember=False)
+
+    def _acquire(self, source_name):
+        source = SOURCES.get(source_name)
+        if source is not None and source.limiter is not None:
+            source.limiter.acquire()
+
+    def _from_semantic_scholar(self, pending, known):
+        refs_by_key = _group(pending, _s2_key)
+        keys = [key for key in refs_by_key if key not in known]
+        changed = 0
+        for start in range(0, len(keys), S2_BATCH_SIZE):
+            chunk = keys[start:start + S2_BATCH_SIZE]
+            self._acquire("Semantic Scholar")
+            response = http_post(S2_BATCH_URL, json={"ids": [key[3:] for key in chunk]},
+                                 params={"fields": S2_BATCH_FIELDS})
+            if response.status_code != 200:
+                break
+            found = {key: _s2_fields(paper) if paper else {}
+                     for key, paper in zip(chunk, response.json())}
+            changed += self._apply(refs_by_key, found)
+        return changed
+
+    def _from_crossref_dois(self, pending, known):
+        refs_by_key = _group(pending, _doi_key)
+        keys = [key for key in refs_by_key if key not in known]
+        changed = 0
+        for start in range(0, len(keys), CROSSREF_DOI_BATCH):
+            chunk = keys[start:start + CROSSREF_DOI_BATCH]
+            self._acquire("CrossRef")
+            response = http_get(CROSSREF_URL, params={
+                "filter": ",".join(f"doi:{key[4:]}" for key in chunk),
+                "rows": len(chunk), "select": CROSSREF_SELECT})
+            if response.status_code != 200:
+                break
+            found = {key: {} for key in chunk}
+            for item in response.json().get("message", {}).get("items", []):
+                if item.get("DOI"):
+                    found[f"doi:{item['DOI'].lower()}"] = _crossref_fields(item)
+            changed += self._apply(refs_by_key, found)
+        return changed
+
+    # Record tanpa DOI (mis. Google Scholar): dicocokkan lewat judul, dengan batas jumlah
+    def _from_crossref_titles(self, pending, known):
+        refs_by_key = _group(pending, _title_key)
+        found = {}
+        for key in [key for key in refs_by_key if key not in known][:MAX_TITLE_LOOKUPS]:
+            self._acquire("CrossRef")
+            response = http_get(CROSSREF_URL, params={
+                "query.bibliographic": refs_by_key[key][0].get("Title"), "rows": 1,
+                "select": CROSSREF_SELECT})
+            if response.status_code != 200:
+                break
+            items = response.json().get("message", {}).get("items", [])
+            title = normalize_title((items[0].get("title") or [""])[0]) if items else ""
+            found[key] = _crossref_fields(items[0]) \
+                if fuzzy_match(title, key[6:]) >= DUPLICATE_THRESHOLD else {}
+        return self._apply(refs_by_key, found)
+
+
+def get_enricher():
+    global _enricher
+    if _enricher is None:
+        with _enricher_lock:
+            if _enricher is None:
+                _enricher = Enricher()
+    return _enricher
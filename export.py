@@ -0,0 +1,260 @@
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+from dedup import extract_doi
+from records import split_authors
+
+# DOI ternormalisasi (juga dari link doi.org); Scores: relevansi per kata kunci atau None
+FIELDS = ("Title", "Authors", "Journal", "Year", "Link", "Source", "Relevance", "DOI", "Scores")
+INT_FIELDS = ("Year", "Relevance")
+# Jumlah record per potongan yang ditulis ke file
+CHUNK_SIZE = 500
+EXPORT_DIR = os.environ.get("EXPORT_DIR") or tempfile.mkdtemp(prefix="search-export-")
+ARTIFACT_CACHE_SIZE = 32
+
+# Registry format ekspor, urutan pendaftaran = urutan pilihan di UI
+EXPORTERS = {}
+
+_artifacts = OrderedDict()
+_artifacts_lock = threading.Lock()
+
+
+def register_exporter(cls):
+    exporter = cls()
+    if exporter.is_available():
+        EXPORTERS[cls.name] = exporter
+    return cls
+
+
+def _chunks(results):
+    for start in range(0, len(results), CHUNK_SIZE):
+        yield results[start:start + CHUNK_SIZE]
+
+
+def _empty(value):
+    return value in (None, "", "Unknown", "N/A")
+
+
+def _authors(ref):
+    return split_authors(ref.get("Authors"))
+
+
+# Satu baris: baris baru dan spasi berlebih dalam nilai dijadikan satu spasi
+def _single_line(value):
+    return " ".join(str(value).split())
+
+
+# Satu hasil sebagai record ekspor (JSON/JSONL, batch)
+def export_record(ref):
+    record = {field: ref.get(field) for field in FIELDS}
+    record["DOI"] = extract_doi(ref)
+    return record
+
+
+# Record untuk format tabular (CSV, Parquet): Scores sebagai string JSON
+def flat_record(ref):
+    record = export_record(ref)
+    if record["Scores"] is not None:
+        record["Scores"] = json.dumps(record["Scores"], ensure_ascii=False)
+    return record
+
+
+# Antarmuka exporter: menghasilkan potongan teks, atau menulis file sendiri (write)
+class Exporter:
+    name = ""
+    extension = ""
+    mime = "text/plain"
+
+    def is_available(self):
+        return True
+
+    def iter_chunks(self, results):
+        raise NotImplementedError
+
+    def write(self, results, path):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for chunk in self.iter_chunks(results):
+                f.write(chunk)
+
+
+@register_exporter
+class CsvExporter(Exporter):
+    name = "CSV"
+    extension = "csv"
+    mime = "text/csv"
+
+    def iter_chunks(self, results):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for chunk in _chunks(results):
+            writer.writerows(flat_record(ref) for ref in chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+# JSON berorientasi record (daftar objek), bukan format kolom dari df.to_json
+@register_exporter
+class JsonExporter(Exporter):
+    name = "JSON"
+    extension = "json"
+    mime = "application/json"
+
+    def iter_chunks(self, results):
+        yield "["
+        first = True
+        for chunk in _chunks(results):
+            parts = [json.dumps(export_record(ref), ensure_ascii=False) for ref in chunk]
+            yield ("\n" if first else ",\n") + ",\n".join(parts)
+            first = False
+        yield "\n]\n"
+
+
+@register_exporter
+class JsonLinesExporter(Exporter):
+    name = "JSONL"
+    extension = "jsonl"
+    mime = "application/x-ndjson"
+
+    def iter_chunks(self, results):
+        for chunk in _chunks(results):
+            yield "".join(json.dumps(export_record(ref), ensure_ascii=False) + "\n"
+                          for ref in chunk)
+
+
+@register_exporter
+class ParquetExporter(Exporter):
+    name = "Parquet"
+    extension = "parquet"
+    mime = "application/vnd.apache.parquet"
+
+    def is_available(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def write(self, results, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(field, pa.int64() if field in INT_FIELDS else pa.string())
+                            for field in FIELDS])
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in _chunks(results):
+                records = [flat_record(ref) for ref in chunk]
+                columns = {field: [None if record[field] is None else str(record[field])
+                                   for record in records] for field in FIELDS}
+                for field in INT_FIELDS:
+                    columns[field] = [record[field] for record in records]
+                writer.write_table(pa.table(columns, schema=schema))
+
+
+@register_exporter
+class BibtexExporter(Exporter):
+    name = "BibTeX"
+    extension = "bib"
+    mime = "application/x-bibtex"
+    # Karakter khusus LaTeX; url dan doi dibaca verbatim sehingga hanya kurung kurawalnya
+    # yang di-percent-encode
+    SPECIAL_CHARS = {"\\": r"\textbackslash{}", "{": r"\{", "}": r"\}", "%": r"\%", "&": r"\&",
+                     "#": r"\#", "_": r"\_", "$": r"\$", "~": r"\textasciitilde{}",
+                     "^": r"\textasciicircum{}"}
+    VERBATIM_FIELDS = ("doi", "url")
+
+    @classmethod
+    def _escape(cls, name, value):
+        value = _single_line(value)
+        if name in cls.VERBATIM_FIELDS:
+            return value.replace("{", "%7B").replace("}", "%7D")
+        return re.sub(r"[\\{}%&#_$~^]", lambda match: cls.SPECIAL_CHARS[match.group()], value)
+
+    def _key(self, ref, used):
+        authors = _authors(ref)
+        surname = "anon"
+        if authors:
+            # "Nama belakang, Nama depan" atau "Nama depan Nama belakang"
+            first = authors[0]
+            surname = re.sub(r"\W", "", first.split(",")[0] if "," in first else first.split()[-1])
+        word = next(iter(re.findall(r"[A-Za-z]{3,}", str(ref.get("Title", "")))), "ref")
+        year = "" if _empty(ref.get("Year")) else str(ref.get("Year"))
+        base = f"{surname}{year}{word}".lower() or "ref"
+        key, suffix = base, 1
+        while key in used:
+            suffix += 1
+            key = f"{base}{suffix}"
+        used.add(key)
+        return key
+
+    def iter_chunks(self, results):
+        used = set()
+        for chunk in _chunks(results):
+            entries = []
+            for ref in chunk:
+                fields = [("title", ref.get("Title")),
+                          ("author", " and ".join(_authors(ref)) or None),
+                          ("journal", ref.get("Journal")),
+                          ("year", ref.get("Year")),
+                          ("doi", extract_doi(ref)),
+                          ("url", ref.get("Link"))]
+                body = ",\n".join(f"  {name} = {{{self._escape(name, value)}}}"
+                                  for name, value in fields if not _empty(value))
+                entries.append(f"@article{{{self._key(ref, used)},\n{body}\n}}\n\n")
+            yield "".join(entries)
+
+
+@register_exporter
+class RisExporter(Exporter):
+    name = "RIS"
+    extension = "ris"
+    mime = "application/x-research-info-systems"
+
+    def iter_chunks(self, results):
+        for chunk in _chunks(results):
+            lines = []
+            for ref in chunk:
+                lines.append("TY  - JOUR")
+                # Satu tag per baris: nilai dengan baris baru akan merusak baris tag berikutnya
+                fields = [("TI", ref.get("Title"))] + [("AU", author) for author in _authors(ref)]
+                fields += [("JO", ref.get("Journal")), ("PY", ref.get("Year")),
+                           ("DO", extract_doi(ref)), ("UR", ref.get("Link"))]
+                for tag, value in fields:
+                    if not _empty(value) and _single_line(value):
+                        lines.append(f"{tag}  - {_single_line(value)}")
+                lines.append("ER  - ")
+                lines.append("")
+            yield "\n".join(lines) + "\n"
+
+
+def get_cached_export(results_key, format_name):
+    with _artifacts_lock:
+        path = _artifacts.get((results_key, format_name))
+        if path is not None:
+            _artifacts.move_to_end((results_key, format_name))
+        return path
+
+
+# Membuat file ekspor hanya saat diminta, ditulis per potongan ke disk dan
+# disimpan per (himpunan hasil, format) agar tidak dibuat ulang setiap rerun
+def export_file(results_key, results, format_name):
+    path = get_cached_export(results_key, format_name)
+    if path is not None and os.path.exists(path):
+        return path
+    exporter = EXPORTERS[format_name]
+    path = os.path.join(EXPORT_DIR, f"{results_key}.{exporter.extension}")
+    exporter.write(results, path)
+    with _artifacts_lock:
+        _artifacts[(results_key, format_name)] = path
+        while len(_artifacts) > ARTIFACT_CACHE_SIZE:
+            _, old_path = _artifacts.popitem(last=False)
+            if os.path.exists(old_path):
+                os.remove(old_path)
+    return path
@@ -0,0 +1,89 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Batas koneksi per host dan timeout (connect, read) dalam detik
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+DEFAULT_TIMEOUT = (3.05, 15)
+
+# Retry dengan backoff eksponensial untuk error sementara dari server. 429 dan 503 (yang
+# membawa Retry-After) tidak di-retry di sini: diteruskan ke adapter sumber agar batas
+# MAX_RETRY_WAIT, jeda rate limiter dan circuit breaker yang menanganinya
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUS = (500, 502, 504)
+
+# Batas koneksi klien async, dipakai bersama oleh semua sesi
+ASYNC_MAX_CONNECTIONS = 50
+ASYNC_MAX_KEEPALIVE = 20
+
+_session = None
+_session_lock = threading.Lock()
+_async_client = None
+
+
+def _build_session():
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    # pool_block=True agar jumlah koneksi per host tidak melebihi POOL_MAXSIZE
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry,
+        pool_block=True,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+# Satu session bersama per proses supaya koneksi (TCP+TLS) dipakai ulang
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def http_get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT):
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+
+# POST tidak di-retry otomatis oleh session (hanya GET/HEAD)
+def http_post(url, json=None, params=None, headers=None, timeout=DEFAULT_TIMEOUT):
+    return get_session().post(url, json=json, params=params, headers=headers, timeout=timeout)
+
+
+# Klien httpx bersama; harus dipanggil dari event loop milik async_engine
+def get_async_client():
+    global _async_client
+    if _async_client is None:
+        import httpx
+
+        connect, read = DEFAULT_TIMEOUT
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            transport=httpx.AsyncHTTPTransport(
+                retries=RETRY_TOTAL,
+                limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS,
+                                    max_keepalive_connections=ASYNC_MAX_KEEPALIVE),
+            ),
+            headers={"Accept": "application/json"},
+            follow_redirects=True,
+        )
+    return _async_client
@@ -0,0 +1,161 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from dedup import extract_doi, normalize_title
+from records import Reference
+
+LOCAL_INDEX_PATH = os.environ.get("LOCAL_INDEX_PATH", "local_index.sqlite")
+# Snapshot hasil lama yang diimpor saat indeks masih kosong
+SNAPSHOT_FILES = ("saved_references.csv", "saved_references.json")
+
+# Kolom yang disimpan; DOI disimpan ternormalisasi (extract_doi) agar dedup tetap bekerja
+FIELDS = ("Title", "Authors", "Journal", "Year", "Link", "Source", "DOI")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    title TEXT, authors TEXT, journal TEXT, year TEXT, link TEXT, source TEXT, doi TEXT,
+    added REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS refs_fts USING fts5(
+    title, authors, journal, doi, content='refs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS refs_ai AFTER INSERT ON refs BEGIN
+    INSERT INTO refs_fts (rowid, title, authors, journal, doi)
+    VALUES (new.id, new.title, new.authors, new.journal, new.doi);
+END;
+CREATE TRIGGER IF NOT EXISTS refs_ad AFTER DELETE ON refs BEGIN
+    INSERT INTO refs_fts (refs_fts, rowid, title, authors, journal, doi)
+    VALUES ('delete', old.id, old.title, old.authors, old.journal, old.doi);
+END;
+CREATE TRIGGER IF NOT EXISTS refs_au AFTER UPDATE ON refs BEGIN
+    INSERT INTO refs_fts (refs_fts, rowid, title, authors, journal, doi)
+    VALUES ('delete', old.id, old.title, old.authors, old.journal, old.doi);
+    INSERT INTO refs_fts (rowid, title, authors, journal, doi)
+    VALUES (new.id, new.title, new.authors, new.journal, new.doi);
+END;
+"""
+# Indeks lama tanpa kolom doi: tabel FTS dan trigger dibuat ulang dengan kolom doi
+_DROP_FTS = """
+DROP TRIGGER IF EXISTS refs_ai;
+DROP TRIGGER IF EXISTS refs_ad;
+DROP TRIGGER IF EXISTS refs_au;
+DROP TABLE IF EXISTS refs_fts;
+"""
+
+
+def _reference_key(ref):
+    return extract_doi(ref) or normalize_title(ref.get("Title"))
+
+
+def _fts_query(keyword):
+    # Setiap kata dikutip agar karakter khusus FTS5 tidak dianggap operator
+    terms = normalize_title(keyword).split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+# Indeks full-text (SQLite FTS5) atas semua hasil pencarian yang pernah didapat
+class LocalIndex:
+    def __init__(self, path=LOCAL_INDEX_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+        self._db.commit()
+
+    def _migrate(self):
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(refs)")}
+        if "doi" in columns:
+            return
+        self._db.executescript(_DROP_FTS)
+        self._db.execute("ALTER TABLE refs ADD COLUMN doi TEXT")
+        # DOI baris lama dipulihkan dari link-nya (mis. https://doi.org/10...)
+        rows = self._db.execute("SELECT id, link FROM refs").fetchall()
+        self._db.executemany("UPDATE refs SET doi = ? WHERE id = ?",
+                             [(extract_doi({"Link": link}), id_) for id_, link in rows])
+        self._db.executescript(_SCHEMA)
+        self._db.execute("INSERT INTO refs_fts (refs_fts) VALUES ('rebuild')")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+
+    def add(self, references):
+        rows = []
+        now = time.time()
+        for ref in references:
+            key = _reference_key(ref)
+            if not key or key == "unknown":
+                continue
+            rows.append((key, *(str(ref.get(field) if ref.get(field) is not None else "N/A")
+                                for field in FIELDS[:-1]), extract_doi(ref), now))
+        if not rows:
+            return 0
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO refs (key, title, authors, journal, year, link, source, doi, added) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET title = excluded.title, authors = excluded.authors, "
+                "journal = excluded.journal, year = excluded.year, link = excluded.link, "
+                "source = excluded.source, doi = COALESCE(excluded.doi, refs.doi), "
+                "added = excluded.added",
+                rows,
+            )
+            self._db.commit()
+        return len(rows)
+
+    # exclude_sources: sumber asal yang hasilnya tidak dikembalikan (mis. sumber ber-API key)
+    def search(self, keyword, limit, offset=0, exclude_sources=()):
+        query = _fts_query(keyword)
+        if not query:
+            return []
+        exclude = list(exclude_sources)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT refs.title, refs.authors, refs.journal, refs.year, refs.link, refs.source, "
+                "refs.doi "
+                "FROM refs_fts JOIN refs ON refs.id = refs_fts.rowid "
+                f"WHERE refs_fts MATCH ? AND refs.source NOT IN ({', '.join('?' * len(exclude))}) "
+                "ORDER BY bm25(refs_fts) LIMIT ? OFFSET ?",
+                (query, *exclude, limit, offset),
+            ).fetchall()
+        return [Reference(**dict(zip(FIELDS, row))) for row in rows]
+
+    # Mengimpor snapshot CSV atau JSON (format kolom dari df.to_json) ke indeks
+    def import_file(self, path):
+        if path.endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                rows = [{field: data[field].get(i) for field in data}
+                        for i in data.get("Title", {})]
+            else:
+                rows = data
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        return self.add(rows)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# Satu indeks per proses; diisi dari snapshot lama saat pertama kali dibuat
+def get_local_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = LocalIndex()
+                if not len(index):
+                    for path in SNAPSHOT_FILES:
+                        if os.path.exists(path):
+                            index.import_file(path)
+                _index = index
+    return _index
@@ -0,0 +1,169 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Jumlah observasi terakhir per metrik yang dipakai menghitung persentil
+WINDOW_SIZE = 1000
+QUANTILES = (0.5, 0.95, 0.99)
+PREFIX = "search_"
+
+# Port endpoint Prometheus dan file JSONL; keduanya nonaktif jika tidak diisi
+METRICS_PORT = os.environ.get("METRICS_PORT")
+METRICS_DUMP_PATH = os.environ.get("METRICS_DUMP_PATH")
+METRICS_DUMP_INTERVAL = float(os.environ.get("METRICS_DUMP_INTERVAL", "60"))
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Timer per tahap dan counter, dipakai bersama seluruh proses
+class Metrics:
+    def __init__(self, window_size=WINDOW_SIZE):
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._windows = defaultdict(lambda: deque(maxlen=self.window_size))
+        self._totals = defaultdict(lambda: [0, 0.0])
+        self._counters = defaultdict(int)
+
+    def observe(self, metric, seconds, **labels):
+        key = (metric, _labels_key(labels))
+        with self._lock:
+            self._windows[key].append(seconds)
+            total = self._totals[key]
+            total[0] += 1
+            total[1] += seconds
+
+    def incr(self, metric, amount=1, **labels):
+        with self._lock:
+            self._counters[(metric, _labels_key(labels))] += amount
+
+    @contextmanager
+    def timer(self, metric, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - start, **labels)
+
+    def timings(self):
+        with self._lock:
+            items = [(key, list(window), tuple(self._totals[key]))
+                     for key, window in self._windows.items()]
+        rows = []
+        for (metric, labels), window, (count, total) in sorted(items):
+            row = {"metric": metric, **dict(labels), "count": count, "sum": total}
+            for q in QUANTILES:
+                row[f"p{int(q * 100)}"] = percentile(window, q)
+            rows.append(row)
+        return rows
+
+    def counters(self):
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [{"metric": metric, **dict(labels), "value": value}
+                for (metric, labels), value in items]
+
+    def to_prometheus(self):
+        with self._lock:
+            windows = {key: list(window) for key, window in self._windows.items()}
+            totals = {key: tuple(total) for key, total in self._totals.items()}
+            counters = dict(self._counters)
+        lines = []
+        for metric in sorted({metric for metric, _ in windows}):
+            name = PREFIX + metric
+            lines.append(f"# TYPE {name} summary")
+            for key in sorted(k for k in windows if k[0] == metric):
+                labels = key[1]
+                for q in QUANTILES:
+                    value = percentile(windows[key], q)
+                    lines.append(f"{name}{_format_labels(labels, quantile=q)} {value:.6f}")
+                count, total = totals[key]
+                lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for metric in sorted({metric for metric, _ in counters}):
+            name = PREFIX + metric
+            lines.append(f"# TYPE {name} counter")
+            for key in sorted(k for k in counters if k[0] == metric):
+                lines.append(f"{name}{_format_labels(key[1])} {counters[key]}")
+        return "\n".join(lines) + "\n"
+
+    def dump_jsonl(self, path):
+        record = {"time": time.time(), "timings": self.timings(), "counters": self.counters()}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+
+_metrics = Metrics()
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def get_metrics():
+    return _metrics
+
+
+def _serve_prometheus(port):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = get_metrics().to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+
+def _dump_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        get_metrics().dump_jsonl(path)
+
+
+# Menyalakan endpoint /metrics dan/atau dump JSONL berkala, sekali per proses
+def start_exporters(port=METRICS_PORT, dump_path=METRICS_DUMP_PATH, interval=METRICS_DUMP_INTERVAL):
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    if port:
+        _serve_prometheus(int(port))
+    if dump_path:
+        threading.Thread(target=_dump_periodically, args=(dump_path, interval),
+                         name="metrics-dump", daemon=True).start()
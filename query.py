@@ -0,0 +1,174 @@
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+from records import normalize_year
+
+# Sintaks field yang dikenali (nama di query -> kolom hasil), mis. author:"andrew ng"
+FIELD_ALIASES = {
+    "title": "Title", "judul": "Title",
+    "author": "Authors", "penulis": "Authors",
+    "venue": "Journal", "journal": "Journal", "jurnal": "Journal",
+    "year": "Year", "tahun": "Year",
+}
+
+# Beberapa kata kunci dalam satu query dijalankan bersama; ekspansi dibatasi jumlahnya
+MAX_EXPANSIONS = 8
+# Cara menggabungkan hasilnya: union memakai skor tertinggi antar kata kunci,
+# intersect hanya hasil yang ditemukan semua kata kunci dengan skor terendahnya
+UNION = "union"
+INTERSECT = "intersect"
+COMBINE_MODES = (UNION, INTERSECT)
+
+_TOKEN_PATTERN = re.compile(r'(\w+):"([^"]*)"|(\w+):(\S+)|"([^"]*)"|(\S+)')
+# Token untuk ekspansi: frasa/field dalam kutip, kurung, pemisah ";"/baris baru,
+# operator "|" dan "OR" (huruf besar, berdiri sendiri), atau kata biasa
+_EXPAND_PATTERN = re.compile(r'"[^"]*"?|[()]|[;\n]|\|'
+                             r'|(?<!\S)OR(?!\S)|[^\s"();|]+(?:"[^"]*"?)?')
+_ALTERNATIVE_TOKENS = (";", "\n", "|", "OR")
+_YEAR_RANGE_PATTERN = re.compile(r"^(\d{4})?\s*(?:-|\.\.)\s*(\d{4})?$")
+_EDGE_PUNCTUATION = ".,;:!?()[]{}<>'\"`“”‘’"
+
+# terms: kata bebas; phrases: frasa dalam tanda kutip; fields: pasangan (kolom, nilai)
+# terurut; text: teks yang dikirim ke sumber; key: kunci kanonik untuk cache,
+# penggabungan permintaan yang sedang berjalan, dan log. Kunci dibentuk dari text yang
+# sama tanpa membuang kata apa pun ("hepatitis a" bukan "hepatitis"), sehingga dua query
+# hanya berbagi kunci jika sumber menerima teks yang sama
+Query = namedtuple("Query", ["terms", "phrases", "fields", "text", "key"])
+
+
+# Unicode NFKC, tanpa karakter kontrol/zero-width, huruf kecil, spasi tunggal
+def normalize_text(text):
+    text = unicodedata.normalize("NFKC", str(text or ""))
+    text = "".join(" " if unicodedata.category(ch) in ("Cc", "Zs") else ch
+                   for ch in text if unicodedata.category(ch) != "Cf")
+    return " ".join(text.casefold().split())
+
+
+def _clean_term(term):
+    return term.strip(_EDGE_PUNCTUATION)
+
+
+def _year_value(value):
+    match = _YEAR_RANGE_PATTERN.match(value)
+    if match:
+        low, high = match.groups()
+        return f"{low or ''}-{high or ''}" if low or high else None
+    year = normalize_year(value)
+    return str(year) if year else None
+
+
+@lru_cache(maxsize=1024)
+def parse_query(raw):
+    terms, phrases, fields = [], [], []
+    for match in _TOKEN_PATTERN.finditer(normalize_text(raw)):
+        quoted_field, quoted_value, field, value, phrase, word = match.groups()
+        field, value = (quoted_field, quoted_value) if quoted_field else (field, value)
+        if field and field in FIELD_ALIASES:
+            column = FIELD_ALIASES[field]
+            value = _year_value(value) if column == "Year" else " ".join(value.split())
+            if value:
+                fields.append((column, value))
+            continue
+        if phrase is not None:
+            phrase = " ".join(phrase.split())
+            if phrase:
+                phrases.append(phrase)
+            continue
+        term = _clean_term(match.group(0))
+        if term:
+            terms.append(term)
+
+    fields = sorted(set(fields))
+
+    # Nilai field teks ikut dikirim ke sumber agar hasilnya relevan, lalu disaring lokal
+    extra = [value for column, value in fields if column != "Year"]
+    text = " ".join([f'"{phrase}"' for phrase in phrases] + terms + extra)
+    key = " ".join([text] + [f'{column.lower()}:"{value}"' for column, value in fields]).strip()
+    return Query(tuple(terms), tuple(phrases), tuple(fields), text, key)
+
+
+def _expand_sequence(tokens, pos, depth):
+    # Satu rangkaian item; kurung berisi alternatif dikalikan (cartesian) dengan item lain
+    expansions = [[]]
+    while pos < len(tokens):
+        token = tokens[pos]
+        if token in _ALTERNATIVE_TOKENS or (token == ")" and depth):
+            break
+        pos += 1
+        if token == "(":
+            options, pos = _expand_alternatives(tokens, pos, depth + 1)
+            if pos < len(tokens) and tokens[pos] == ")":
+                pos += 1
+        elif token == ")":
+            continue
+        else:
+            options = [[token]]
+        expansions = [prefix + option for prefix in expansions
+                      for option in options][:MAX_EXPANSIONS * 4]
+    return expansions, pos
+
+
+def _expand_alternatives(tokens, pos, depth):
+    alternatives = []
+    while True:
+        expansions, pos = _expand_sequence(tokens, pos, depth)
+        alternatives.extend(expansion for expansion in expansions if expansion)
+        if pos < len(tokens) and tokens[pos] in _ALTERNATIVE_TOKENS:
+            pos += 1
+            continue
+        return alternatives, pos
+
+
+# Memecah query berisi beberapa kata kunci menjadi sub-query, mis.
+# "(deep OR machine) learning; transformer" -> "deep learning", "machine learning",
+# "transformer". Sub-query yang kanoniknya sama hanya muncul sekali.
+@lru_cache(maxsize=1024)
+def expand_query(raw):
+    raw = str(raw or "")
+    tokens = _EXPAND_PATTERN.findall(raw)
+    if not any(token in _ALTERNATIVE_TOKENS for token in tokens):
+        return (raw,)
+    terms, seen = [], set()
+    for expansion in _expand_alternatives(tokens, 0, 0)[0]:
+        term = " ".join(expansion)
+        key = parse_query(term).key
+        if key and key not in seen:
+            seen.add(key)
+            terms.append(term)
+    return tuple(terms[:MAX_EXPANSIONS]) or (raw,)
+
+
+# Query dengan beberapa kata kunci: urutan sub-query tidak mengubah kunci
+def canonical_key(raw):
+    terms = expand_query(raw)
+    if len(terms) == 1:
+        return parse_query(terms[0]).key
+    return " OR ".join(sorted(parse_query(term).key for term in terms))
+
+
+# Teks query untuk sumber dan ranking, tanpa sintaks field
+def search_text(raw):
+    return parse_query(raw).text
+
+
+def _matches_field(ref, column, value):
+    if column == "Year":
+        year = normalize_year(ref.get("Year"))
+        if year is None:
+            return False
+        if "-" not in value:
+            return year == int(value)
+        low, high = value.split("-")
+        return (not low or year >= int(low)) and (not high or year <= int(high))
+    return value in normalize_text(ref.get(column))
+
+
+# Menyaring hasil sesuai sintaks field query (title:, author:, venue:, year:)
+def filter_references(references, raw):
+    fields = parse_query(raw).fields
+    if not fields:
+        return references
+    return [ref for ref in references
+            if all(_matches_field(ref, column, value) for column, value in fields)]
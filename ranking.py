@@ -0,0 +1,105 @@
+import math
+import re
+from collections import Counter
+
+# Registry metode peringkat, urutan pendaftaran = urutan pilihan di sidebar
+SCORERS = {}
+DEFAULT_SCORER = "Fuzzy judul"
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def register_scorer(cls):
+    SCORERS[cls.name] = cls()
+    return cls
+
+
+def get_scorer(name=None):
+    return SCORERS[name or DEFAULT_SCORER]
+
+
+def tokenize(text):
+    return _TOKEN_PATTERN.findall(str(text or "").lower())
+
+
+# Antarmuka scorer: menilai semua referensi sekaligus, hasil 0-100 per referensi.
+# incremental=True jika skor satu referensi tidak bergantung pada referensi lain,
+# sehingga hasil bisa dinilai per batch saat sumber masih mengirim (top-k merge)
+class Scorer:
+    name = ""
+    incremental = False
+
+    def score(self, keyword, references):
+        raise NotImplementedError
+
+
+@register_scorer
+class TitleFuzzyScorer(Scorer):
+    name = "Fuzzy judul"
+    incremental = True
+
+    def score(self, keyword, references):
+        # rapidfuzz diimpor saat menilai, bukan saat sidebar membaca SCORERS: versi yang
+        # dipin (3.6) ikut mengimpor pandas, lihat benchmarks/import_time.py
+        from rapidfuzz import fuzz, process, utils
+
+        titles = [ref.get("Title") or "" for ref in references]
+        # Satu panggilan batch untuk semua judul, dijalankan di semua core
+        matrix = process.cdist([keyword], titles, scorer=fuzz.token_sort_ratio,
+                               processor=utils.default_process, workers=-1)
+        return matrix[0].tolist()
+
+
+@register_scorer
+class BM25Scorer(Scorer):
+    name = "BM25 judul + jurnal"
+    k1 = 1.5
+    b = 0.75
+
+    def score(self, keyword, references):
+        query = set(tokenize(keyword))
+        documents = [Counter(tokenize(f"{ref.get('Title', '')} {ref.get('Journal', '')}"))
+                     for ref in references]
+        if not query or not documents:
+            return [0.0] * len(references)
+        avg_length = sum(sum(doc.values()) for doc in documents) / len(documents) or 1.0
+        doc_freq = Counter(term for doc in documents for term in query if term in doc)
+        idf = {term: math.log(1 + (len(documents) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+               for term in query}
+
+        scores = []
+        for doc in documents:
+            length = sum(doc.values())
+            total = 0.0
+            for term in query:
+                tf = doc.get(term, 0)
+                if tf:
+                    total += idf[term] * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+            scores.append(total)
+        # Dinormalisasi ke 0-100 terhadap skor tertinggi di himpunan hasil
+        best = max(scores)
+        return [100.0 * s / best if best else 0.0 for s in scores]
+
+
+@register_scorer
+class WeightedScorer(Scorer):
+    name = "Gabungan (fuzzy + BM25)"
+    weights = (("Fuzzy judul", 0.6), ("BM25 judul + jurnal", 0.4))
+
+    def score(self, keyword, references):
+        combined = [0.0] * len(references)
+        for name, weight in self.weights:
+            for i, value in enumerate(get_scorer(name).score(keyword, references)):
+                combined[i] += weight * value
+        return combined
+
+
+# Mengisi kolom Relevance untuk semua referensi dengan scorer terpilih
+def rank_references(references, keyword, scorer=None):
+    if not references:
+        return references
+    scores = get_scorer(scorer).score(keyword, references)
+    for ref, value in zip(references, scores):
+        ref["Relevance"] = int(round(value))
+    return references
@@ -0,0 +1,159 @@
+import re
+
+# Nama kolom hasil (seperti yang dipakai UI, ekspor, dan indeks lokal).
+# Scores: relevansi per kata kunci untuk query dengan beberapa kata kunci, selain itu None
+FIELDS = ("Title", "Authors", "Journal", "Year", "Link", "Source", "Relevance", "DOI", "Scores")
+# Kolom dengan sedikit nilai unik yang disimpan sebagai categorical di DataFrame
+CATEGORICAL_FIELDS = ("Source", "Journal")
+# Nama kolom DataFrame untuk skor satu kata kunci
+SCORE_COLUMN = "Relevance [{}]"
+
+# Pemisah penulis di kolom Authors. Bukan ",", karena satu nama bisa berbentuk
+# "Nama belakang, Nama depan" (mis. dc:creator ScienceDirect)
+AUTHOR_SEPARATOR = "; "
+
+_YEAR_PATTERN = re.compile(r"\b(1[5-9]\d\d|20\d\d)\b")
+
+
+# Tahun sebagai int (atau None), dari int, "2021", "2021-05-01", "N/A", dll.
+def normalize_year(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value > 0 else None
+    if isinstance(value, float):
+        return int(value) if value == value and value > 0 else None
+    match = _YEAR_PATTERN.search(str(value))
+    return int(match.group(1)) if match else None
+
+
+# Satu hasil pencarian dengan __slots__: jauh lebih kecil dari dict per record,
+# tetapi tetap bisa diakses seperti dict (ref["Title"], ref.get("DOI"), dict(ref))
+# sehingga ranking, dedup, cache, dan ekspor tidak perlu tahu bedanya
+class Reference:
+    __slots__ = FIELDS
+
+    def __init__(self, Title="Unknown", Authors="Unknown", Journal="Unknown", Year=None,
+                 Link="N/A", Source="", Relevance=0, DOI=None, Scores=None):
+        self.Title = Title
+        self.Authors = Authors
+        self.Journal = Journal
+        self.Year = normalize_year(Year)
+        self.Link = Link
+        self.Source = Source
+        self.Relevance = Relevance
+        self.DOI = DOI
+        self.Scores = Scores
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field) for field in FIELDS if data.get(field) is not None})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def copy(self):
+        ref = Reference.from_dict(self)
+        if ref.Scores is not None:
+            ref.Scores = dict(ref.Scores)
+        return ref
+
+    def keys(self):
+        return FIELDS
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in FIELDS]
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None) if field in FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field not in FIELDS:
+            raise KeyError(field)
+        setattr(self, field, normalize_year(value) if field == "Year" else value)
+
+    def __contains__(self, field):
+        return field in FIELDS
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __eq__(self, other):
+        return isinstance(other, Reference) and self.items() == other.items()
+
+    def __repr__(self):
+        return f"Reference({self.Title!r}, {self.Source!r}, {self.Year!r})"
+
+
+def join_authors(names):
+    return AUTHOR_SEPARATOR.join(name.strip() for name in names if name and name.strip())
+
+
+# Daftar penulis dari kolom Authors (string atau list). Hasil lama yang digabung dengan ", "
+# hanya dipecah jika setiap bagian berupa nama lengkap ("Ada Lovelace, Alan Turing");
+# "Lovelace, Ada" tetap satu penulis
+def split_authors(value):
+    if value in (None, "", "Unknown", "N/A"):
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(name).strip() for name in value if str(name).strip()]
+    value = str(value)
+    if AUTHOR_SEPARATOR.strip() in value:
+        parts = value.split(AUTHOR_SEPARATOR.strip())
+    else:
+        parts = value.split(",")
+        if not all(" " in part.strip() for part in parts):
+            parts = [value]
+    return [part.strip() for part in parts if part.strip()]
+
+
+def to_references(items):
+    return [item if isinstance(item, Reference) else Reference.from_dict(item) for item in items]
+
+
+def score_terms(results):
+    terms = {}
+    for ref in results:
+        terms.update(dict.fromkeys(ref.get("Scores") or ()))
+    return list(terms)
+
+
+def score_columns(columns):
+    prefix = SCORE_COLUMN.format("")[:-1]
+    return [column for column in columns if column.startswith(prefix)]
+
+
+# Bentuk kolom dari daftar hasil: Source/Journal categorical, Year Int16 nullable,
+# Relevance int; dibangun langsung per kolom tanpa DataFrame object per record.
+# Scores dipecah menjadi satu kolom Int16 per kata kunci (SCORE_COLUMN)
+def to_frame(results, columns=FIELDS):
+    import pandas as pd
+
+    data = {}
+    names = []
+    for field in columns:
+        if field == "Scores":
+            for term in score_terms(results):
+                column = SCORE_COLUMN.format(term)
+                data[column] = pd.array([(ref.get("Scores") or {}).get(term) for ref in results],
+                                        dtype="Int16")
+                names.append(column)
+            continue
+        names.append(field)
+        values = [getattr(ref, field) if isinstance(ref, Reference) else ref.get(field)
+                  for ref in results]
+        if field in CATEGORICAL_FIELDS:
+            data[field] = pd.Categorical(values)
+        elif field == "Year":
+            data[field] = pd.array([normalize_year(value) for value in values], dtype="Int16")
+        elif field == "Relevance":
+            data[field] = pd.array(values, dtype="Int16")
+        else:
+            data[field] = values
+    return pd.DataFrame(data, columns=names)
@@ -0,0 +1,49 @@
+import html
+import threading
+from collections import OrderedDict
+
+# Jumlah kartu per halaman tampilan dan per klik "muat lebih banyak"
+PAGE_SIZE = 20
+# Jumlah himpunan hasil yang fragmen HTML-nya disimpan
+FRAGMENT_CACHE_SIZE = 32
+
+_fragments = OrderedDict()
+_fragments_lock = threading.Lock()
+
+
+# Template HTML satu kartu hasil; dipakai UI Streamlit dan benchmark
+def card_html(ref):
+    field = {key: html.escape(str(ref.get(key, "N/A"))) for key in
+             ("Title", "Authors", "Journal", "Year", "Source", "Relevance", "Link")}
+    return f"""
+            <div class="result-card">
+                <h4>{field['Title']}</h4>
+                <p><b>Penulis:</b> {field['Authors']}</p>
+                <p><b>Jurnal:</b> {field['Journal']} ({field['Year']})</p>
+                <p><b>Sumber:</b> {field['Source']} | Relevansi: {field['Relevance']}%</p>
+                <a href="{field['Link']}" target="_blank">📖 Buka Artikel</a>
+            </div>
+            """
+
+
+# Fragmen HTML kartu untuk satu himpunan hasil, dibuat sekali lalu dipakai ulang
+# di setiap rerun; hanya kartu yang diminta (hingga `upto`) yang dibangun
+def card_fragments(results_key, results, upto):
+    with _fragments_lock:
+        fragments = _fragments.get(results_key)
+        if fragments is None:
+            fragments = _fragments[results_key] = []
+        _fragments.move_to_end(results_key)
+        while len(_fragments) > FRAGMENT_CACHE_SIZE:
+            _fragments.popitem(last=False)
+        upto = min(upto, len(results))
+        for ref in results[len(fragments):upto]:
+            fragments.append(card_html(ref))
+        return fragments[:upto]
+
+
+# Satu blok HTML untuk kartu yang terlihat, bukan satu elemen Streamlit per kartu
+def cards_page_html(results_key, results, visible):
+    if results_key is None:
+        return "".join(card_html(ref) for ref in results[:visible])
+    return "".join(card_fragments(results_key, results, visible))
@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from metrics import percentile
+
+# Retry-After lebih lama dari ini tidak ditunggu; sumber langsung dianggap gagal
+MAX_RETRY_WAIT = 10
+
+
+class UpstreamError(Exception):
+    def __init__(self, source, status, retry_after=None):
+        super().__init__(f"{source} membalas HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, source):
+        super().__init__(f"{source} sedang dilewati (circuit breaker terbuka)")
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Token bucket per sumber, dipakai bersama oleh semua sesi dan thread
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait(self, now):
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(wait, self._blocked_until - now)
+
+    # Memesan satu token dan mengembalikan lama menunggu (detik) sebelum boleh jalan
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            return self._wait(now)
+
+    # Lama antrean (detik) permintaan yang sudah memesan token, tanpa memesan token baru
+    def backlog(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._wait(now)
+
+    # Menahan semua permintaan, mis. sesuai header Retry-After
+    def pause(self, seconds):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# Circuit breaker: setelah beberapa kegagalan berturut-turut sumber dilewati,
+# lalu setelah reset_timeout satu permintaan percobaan (half-open) dibolehkan.
+# allow() mengembalikan tiket (True, atau token milik percobaan half-open) yang
+# diserahkan kembali ke release()
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        # Token percobaan half-open yang sedang berjalan, None jika tidak ada
+        self._probe = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def is_open(self):
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self._probe is not None)
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probe is None:
+                self._probe = object()
+                return self._probe
+            return False
+
+    # Percobaan yang dibatalkan (bukan sukses/gagal) tidak boleh mengunci half-open. Hanya
+    # pemegang token percobaan yang membukanya lagi; permintaan biasa yang dibatalkan
+    # saat percobaan berjalan tidak meloloskan percobaan kedua
+    def release(self, ticket):
+        with self._lock:
+            if ticket is not True and ticket is self._probe:
+                self._probe = None
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probe is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probe = None
+
+
+# Distribusi latensi halaman terakhir per sumber (jendela bergulir), dasar batas waktu
+# adaptif dan hedged request. Sebelum MIN_SAMPLES observasi, quantile() mengembalikan
+# None dan pemanggil memakai batas waktu tetap.
+class LatencyTracker:
+    MIN_SAMPLES = 20
+
+    def __init__(self, window_size=200):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def quantile(self, q):
+        with self._lock:
+            samples = list(self._samples)
+        if len(samples) < self.MIN_SAMPLES:
+            return None
+        return percentile(samples, q)
+
+
+# Jam layanan satu job sumber. Berhenti selama halaman job itu hanya mengantre slot
+# halaman sumber (dipakai bersama semua sesi) dan tidak ada yang sedang diambil,
+# sehingga batas waktu adaptif tidak habis oleh antrean pencarian lain
+class ServiceClock:
+    def __init__(self):
+        self.started = None
+        self.limit = None
+        self._waiting = 0
+        self._running = 0
+        self._paused = 0.0
+        self._paused_at = None
+        self._lock = threading.Lock()
+
+    # Job mulai berjalan dengan batas `limit` detik layanan
+    def start(self, limit):
+        self.limit = limit
+        self.started = time.monotonic()
+
+    # Sisa waktu sebelum batas layanan, paling lama `cap` (sisa batas jam dinding)
+    def remaining(self, cap):
+        if self.started is None:
+            return cap
+        return min(cap, self.limit - self.elapsed())
+
+    # Detik layanan sejak start(); 0 jika job belum mulai
+    def elapsed(self):
+        with self._lock:
+            if self.started is None:
+                return 0.0
+            now = time.monotonic()
+            paused = self._paused + (now - self._paused_at if self._paused_at is not None else 0.0)
+            return now - self.started - paused
+
+    def _update(self):
+        now = time.monotonic()
+        idle = self._waiting > 0 and self._running == 0
+        if idle and self._paused_at is None:
+            self._paused_at = now
+        elif not idle and self._paused_at is not None:
+            self._paused += now - self._paused_at
+            self._paused_at = None
+
+    # Halaman masuk antrean slot
+    def queue(self):
+        with self._lock:
+            self._waiting += 1
+            self._update()
+
+    # Halaman mendapat slot dan mulai diambil
+    def serve(self):
+        with self._lock:
+            self._waiting -= 1
+            self._running += 1
+            self._update()
+
+    # Halaman selesai (served=True) atau batal saat masih mengantre
+    def finish(self, served):
+        with self._lock:
+            if served:
+                self._running -= 1
+            else:
+                self._waiting -= 1
+            self._update()
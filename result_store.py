@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from cache import DEFAULT_TTL
+from enrich import get_enricher
+from query import UNION, canonical_key
+from records import to_frame
+from sources import SOURCES
+
+# Jumlah pencarian yang disimpan per sesi dan bersama untuk seluruh proses
+SESSION_STORE_SIZE = 5
+SHARED_STORE_SIZE = 64
+# Jumlah kombinasi urutan/filter yang hasilnya disimpan per pencarian
+VIEW_CACHE_SIZE = 8
+
+# Pilihan urutan: kolom dan arah (ascending)
+SORT_OPTIONS = {
+    "Relevansi": ("Relevance", False),
+    "Tahun terbaru": ("Year", False),
+    "Tahun terlama": ("Year", True),
+    "Judul (A-Z)": ("Title", True),
+}
+
+# key berubah setiap kali data berubah (mis. setelah pengayaan), filter_key hanya jika
+# urutan/filter berubah
+ResultView = namedtuple("ResultView", ["key", "filter_key", "results", "frame"])
+
+
+# Kunci satu pencarian: query kanonik + parameter yang mengubah hasil, termasuk sidik
+# API key sumber ber-API key (hasilnya tidak dibagikan ke sesi dengan key lain) dan
+# mode top-k perkiraan (bisa menghasilkan top-k yang berbeda)
+def query_key(keyword, max_results, sources, scorer, combine=UNION, api_keys=None,
+              approximate=False):
+    api_keys = api_keys or {}
+    credentials = {name: SOURCES[name].credential(api_keys.get(name))
+                   for name in sorted(sources) if name in SOURCES}
+    credentials = {name: value for name, value in credentials.items() if value is not None}
+    return json.dumps([canonical_key(keyword), int(max_results), sorted(sources), scorer, combine,
+                       credentials, bool(approximate)])
+
+
+# Hasil satu pencarian beserta DataFrame kolomnya; urutan dan filter dihitung
+# dari DataFrame ini tanpa mencari ulang ke sumber
+class ResultEntry:
+    def __init__(self, results, partial=()):
+        self.results = results
+        # Sumber yang dihentikan batas waktu; hasil entri ini belum lengkap
+        self.partial = tuple(partial)
+        self.results_key = uuid.uuid4().hex
+        self.created = time.time()
+        self.version = 0
+        self.enrichment = None
+        self._frame = to_frame(results)
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self):
+        with self._lock:
+            if self._frame is None:
+                self._frame = to_frame(self.results)
+            return self._frame
+
+    # Pengayaan metadata berjalan sekali per entri, di latar belakang
+    def start_enrichment(self):
+        with self._lock:
+            if self.enrichment is None:
+                self.enrichment = get_enricher().submit(self.results, self._on_enriched)
+        return self.enrichment
+
+    def _on_enriched(self, changed):
+        with self._lock:
+            self.version += 1
+            self._frame = None
+            self._views.clear()
+
+    def sources(self):
+        names = []
+        for value in self.frame["Source"].cat.categories:
+            for name in str(value).split(", "):
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def year_range(self):
+        years = self.frame["Year"].dropna()
+        return (int(years.min()), int(years.max())) if len(years) else None
+
+    def view(self, sort="Relevansi", sources=None, years=None, text=""):
+        text = text.strip().lower()
+        key = json.dumps([sort, sorted(sources) if sources is not None else None,
+                          list(years) if years is not None else None, text])
+        with self._lock:
+            cached = self._views.get(key)
+            if cached is not None:
+                self._views.move_to_end(key)
+                return cached
+
+        version = self.version
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        if sources is not None:
+            # Sumber gabungan hasil dedup ("CrossRef, Semantic Scholar") cocok jika salah satunya dipilih
+            source = frame["Source"].cat
+            keep = np.array([any(name in sources for name in str(value).split(", "))
+                             for value in source.categories] + [False])
+            mask &= keep[source.codes.to_numpy()]
+        if years is not None:
+            mask &= frame["Year"].between(years[0], years[1]).fillna(False).to_numpy(dtype=bool)
+        if text:
+            mask &= frame["Title"].str.lower().str.contains(text, regex=False).fillna(False) \
+                .to_numpy(dtype=bool)
+        column, ascending = SORT_OPTIONS[sort]
+        selected = frame[mask].sort_values(column, ascending=ascending, kind="stable",
+                                           na_position="last")
+        filter_key = f"{self.results_key}-{uuid.uuid5(uuid.NAMESPACE_OID, key).hex}"
+        view = ResultView(f"{filter_key}-{version}", filter_key,
+                          [self.results[i] for i in selected.index], selected)
+
+        with self._lock:
+            if version != self.version:
+                return view
+            self._views[key] = view
+            while len(self._views) > VIEW_CACHE_SIZE:
+                self._views.popitem(last=False)
+        return view
+
+
+# Penyimpanan hasil terbatas (LRU) per kunci pencarian; dipakai per sesi dan,
+# lewat st.cache_resource, bersama untuk semua sesi dalam satu proses
+class ResultStore:
+    def __init__(self, size, ttl=None):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.ttl is not None and time.time() - entry.created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+
+def new_session_store():
+    return ResultStore(SESSION_STORE_SIZE)
+
+
+def new_shared_store():
+    return ResultStore(SHARED_STORE_SIZE, ttl=DEFAULT_TTL)
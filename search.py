@@ -0,0 +1,445 @@
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import async_engine
+from cache import get_cache
+from dedup import deduplicate, extract_doi, normalize_title
+from local_index import get_local_index
+from metrics import get_metrics
+from query import INTERSECT, UNION, expand_query, filter_references, search_text
+from ranking import get_scorer, rank_references
+from resilience import CircuitOpenError, ServiceClock
+from sources import MIN_SOURCE_DEADLINE, SOURCES, SourceBatch
+
+# Batas waktu maksimum (detik) sejak pencarian dimulai; tiap sumber memakai batas adaptif
+# dari latensinya sendiri (SourceAdapter.deadline) yang tidak melewati batas ini. Sumber
+# yang lebih lambat dihentikan dan hasilnya yang sudah masuk ditandai partial
+SOURCE_DEADLINE = 30
+MAX_WORKERS = 16
+
+# "async" (httpx + event loop bersama) atau "thread" (ThreadPoolExecutor) sebagai fallback
+SEARCH_ENGINE = os.environ.get("SEARCH_ENGINE", "async")
+
+# Top-k merge: skor maksimum scorer, satu-satunya batas atas pasti untuk halaman yang
+# belum diambil. Mode perkiraan (approximate) menaksirnya dari urutan relevansi sumber:
+# skor tertinggi halaman pertama + SCORE_BOUND_SLACK. Urutan sumber tidak sama dengan
+# skor lokal, jadi taksiran ini bisa mengubah top-k
+MAX_SCORE = 100
+SCORE_BOUND_SLACK = 10
+# Ruang tambahan di heap untuk duplikat fuzzy yang baru digabung di akhir
+DUPLICATE_SLACK = 0.2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# Thread pool bersama per proses untuk engine "thread", bukan satu pool baru per klik
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="search")
+    return _executor
+
+
+def _store_results(name, keyword, max_results, results, credential=None):
+    # Hasil kosong tidak disimpan agar kegagalan sementara tidak ikut ter-cache
+    if results:
+        get_cache().set(name, keyword, max_results, results, credential)
+        # Hasil sumber ber-API key tidak masuk indeks lokal yang bisa dibaca tanpa key
+        if credential is None:
+            get_local_index().add(results)
+
+
+def _cache_on_done(name, keyword, max_results, credential=None):
+    def callback(future):
+        if not future.cancelled() and future.exception() is None:
+            _store_results(name, keyword, max_results, future.result(), credential)
+    return callback
+
+
+def _iter_threaded(jobs, max_results, deadline, should_stop=None):
+    executor = get_executor()
+    start = time.monotonic()
+    futures, clocks = {}, {}
+
+    # Batas waktu adaptif dihitung saat job mendapat thread, bukan saat diantrekan
+    def run(source, keyword, api_key, clock):
+        clock.start(source.deadline(max_results, deadline))
+        return source.search(keyword, max_results, api_key, clock)
+
+    for name, source, api_key, keyword in jobs:
+        clock = ServiceClock()
+        future = executor.submit(run, source, keyword, api_key, clock)
+        # Sumber yang terlambat tetap mengisi cache saat akhirnya selesai
+        future.add_done_callback(_cache_on_done(name, keyword, max_results,
+                                                source.credential(api_key)))
+        futures[future] = (name, keyword)
+        clocks[future] = clock
+
+    pending = set(futures)
+    while pending:
+        # Sumber yang melewati batas adaptifnya (jam layanan) atau `deadline` (jam dinding)
+        # tidak ditunggu lagi; ditandai partial
+        elapsed = time.monotonic() - start
+        remaining = {future: clocks[future].remaining(deadline - elapsed) for future in pending}
+        for future in [future for future in pending
+                       if remaining[future] <= 0 and not future.done()]:
+            future.cancel()
+            pending.discard(future)
+            del remaining[future]
+            name, keyword = futures[future]
+            limit = deadline if elapsed >= deadline else clocks[future].limit
+            get_metrics().incr("source_timeouts_total", source=name)
+            yield SourceBatch(name, [], f"melebihi batas waktu {limit:.1f} detik",
+                              elapsed, True, keyword, True)
+        if not pending:
+            return
+        # Job yang baru mulai saat menunggu punya batas >= MIN_SOURCE_DEADLINE dari sekarang
+        timeout = min(min(remaining.values()), MIN_SOURCE_DEADLINE)
+        done, _ = wait(pending, timeout=max(0, timeout), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future not in pending:
+                continue
+            pending.discard(future)
+            name, keyword = futures[future]
+            elapsed = time.monotonic() - start
+            try:
+                results = future.result()
+            except Exception as e:
+                yield SourceBatch(name, [], str(e), elapsed, True, keyword)
+                continue
+            yield SourceBatch(name, results, None, elapsed, True, keyword)
+            if should_stop is None:
+                continue
+            # Pencarian sumber berjalan utuh di satu thread: yang belum mulai dibatalkan,
+            # yang sedang berjalan dibiarkan selesai (tetap mengisi cache) tanpa ditunggu
+            for other in [other for other in pending if should_stop(*futures[other])]:
+                other.cancel()
+                pending.discard(other)
+                other_name, other_keyword = futures[other]
+                yield SourceBatch(other_name, [], None, time.monotonic() - start, True,
+                                  other_keyword)
+
+
+def _iter_async(jobs, max_results, deadline, should_stop=None):
+    credentials = {name: source.credential(api_key) for name, source, api_key, _ in jobs}
+
+    def on_result(name, keyword, results):
+        _store_results(name, keyword, max_results, results, credentials[name])
+    return async_engine.iter_batches(jobs, max_results, deadline, on_result, should_stop)
+
+
+def _select_engine(engine):
+    engine = engine or SEARCH_ENGINE
+    if engine == "async" and async_engine.is_available():
+        return _iter_async
+    return _iter_threaded
+
+
+# Menghasilkan hasil tiap sumber segera setelah sumber tersebut selesai.
+# sources membatasi sumber yang dipakai (None = default_sources() yang aktif). Query dengan
+# beberapa kata kunci (OR, "|", ";") dijalankan dalam satu fan-out: satu job per
+# (kata kunci, sumber), dengan batas waktu dan batas konkurensi engine yang sama.
+# should_stop(sumber, kata_kunci) menghentikan sumber yang hasilnya tidak dibutuhkan
+# lagi (lihat TopKMerge.should_stop).
+def iter_search(keyword, max_results, api_keys=None, deadline=SOURCE_DEADLINE, engine=None,
+                sources=None, should_stop=None):
+    # Sumber dan cache hanya melihat teks kanonik; sintaks field disaring saat merge.
+    # Beberapa kata kunci bisa berbagi teks yang sama ("year:2020 deep | deep"): satu job
+    # per teks, tetapi hasil tetap ditandai agar merge_references menilai tiap kata kunci
+    terms = expand_query(keyword)
+    keywords = list(dict.fromkeys(text for text in map(search_text, terms) if text))
+    if not keywords:
+        return
+    multi = len(terms) > 1
+    api_keys = api_keys or {}
+    cache = get_cache()
+    jobs = []
+    for name, source in SOURCES.items():
+        api_key = api_keys.get(name)
+        selected = source.default if sources is None else name in sources
+        if not selected or not source.is_enabled(api_key):
+            continue
+        for text in keywords:
+            if not source.remote:
+                # Indeks lokal menjawab seketika, sebelum permintaan ke sumber remote
+                start = time.monotonic()
+                try:
+                    results = source.search(text, max_results, api_key)
+                except Exception as e:
+                    yield SourceBatch(name, [], str(e), time.monotonic() - start, True, text)
+                    continue
+                yield _tag(SourceBatch(name, results, None, time.monotonic() - start, True, text),
+                           multi)
+                continue
+            cached = cache.get(name, text, max_results, source.credential(api_key))
+            get_metrics().incr("cache_lookups_total", source=name,
+                               result="miss" if cached is None else "hit")
+            if cached is not None:
+                yield _tag(SourceBatch(name, [ref.copy() for ref in cached], None, 0.0, True, text),
+                           multi)
+            elif source.breaker.is_open():
+                # Sumber yang terus gagal dilewati tanpa menunggu sampai breaker siap diuji lagi
+                yield SourceBatch(name, [], str(CircuitOpenError(name)), 0.0, True, text)
+            else:
+                jobs.append((name, source, api_key, text))
+
+    if not jobs:
+        return
+    metrics = get_metrics()
+    for batch in _select_engine(engine)(jobs, max_results, deadline, should_stop):
+        metrics.incr("source_results_total", len(batch.results), source=batch.source)
+        if batch.error is not None:
+            metrics.incr("source_failures_total", source=batch.source)
+        elif batch.complete:
+            metrics.observe("source_latency_seconds", batch.elapsed, source=batch.source)
+        yield _tag(batch._replace(results=[ref.copy() for ref in batch.results]), multi)
+
+
+# Hasil query dengan beberapa kata kunci ditandai dengan kata kunci asalnya (Scores),
+# yang dipakai merge_references untuk skor per kata kunci
+def _tag(batch, multi):
+    if multi:
+        for ref in batch.results:
+            ref["Scores"] = {batch.keyword: 0}
+    return batch
+
+
+def _rank(references, keyword, max_results, scorer):
+    metrics = get_metrics()
+    references = filter_references(references, keyword)
+    with metrics.timer("stage_seconds", stage="scoring"):
+        rank_references(references, search_text(keyword), scorer)
+    with metrics.timer("stage_seconds", stage="dedup"):
+        unique_refs = deduplicate(references)
+    with metrics.timer("stage_seconds", stage="sort"):
+        return sorted(unique_refs, key=lambda x: x["Relevance"], reverse=True)[:max_results]
+
+
+# Menggabungkan hasil: hitung relevansi seluruh himpunan dalam satu batch,
+# gabungkan duplikat antar sumber lalu urutkan menurut relevansi. Untuk beberapa
+# kata kunci, tiap kata kunci diperingkat terhadap hasilnya sendiri lalu himpunannya
+# digabung (union) atau diiris (intersect) di memori; skornya disimpan di Scores.
+def merge_references(references, keyword, max_results, scorer=None, combine=UNION):
+    terms = expand_query(keyword)
+    if len(terms) == 1:
+        return _rank(references, keyword, max_results, scorer)
+    scored = []
+    for term in terms:
+        text = search_text(term)
+        group = [ref.copy() for ref in references if text in (ref.get("Scores") or ())]
+        group = filter_references(group, term)
+        with get_metrics().timer("stage_seconds", stage="scoring"):
+            rank_references(group, text, scorer)
+        for ref in group:
+            ref["Scores"] = {term: ref["Relevance"]}
+        scored.extend(group)
+    with get_metrics().timer("stage_seconds", stage="dedup"):
+        unique_refs = deduplicate(scored)
+    if combine == INTERSECT:
+        unique_refs = [ref for ref in unique_refs if len(ref["Scores"]) == len(terms)]
+    aggregate = min if combine == INTERSECT else max
+    for ref in unique_refs:
+        ref["Relevance"] = aggregate(ref["Scores"].values())
+    with get_metrics().timer("stage_seconds", stage="sort"):
+        return sorted(unique_refs, key=lambda x: x["Relevance"], reverse=True)[:max_results]
+
+
+# Top-k merge bertahap: setiap batch dinilai saat tiba dan ~k kelompok terbaik dicatat
+# di min-heap. Setelah heap penuh, sumber yang batas atas skornya tidak bisa melewati
+# skor terendah di heap dihentikan (should_stop) tanpa mengambil halaman sisa. Dedup
+# akhir tetap memakai semua kandidat yang diterima (frekuensi token dan blocking LSH
+# bergantung pada seluruh himpunan), sehingga hasilnya sama dengan merge_references atas
+# batch yang sama. Secara bawaan batasnya MAX_SCORE; approximate=True memakai taksiran
+# dari sumber terurut (menghentikan sumber lebih awal, top-k bisa meleset).
+# Query beberapa kata kunci dan scorer yang bergantung pada seluruh himpunan (BM25)
+# memakai merge_references biasa tanpa penghentian dini.
+class TopKMerge:
+    def __init__(self, keyword, k, scorer=None, combine=UNION, approximate=False):
+        self.keyword = keyword
+        self.k = k
+        self.scorer = scorer
+        self.combine = combine
+        self.approximate = approximate
+        self.text = search_text(keyword)
+        self.incremental = len(expand_query(keyword)) == 1 and get_scorer(scorer).incremental
+        self.capacity = k + math.ceil(k * DUPLICATE_SLACK)
+        # Skor terendah di heap saat penuh; None selama heap belum penuh
+        self.threshold = None
+        self.pruned = 0
+        self._references = []
+        # Kelompok id -> jumlah record; id kelompok = urutan tiba record pertamanya
+        self._groups = {}
+        self._best = {}
+        self._dois = {}
+        # DOI/judul ternormalisasi -> id kelompok, dan sebaliknya untuk eviksi
+        self._aliases = {}
+        self._alias_keys = {}
+        self._heap = []
+        self._bounds = {}
+        self._seq = itertools.count()
+        # Hasil results() terakhir, dipakai ulang selama belum ada batch baru
+        self._results = None
+
+    def add(self, batch):
+        self._results = None
+        if not self.incremental:
+            self._references.extend(batch.results)
+            return
+        references = filter_references(batch.results, self.keyword)
+        if not references:
+            return
+        with get_metrics().timer("stage_seconds", stage="scoring"):
+            rank_references(references, self.text, self.scorer)
+        self._references.extend(references)
+        source = SOURCES.get(batch.source)
+        if self.approximate and source is not None and source.ranked:
+            # Halaman pertama selalu tiba lebih dulu; halaman lain datang tidak berurutan
+            # (as_completed), jadi hanya halaman pertama yang menentukan taksiran batasnya
+            best = max(ref["Relevance"] for ref in references) + SCORE_BOUND_SLACK
+            self._bounds.setdefault(batch.source, min(MAX_SCORE, best))
+        for ref in references:
+            self._push(ref)
+        self._update_threshold()
+
+    # Batas atas skor record yang belum diterima dari sebuah sumber
+    def bound(self, source):
+        return self._bounds.get(source, MAX_SCORE)
+
+    def should_stop(self, source, keyword=None):
+        if not self.incremental or self.threshold is None:
+            return False
+        stop = self.bound(source) <= self.threshold
+        if stop:
+            get_metrics().incr("topk_stopped_total", source=source)
+        return stop
+
+    # Kunci kelompok seperti deduplicate: DOI dan judul ternormalisasi sama-sama menunjuk
+    # ke kelompok, sehingga record dengan dan tanpa DOI untuk makalah yang sama berbagi
+    # satu slot heap. Judul tidak menggabungkan dua DOI yang berbeda
+    def _keys(self, ref):
+        title = normalize_title(ref.get("Title"))
+        return extract_doi(ref), (title if title and title != "unknown" else None)
+
+    def _find(self, doi, title):
+        by_doi = self._aliases.get(doi) if doi else None
+        by_title = self._aliases.get(title) if title else None
+        if by_title is not None and doi and self._dois[by_title] not in (None, doi):
+            by_title = None
+        if by_doi is None or by_title is None or by_doi == by_title:
+            return by_doi if by_doi is not None else by_title
+        return self._union(by_doi, by_title)
+
+    def _alias(self, gid, *keys):
+        for key in keys:
+            if key and key not in self._aliases:
+                self._aliases[key] = gid
+                self._alias_keys[gid].append(key)
+
+    # Dua kelompok yang ternyata makalah yang sama: digabung ke kelompok yang lebih dulu tiba
+    def _union(self, a, b):
+        gid, other = min(a, b), max(a, b)
+        self._groups[gid] += self._groups.pop(other)
+        self._dois[gid] = self._dois[gid] or self._dois.pop(other)
+        for key in self._alias_keys.pop(other):
+            self._aliases[key] = gid
+            self._alias_keys[gid].append(key)
+        self._best[gid] = max(self._best[gid], self._best.pop(other))
+        heapq.heappush(self._heap, (self._best[gid], -gid, gid))
+        return gid
+
+    def _push(self, ref):
+        score = ref["Relevance"]
+        seq = next(self._seq)
+        doi, title = self._keys(ref)
+        gid = self._find(doi, title)
+        if gid is not None:
+            self._groups[gid] += 1
+            self._dois[gid] = self._dois[gid] or doi
+            self._alias(gid, doi, title)
+            if score > self._best[gid]:
+                self._best[gid] = score
+                heapq.heappush(self._heap, (score, -gid, gid))
+            return
+        # Skor sama dengan yang terendah: merge_references mempertahankan yang lebih dulu tiba.
+        # Record ini tidak bisa masuk top-k, tetapi tetap ikut dedup akhir
+        if self.threshold is not None and score <= self.threshold:
+            self.pruned += 1
+            get_metrics().incr("topk_pruned_total")
+            return
+        gid = seq
+        self._groups[gid] = 1
+        self._best[gid] = score
+        self._dois[gid] = doi
+        self._alias_keys[gid] = []
+        self._alias(gid, doi, title)
+        # Heap diurutkan (skor, -urutan tiba): di antara skor yang sama, yang terakhir tiba
+        # dibuang lebih dulu, sama seperti urutan stabil merge_references
+        heapq.heappush(self._heap, (score, -gid, gid))
+        while len(self._groups) > self.capacity:
+            self._evict(self._pop_lowest()[2])
+
+    def _evict(self, gid):
+        del self._groups[gid], self._best[gid], self._dois[gid]
+        for key in self._alias_keys.pop(gid):
+            del self._aliases[key]
+        self.pruned += 1
+
+    # Entri heap yang skornya sudah diperbarui (kelompok yang sama masuk lagi) dilewati
+    def _clean_top(self):
+        while self._heap:
+            score, _, gid = self._heap[0]
+            if gid in self._groups and self._best[gid] == score:
+                return
+            heapq.heappop(self._heap)
+
+    def _pop_lowest(self):
+        self._clean_top()
+        return heapq.heappop(self._heap)
+
+    def _update_threshold(self):
+        if len(self._groups) < self.capacity:
+            self.threshold = None
+            return
+        self._clean_top()
+        self.threshold = self._heap[0][0]
+
+    def __len__(self):
+        return len(self._references)
+
+    # Hasil akhir: semua kandidat digabung (duplikat fuzzy, sumber) lalu diurutkan
+    def results(self):
+        if self._results is None:
+            self._results = self._merge()
+        return list(self._results)
+
+    def _merge(self):
+        if not self.incremental:
+            return merge_references(self._references, self.keyword, self.k, self.scorer,
+                                    self.combine)
+        with get_metrics().timer("stage_seconds", stage="dedup"):
+            unique_refs = deduplicate(self._references)
+        with get_metrics().timer("stage_seconds", stage="sort"):
+            return sorted(unique_refs, key=lambda x: x["Relevance"], reverse=True)[:self.k]
+
+
+# Fungsi pencarian paralel
+def parallel_search(keyword, max_results, sd_key=None, ieee_key=None, on_error=None, scorer=None,
+                    sources=None, combine=UNION, approximate=False):
+    api_keys = {"ScienceDirect": sd_key, "IEEE Xplore": ieee_key}
+    merger = TopKMerge(keyword, max_results, scorer, combine, approximate)
+    for batch in iter_search(keyword, max_results, api_keys, sources=sources,
+                             should_stop=merger.should_stop):
+        if batch.error is not None:
+            if on_error is not None:
+                on_error(batch.source, batch.error)
+            continue
+        merger.add(batch)
+    return merger.results()
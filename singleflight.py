@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from metrics import get_metrics
+
+# Thread untuk panggilan upstream bersama dari pemanggil sinkron
+FLIGHT_WORKERS = 32
+
+_coordinator = None
+_executor = None
+_lock = threading.Lock()
+
+
+class _Flight:
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 0
+        self.task = None
+        self.loop = None
+
+
+def _retrieve(future):
+    # Menghindari peringatan "exception was never retrieved" jika semua pemanggil sudah pergi
+    if not future.cancelled():
+        future.exception()
+
+
+# Single-flight: pemanggil dengan kunci (sumber, query kanonik, halaman) yang sama
+# saat permintaan masih berjalan menunggu hasil yang sama, bukan memanggil upstream lagi.
+# Tiap pemanggil punya timeout/pembatalan sendiri; panggilan upstream baru dibatalkan
+# jika semua pemanggilnya sudah pergi.
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            flight.waiters += 1
+        get_metrics().incr("singleflight_calls_total", source=key[0],
+                           role="leader" if leader else "follower")
+        return flight, leader
+
+    def _finish(self, key, flight, done):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if done.cancelled():
+            flight.future.cancel()
+        elif done.exception() is not None:
+            flight.future.set_exception(done.exception())
+        else:
+            flight.future.set_result(done.result())
+
+    def _leave(self, flight):
+        with self._lock:
+            flight.waiters -= 1
+            abandoned = flight.waiters == 0 and not flight.future.done()
+        if abandoned and flight.task is not None:
+            if flight.loop is not None:
+                flight.loop.call_soon_threadsafe(flight.task.cancel)
+            else:
+                flight.task.cancel()
+
+    def call(self, key, fn, *args, timeout=None):
+        flight, leader = self._join(key)
+        if leader:
+            flight.task = get_flight_executor().submit(fn, *args)
+            flight.task.add_done_callback(lambda done: self._finish(key, flight, done))
+        try:
+            return flight.future.result(timeout)
+        finally:
+            self._leave(flight)
+
+    async def acall(self, key, coro_fn, *args, timeout=None):
+        flight, leader = self._join(key)
+        if leader:
+            flight.loop = asyncio.get_running_loop()
+            flight.task = asyncio.ensure_future(coro_fn(*args))
+            flight.task.add_done_callback(lambda done: self._finish(key, flight, done))
+        shared = asyncio.wrap_future(flight.future)
+        shared.add_done_callback(_retrieve)
+        try:
+            # shield: pembatalan satu pemanggil tidak membatalkan hasil bersama
+            return await asyncio.wait_for(asyncio.shield(shared), timeout)
+        finally:
+            self._leave(flight)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+
+def get_flight_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=FLIGHT_WORKERS, thread_name_prefix="flight")
+    return _executor
+
+
+def get_single_flight():
+    global _coordinator
+    if _coordinator is None:
+        with _lock:
+            if _coordinator is None:
+                _coordinator = SingleFlight()
+    return _coordinator
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from api import iterate_events
+from records import Reference
+from resilience import CircuitBreaker
+from result_store import new_shared_store
+from sources import SOURCES, SourceBatch
+
+
+def _events(release, closed):
+    try:
+        yield "first"
+        release.wait(5)
+        yield "second"
+    finally:
+        closed.set()
+
+
+def test_disconnect_closes_generator_after_pending_next():
+    release, closed = threading.Event(), threading.Event()
+
+    async def consume():
+        stream = iterate_events(_events(release, closed))
+        assert await stream.__anext__() == "first"
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        # Klien memutus koneksi saat next() masih menunggu sumber
+        pending.cancel()
+        try:
+            await pending
+        except asyncio.CancelledError:
+            pass
+        await stream.aclose()
+        # Pembatalan tidak menunggu next(); generator baru ditutup setelah next() kembali
+        assert not closed.is_set()
+        release.set()
+        return await asyncio.get_running_loop().run_in_executor(None, closed.wait, 5)
+
+    assert asyncio.run(asyncio.wait_for(consume(), 2))
+
+
+def test_exhausted_generator_is_closed():
+    release, closed = threading.Event(), threading.Event()
+    release.set()
+
+    async def consume():
+        return [item async for item in iterate_events(_events(release, closed))]
+
+    assert asyncio.run(consume()) == ["first", "second"]
+    assert closed.wait(5)
+
+
+def _fake_search(calls):
+    def iter_search(keyword, max_results, api_keys, sources=None, should_stop=None):
+        calls.append((keyword, max_results, tuple(sources), api_keys["IEEE Xplore"]))
+        yield SourceBatch("CrossRef", [Reference(Title="Deep learning for images", Source="CrossRef"),
+                                       Reference(Title="Deep learning", Source="CrossRef")],
+                          None, 0.1, True, keyword)
+        yield SourceBatch("IEEE Xplore", [], "melebihi batas waktu 5.0 detik", 5.0, True, keyword,
+                          True)
+    return iter_search
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+    monkeypatch.setattr(api, "iter_search", _fake_search(calls))
+    monkeypatch.setattr(api, "_results", new_shared_store())
+    client = TestClient(api.app)
+    client.calls = calls
+    return client
+
+
+def test_search_returns_ranked_results_and_incomplete_sources(client):
+    response = client.get("/search", params={"q": "deep learning", "max_results": 5,
+                                             "sources": "CrossRef,IEEE Xplore"},
+                          headers={"X-IEEE-Key": "secret"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [ref["Title"] for ref in data["results"]] == ["Deep learning", "Deep learning for images"]
+    assert data["errors"] == {"IEEE Xplore": "melebihi batas waktu 5.0 detik"}
+    assert data["incomplete"] == ["IEEE Xplore"]
+    assert not data["cached"]
+    assert client.calls == [("deep learning", 5, ("CrossRef", "IEEE Xplore"), "secret")]
+
+
+def test_complete_search_is_served_from_result_store(client, monkeypatch):
+    def complete(keyword, max_results, api_keys, sources=None, should_stop=None):
+        client.calls.append(keyword)
+        yield SourceBatch("CrossRef", [Reference(Title="Deep learning", Source="CrossRef")],
+                          None, 0.1, True, keyword)
+
+    monkeypatch.setattr(api, "iter_search", complete)
+    first = client.get("/search", params={"q": "deep learning"}).json()
+    second = client.get("/search", params={"q": "Deep  Learning"}).json()
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["results"] == first["results"]
+    assert client.calls == ["deep learning"]
+
+
+def test_invalid_parameters_are_rejected(client):
+    for params in ({}, {"q": "x", "max_results": "abc"}, {"q": "x", "max_results": 0},
+                   {"q": "x", "scorer": "nope"}, {"q": "x", "sources": "CrossRef,Nope"},
+                   {"q": "x", "combine": "xor"}, {"q": "x", "approximate": "maybe"}):
+        response = client.get("/search", params=params)
+        assert response.status_code == 400 and "error" in response.json()
+    assert client.calls == []
+
+
+def test_approximate_topk_is_opt_in(client, monkeypatch):
+    modes = []
+
+    class Merger(api.TopKMerge):
+        def __init__(self, *args):
+            super().__init__(*args)
+            modes.append(self.approximate)
+
+    monkeypatch.setattr(api, "TopKMerge", Merger)
+    assert not client.get("/search", params={"q": "deep learning"}).json()["approximate"]
+    assert client.get("/search", params={"q": "deep learning", "approximate": "true"}) \
+        .json()["approximate"]
+    client.get("/search/stream", params={"q": "deep learning", "approximate": "1"})
+    assert modes == [False, True, True]
+
+
+def test_stream_emits_batches_then_done(client):
+    response = client.get("/search/stream", params={"q": "deep learning"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["batch", "error", "done"]
+    assert events[1]["partial"]
+    assert [ref["Title"] for ref in events[-1]["results"]] == \
+        ["Deep learning", "Deep learning for images"]
+
+    response = client.get("/search/stream", params={"q": "deep learning", "format": "sse"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [line for line in response.text.splitlines() if line.startswith("event:")] == \
+        ["event: batch", "event: error", "event: done"]
+
+
+def test_health_reports_breaker_state(client, monkeypatch):
+    for name in SOURCES:
+        monkeypatch.setattr(SOURCES[name], "breaker", CircuitBreaker())
+    data = client.get("/health").json()
+    assert data["status"] == "ok"
+    assert set(data["sources"]) == set(SOURCES)
+
+    breaker = SOURCES["CrossRef"].breaker
+    monkeypatch.setattr(type(breaker), "state", property(lambda self: "open"))
+    data = client.get("/health").json()
+    assert data["status"] == "down"
+    assert data["sources"]["CrossRef"]["breaker"] == "open"
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import batch
+from batch import Checkpoint, JsonLinesWriter, ParquetWriter, read_keywords, run_batch
+from records import Reference
+
+
+class _Interrupted(BaseException):
+    pass
+
+
+# parallel_search palsu: mencatat kata kunci yang dijalankan; fail/interrupt memicu kegagalan
+def _fake_search(calls, fail=(), interrupt=()):
+    def search(keyword, max_results, sd_key=None, ieee_key=None, on_error=None, scorer=None,
+               sources=None, combine=None, approximate=False):
+        calls.append(keyword)
+        if keyword in interrupt:
+            raise _Interrupted()
+        if keyword in fail:
+            raise RuntimeError("upstream")
+        return [Reference(Title=f"{keyword} paper", Source="CrossRef", DOI=f"10.1000/{keyword}")]
+    return search
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _run(tmp_path, keywords, **kwargs):
+    writer = JsonLinesWriter(str(tmp_path / "out.jsonl"))
+    try:
+        return run_batch(keywords, writer, Checkpoint(str(tmp_path / "out.checkpoint")), 5,
+                         concurrency=1, log=lambda message: None, **kwargs)
+    finally:
+        writer.close()
+
+
+def test_read_keywords_drops_canonical_duplicates(tmp_path):
+    path = tmp_path / "keywords.txt"
+    path.write_text("# komentar\nDeep Learning\n\ndeep  learning\nhepatitis A\nhepatitis\n",
+                    encoding="utf-8")
+    assert read_keywords(str(path)) == ["Deep Learning", "hepatitis A", "hepatitis"]
+    jsonl = tmp_path / "keywords.jsonl"
+    jsonl.write_text('{"keyword": "graph"}\n{"keyword": "Graph "}\n', encoding="utf-8")
+    assert read_keywords(str(jsonl)) == ["graph"]
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path, monkeypatch):
+    keywords = ["a", "b", "c", "d"]
+    calls = []
+    monkeypatch.setattr(batch, "parallel_search", _fake_search(calls, interrupt={"c"}))
+    with pytest.raises(_Interrupted):
+        _run(tmp_path, keywords)
+    assert Checkpoint(str(tmp_path / "out.checkpoint")).done == {"a", "b"}
+
+    calls.clear()
+    monkeypatch.setattr(batch, "parallel_search", _fake_search(calls))
+    assert _run(tmp_path, keywords) == []
+    assert calls == ["c", "d"]
+    rows = _lines(tmp_path / "out.jsonl")
+    assert [row["Keyword"] for row in rows] == keywords
+    assert rows[0]["DOI"] == "10.1000/a"
+
+
+def test_failed_keywords_are_retried_on_restart(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(batch, "parallel_search", _fake_search(calls, fail={"b"}))
+    assert _run(tmp_path, ["a", "b", "c"]) == ["b"]
+    assert Checkpoint(str(tmp_path / "out.checkpoint")).done == {"a", "c"}
+
+    calls.clear()
+    monkeypatch.setattr(batch, "parallel_search", _fake_search(calls))
+    assert _run(tmp_path, ["a", "b", "c"]) == []
+    assert calls == ["b"]
+    assert sorted(row["Keyword"] for row in _lines(tmp_path / "out.jsonl")) == ["a", "b", "c"]
+
+
+def test_parquet_checkpoints_only_flushed_keywords(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    calls = []
+    monkeypatch.setattr(batch, "parallel_search", _fake_search(calls, interrupt={"c"}))
+    output = str(tmp_path / "out_parquet")
+    checkpoint_path = str(tmp_path / "out.checkpoint")
+    with pytest.raises(_Interrupted):
+        run_batch(["a", "b", "c"], ParquetWriter(output, flush_every=2),
+                  Checkpoint(checkpoint_path), 5, concurrency=1, log=lambda message: None)
+    # a dan b sudah ditulis sebagai satu part; c belum
+    assert Checkpoint(checkpoint_path).done == {"a", "b"}
+
+    monkeypatch.setattr(batch, "parallel_search", _fake_search(calls))
+    run_batch(["a", "b", "c"], ParquetWriter(output, flush_every=2), Checkpoint(checkpoint_path),
+              5, concurrency=1, log=lambda message: None)
+    rows = pq.read_table(output).to_pylist()
+    assert sorted(row["Keyword"] for row in rows) == ["a", "b", "c"]
@@ -0,0 +1,88 @@
+import time
+
+from cache import SOURCE_TTL, ResultCache
+from records import Reference
+from sources import SOURCES
+
+
+def _refs(*titles):
+    return [Reference(Title=title, Source="CrossRef") for title in titles]
+
+
+def test_memory_and_disk_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path)
+    cache.set("CrossRef", "deep learning", 20, _refs("A", "B"))
+    assert cache.get("CrossRef", "Deep  Learning", 20) == _refs("A", "B")
+    assert cache.stats["memory_hits"] == 1
+
+    # Proses lain (cache baru pada file yang sama) membaca dari SQLite
+    other = ResultCache(path)
+    assert other.get("CrossRef", "deep learning", 20) == _refs("A", "B")
+    assert other.stats == {"memory_hits": 0, "disk_hits": 1, "misses": 0}
+
+
+def test_key_includes_source_and_size(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    cache.set("CrossRef", "deep learning", 20, _refs("A"))
+    assert cache.get("Semantic Scholar", "deep learning", 20) is None
+    assert cache.get("CrossRef", "deep learning", 50) is None
+    assert cache.hit_rate() == 0.0
+
+
+def test_key_includes_api_key_credential(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    source = SOURCES["ScienceDirect"]
+    cache.set("ScienceDirect", "deep learning", 20, _refs("A"), source.credential("key-1"))
+    assert cache.get("ScienceDirect", "deep learning", 20, source.credential("key-1")) == _refs("A")
+    assert cache.get("ScienceDirect", "deep learning", 20, source.credential("key-2")) is None
+    assert cache.get("ScienceDirect", "deep learning", 20) is None
+    # Key sendiri tidak pernah masuk ke SQLite
+    assert not cache._db.execute("SELECT 1 FROM results WHERE key LIKE '%key-1%'").fetchone()
+    # Sumber tanpa API key tetap berbagi satu entri untuk semua pemanggil
+    assert SOURCES["CrossRef"].credential("key-1") is None
+
+
+def test_entries_expire_after_source_ttl(tmp_path, monkeypatch):
+    monkeypatch.setitem(SOURCE_TTL, "CrossRef", 0.05)
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path)
+    cache.set("CrossRef", "deep learning", 20, _refs("A"))
+    cache.set("IEEE Xplore", "deep learning", 20, _refs("B"))
+    time.sleep(0.06)
+    assert cache.get("CrossRef", "deep learning", 20) is None
+    assert ResultCache(path).get("CrossRef", "deep learning", 20) is None
+    assert cache.get("IEEE Xplore", "deep learning", 20) == _refs("B")
+
+
+def test_memory_lru_falls_back_to_disk(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), memory_size=2)
+    cache.set("CrossRef", "a", 20, _refs("A"))
+    cache.set("CrossRef", "b", 20, _refs("B"))
+    assert cache.get("CrossRef", "a", 20) == _refs("A")
+    cache.set("CrossRef", "c", 20, _refs("C"))
+    # "b" paling lama tidak dipakai: keluar dari memori, masih ada di disk
+    assert cache.get("CrossRef", "b", 20) == _refs("B")
+    assert cache.stats["disk_hits"] == 1
+    assert cache.get("CrossRef", "c", 20) == _refs("C")
+    assert cache.stats["memory_hits"] == 2
+
+
+def test_disk_keeps_most_recently_used(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path, disk_size=2)
+    for keyword in ("a", "b", "c"):
+        cache.set("CrossRef", keyword, 20, _refs(keyword))
+    other = ResultCache(path)
+    assert other.get("CrossRef", "a", 20) is None
+    assert other.get("CrossRef", "b", 20) == _refs("b")
+    assert other.get("CrossRef", "c", 20) == _refs("c")
+
+
+def test_clear(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path)
+    cache.set("CrossRef", "a", 20, _refs("A"))
+    cache.clear()
+    assert cache.get("CrossRef", "a", 20) is None
+    assert ResultCache(path).get("CrossRef", "a", 20) is None
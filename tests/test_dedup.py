@@ -0,0 +1,90 @@
+from dedup import deduplicate, extract_doi, normalize_title
+from records import Reference
+
+
+def test_extract_doi_from_link():
+    ref = Reference(Link="https://doi.org/10.1000/ABC.123.")
+    assert extract_doi(ref) == "10.1000/abc.123"
+    assert extract_doi(Reference()) is None
+
+
+def test_normalize_title():
+    assert normalize_title("Déjà  Vu: A Study!") == "deja vu a study"
+
+
+def test_same_doi_is_merged():
+    refs = [
+        Reference(Title="A study of things", DOI="10.1000/a1", Source="A", Relevance=50),
+        Reference(Title="Completely different title", DOI="10.1000/A1", Source="B",
+                  Journal="Nature", Relevance=10),
+    ]
+    result = deduplicate(refs)
+    assert len(result) == 1
+    assert result[0]["Title"] == "A study of things"
+    assert result[0]["Journal"] == "Nature"
+    assert result[0]["Source"] == "A, B"
+
+
+def test_same_title_is_merged():
+    refs = [
+        Reference(Title="Attention Is All You Need", Source="A"),
+        Reference(Title="attention is all you need.", Source="B"),
+    ]
+    assert len(deduplicate(refs)) == 1
+
+
+def test_fuzzy_title_is_merged():
+    refs = [
+        Reference(Title="Learning representations by back-propagating errors", Source="A"),
+        Reference(Title="Learning representations by back-propagating error", Source="B"),
+        Reference(Title="A survey of reinforcement learning", Source="C"),
+    ]
+    assert len(deduplicate(refs)) == 2
+
+
+def test_different_dois_are_not_merged():
+    refs = [
+        Reference(Title="Editorial", DOI="10.1000/a1", Source="A"),
+        Reference(Title="Editorial", DOI="10.1000/b2", Source="B"),
+    ]
+    assert sorted(ref["DOI"] for ref in deduplicate(refs)) == ["10.1000/a1", "10.1000/b2"]
+
+
+def test_title_without_doi_does_not_bridge_different_dois():
+    refs = [
+        Reference(Title="Editorial", DOI="10.1000/a1", Source="A"),
+        Reference(Title="Editorial", Source="B"),
+        Reference(Title="Editorial", DOI="10.1000/b2", Source="C"),
+    ]
+    result = deduplicate(refs)
+    assert len(result) == 2
+    assert sorted(ref["DOI"] for ref in result) == ["10.1000/a1", "10.1000/b2"]
+
+
+def test_unknown_titles_are_kept():
+    refs = [Reference(Source="A"), Reference(Source="B")]
+    assert len(deduplicate(refs)) == 2
+
+
+def test_scores_keep_highest_per_keyword():
+    refs = [
+        Reference(Title="Graph transformer", Source="A", Scores={"graph": 40}),
+        Reference(Title="Graph transformer", Source="B", Scores={"graph": 60, "transformer": 30}),
+    ]
+    assert deduplicate(refs)[0]["Scores"] == {"graph": 60, "transformer": 30}
+
+
+def test_short_query_heavy_titles_are_merged():
+    # Kata kunci ("deep learning") ada di semua judul dan dibuang saat blocking; sisa
+    # judulnya terlalu pendek untuk MinHash token
+    pairs = [("Deep learning for speech", "Deep learning for speeches"),
+             ("Deep learning for images", "Deep learning for image"),
+             ("Deep learning in vision", "Deep learning in visions")]
+    refs = [Reference(Title=title, Source=source) for pair in pairs
+            for title, source in zip(pair, ("A", "B"))]
+    refs += [Reference(Title=title, Source="C")
+             for title in ("Deep learning survey", "Deep learning theory", "Deep learning with graphs")]
+    result = deduplicate(refs)
+    assert len(result) == 6
+    assert sorted(ref["Title"] for ref in result if ref["Source"] == "A, B") == \
+        sorted(pair[0] for pair in pairs)
@@ -0,0 +1,102 @@
+import pytest
+
+import enrich
+from enrich import EnrichmentCache, Enricher, apply_fields, needs_enrichment
+from records import Reference
+
+S2_ID = "a" * 40
+
+
+class _Response:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+
+# Semantic Scholar menjawab id S2 saja; CrossRef menjawab filter DOI dan pencarian judul
+def _fake_http(calls):
+    def post(url, json=None, params=None):
+        calls.append(("s2", tuple(json["ids"])))
+        return _Response([{"year": 2020, "venue": "NeurIPS", "authors": [{"name": "Ada Lovelace"}],
+                           "externalIds": {"DOI": "10.1000/s2"}} if paper_id == S2_ID else None
+                          for paper_id in json["ids"]])
+
+    def get(url, params=None):
+        if "filter" in params:
+            calls.append(("crossref_doi", params["filter"]))
+            return _Response({"message": {"items": [
+                {"DOI": "10.1000/X", "container-title": ["Nature"],
+                 "issued": {"date-parts": [[2019]]},
+                 "author": [{"given": "Lovelace,", "family": "Ada"}]}]}})
+        calls.append(("crossref_title", params["query.bibliographic"]))
+        return _Response({"message": {"items": [
+            {"DOI": "10.1000/t", "title": ["Graph neural networks"], "container-title": ["ICML"],
+             "issued": {"date-parts": [[2018]]}}]}})
+
+    return post, get
+
+
+def _refs():
+    return [Reference(Title="S2 paper", Authors="A B", Journal="J",
+                      Link=f"https://www.semanticscholar.org/paper/{S2_ID}"),
+            Reference(Title="DOI paper", Authors="A B", DOI="10.1000/x", Year=2019),
+            Reference(Title="Graph neural networks", Authors="A B", Journal="Venue…",
+                      Source="Google Scholar")]
+
+
+@pytest.fixture
+def enricher(tmp_path, monkeypatch):
+    calls = []
+    post, get = _fake_http(calls)
+    monkeypatch.setattr(enrich, "http_post", post)
+    monkeypatch.setattr(enrich, "http_get", get)
+    monkeypatch.setattr(Enricher, "_acquire", lambda self, name: None)
+    enricher = Enricher(EnrichmentCache(str(tmp_path / "cache.sqlite")), workers=1)
+    enricher.calls = calls
+    return enricher
+
+
+def test_apply_fields_fills_only_missing_or_truncated():
+    ref = Reference(Title="x", Authors="Ada Lovelace", Journal="Proceedings of the…", Year=2020)
+    assert needs_enrichment(ref)
+    assert apply_fields(ref, {"Journal": "Proceedings of the IEEE", "Year": 1999,
+                              "Authors": "Other", "DOI": "10.1000/p"})
+    assert (ref["Journal"], ref["Year"], ref["Authors"], ref["DOI"]) == \
+        ("Proceedings of the IEEE", 2020, "Ada Lovelace", "10.1000/p")
+    assert not needs_enrichment(ref)
+    assert not apply_fields(ref, {"Journal": "Other"})
+
+
+def test_batched_stages_fill_missing_fields(enricher):
+    refs = _refs()
+    updates = []
+    assert enricher.enrich(refs, updates.append) == 3
+    assert [(ref["DOI"], ref["Year"], ref["Journal"]) for ref in refs] == [
+        ("10.1000/s2", 2020, "J"), ("10.1000/x", 2019, "Nature"), ("10.1000/t", 2018, "ICML")]
+    # Satu panggilan batch per layanan, satu pencarian judul untuk record tanpa DOI
+    assert [call[0] for call in enricher.calls] == ["s2", "crossref_doi", "crossref_title"]
+    assert enricher.calls[0][1] == (S2_ID, "DOI:10.1000/x")
+    assert len(updates) == 3
+
+
+def test_second_run_is_answered_from_cache(enricher):
+    enricher.enrich(_refs())
+    enricher.calls.clear()
+    refs = _refs()
+    assert enricher.enrich(refs) == 3
+    assert enricher.calls == []
+    assert refs[2]["DOI"] == "10.1000/t"
+
+
+def test_failed_stage_does_not_stop_later_stages(enricher, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(enrich, "http_post", broken)
+    refs = _refs()
+    assert enricher.enrich(refs) == 2
+    assert refs[0]["DOI"] is None
+    assert refs[1]["Journal"] == "Nature"
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+
+import pytest
+
+from export import EXPORTERS, FIELDS
+from records import Reference, split_authors
+
+REFS = [Reference(Title="Graph transformers", Authors="Lovelace, Ada", Journal="Nature",
+                  Year=2021, Link="https://doi.org/10.1000/GT", Source="ScienceDirect",
+                  Relevance=90, Scores={"graph": 90, "transformer": 70}),
+        Reference(Title="Neural nets", Authors="Ada Lovelace; Alan Turing", Source="CrossRef",
+                  DOI="10.1000/nn", Relevance=80)]
+
+
+def _text(name, results=REFS):
+    return "".join(EXPORTERS[name].iter_chunks(results))
+
+
+def test_split_authors():
+    assert split_authors("Lovelace, Ada") == ["Lovelace, Ada"]
+    assert split_authors("Ada Lovelace; Alan Turing") == ["Ada Lovelace", "Alan Turing"]
+    assert split_authors(["Ada Lovelace", " "]) == ["Ada Lovelace"]
+    # Hasil lama yang digabung dengan ", "
+    assert split_authors("Ada Lovelace, Alan Turing") == ["Ada Lovelace", "Alan Turing"]
+    assert split_authors("Unknown") == []
+
+
+def test_csv_keeps_doi_and_scores():
+    rows = list(csv.DictReader(io.StringIO(_text("CSV"))))
+    assert tuple(rows[0]) == FIELDS
+    assert [row["DOI"] for row in rows] == ["10.1000/gt", "10.1000/nn"]
+    assert json.loads(rows[0]["Scores"]) == {"graph": 90, "transformer": 70}
+    assert rows[1]["Scores"] == ""
+
+
+def test_json_and_jsonl_match():
+    records = json.loads(_text("JSON"))
+    assert records == [json.loads(line) for line in _text("JSONL").splitlines()]
+    assert records[0]["DOI"] == "10.1000/gt"
+    assert records[0]["Scores"] == {"graph": 90, "transformer": 70}
+
+
+def test_bibtex_and_ris_authors():
+    bibtex = _text("BibTeX")
+    assert "author = {Lovelace, Ada}" in bibtex
+    assert "author = {Ada Lovelace and Alan Turing}" in bibtex
+    assert "@article{lovelace2021graph," in bibtex
+    ris = _text("RIS")
+    assert ris.count("AU  - ") == 3
+    assert "DO  - 10.1000/nn" in ris
+
+
+def test_parquet_round_trip(tmp_path):
+    if "Parquet" not in EXPORTERS:
+        pytest.skip("pyarrow tidak terpasang")
+    import pyarrow.parquet as pq
+
+    path = str(tmp_path / "out.parquet")
+    EXPORTERS["Parquet"].write(REFS, path)
+    table = pq.read_table(path).to_pylist()
+    assert [row["DOI"] for row in table] == ["10.1000/gt", "10.1000/nn"]
+    assert table[0]["Year"] == 2021 and table[1]["Year"] is None
+
+
+SPECIAL = [Reference(Title="50% faster R&D: C# and snake_case \\ {sets}\n  on $x^2$ ~ 1",
+                     Authors="O'Neil, Ann", Journal="Proc.\nIEEE", Year=2020,
+                     Link="https://example.org/a_b?q=1%202#top", Source="CrossRef")]
+
+
+def test_bibtex_escapes_latex_special_characters():
+    bibtex = _text("BibTeX", SPECIAL)
+    assert (r"title = {50\% faster R\&D: C\# and snake\_case \textbackslash{} \{sets\} "
+            r"on \$x\textasciicircum{}2\$ \textasciitilde{} 1}") in bibtex
+    assert "journal = {Proc. IEEE}" in bibtex
+    # url dibaca verbatim oleh BibTeX/biblatex: tidak di-escape
+    assert "url = {https://example.org/a_b?q=1%202#top}" in bibtex
+
+
+def test_ris_values_stay_on_one_line():
+    lines = _text("RIS", SPECIAL).splitlines()
+    assert "TI  - 50% faster R&D: C# and snake_case \\ {sets} on $x^2$ ~ 1" in lines
+    assert "JO  - Proc. IEEE" in lines
+    assert all(line == "" or line[2:6] == "  - " for line in lines)
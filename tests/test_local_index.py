@@ -0,0 +1,52 @@
+import sqlite3
+
+from dedup import deduplicate
+from local_index import LocalIndex
+from records import Reference
+
+
+def test_doi_round_trip(tmp_path):
+    index = LocalIndex(str(tmp_path / "index.sqlite"))
+    index.add([Reference(Title="Graph neural networks", DOI="10.1000/GNN", Source="CrossRef"),
+               Reference(Title="Graph kernels", Link="https://doi.org/10.1000/gk", Source="A")])
+    results = {ref["Title"]: ref for ref in index.search("graph", 10)}
+    assert results["Graph neural networks"]["DOI"] == "10.1000/gnn"
+    assert results["Graph kernels"]["DOI"] == "10.1000/gk"
+    assert results["Graph neural networks"]["Source"] == "CrossRef"
+    # Hasil lokal bergabung lewat DOI dengan hasil sumber yang judulnya berbeda
+    remote = Reference(Title="GNNs", DOI="10.1000/gnn", Source="Semantic Scholar")
+    assert len(deduplicate(list(results.values()) + [remote])) == 2
+    assert [ref["Title"] for ref in index.search("10.1000/gk", 10)] == ["Graph kernels"]
+
+
+def test_old_index_is_migrated(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    db = sqlite3.connect(path)
+    db.executescript(
+        "CREATE TABLE refs (id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, title TEXT, "
+        "authors TEXT, journal TEXT, year TEXT, link TEXT, source TEXT, added REAL NOT NULL);"
+        "CREATE VIRTUAL TABLE refs_fts USING fts5(title, authors, journal, content='refs', "
+        "content_rowid='id');"
+        "INSERT INTO refs VALUES (1, '10.1000/old', 'Old graph paper', 'N/A', 'N/A', '2019', "
+        "'https://doi.org/10.1000/old', 'CrossRef', 0);"
+    )
+    db.commit()
+    db.close()
+    results = LocalIndex(path).search("graph", 10)
+    assert [(ref["Title"], ref["DOI"], ref["Year"]) for ref in results] == \
+        [("Old graph paper", "10.1000/old", 2019)]
+
+
+def test_local_source_keeps_origin_and_hides_keyed_sources(tmp_path, monkeypatch):
+    import local_index
+    from sources import SOURCES, default_sources
+
+    index = LocalIndex(str(tmp_path / "index.sqlite"))
+    index.add([Reference(Title="Graph neural networks", Source="CrossRef"),
+               Reference(Title="Graph paywalled study", Source="ScienceDirect"),
+               Reference(Title="Graph from a snapshot")])
+    monkeypatch.setattr(local_index, "_index", index)
+    results = SOURCES["Local"].search("graph", 10)
+    assert sorted((ref["Title"], ref["Source"]) for ref in results) == \
+        [("Graph from a snapshot", "Local"), ("Graph neural networks", "CrossRef")]
+    assert "Local" not in default_sources()
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from metrics import Metrics, percentile
+
+
+def _metrics():
+    metrics = Metrics(window_size=4)
+    for seconds in (0.1, 0.2, 0.3, 0.4, 0.5):
+        metrics.observe("source_latency_seconds", seconds, source="CrossRef")
+    metrics.incr("cache_lookups_total", source="CrossRef", result="hit")
+    metrics.incr("cache_lookups_total", 2, source="CrossRef", result="hit")
+    metrics.incr("topk_pruned_total")
+    return metrics
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3, 1, 2, 4], 0.5) == 2
+    assert percentile([3, 1, 2, 4], 0.95) == 4
+
+
+def test_timings_use_window_but_totals_use_everything():
+    [row] = _metrics().timings()
+    assert row["metric"] == "source_latency_seconds" and row["source"] == "CrossRef"
+    # Persentil dari 4 observasi terakhir; count/sum dari semua observasi
+    assert row["p50"] == 0.3 and row["p99"] == 0.5
+    assert row["count"] == 5 and row["sum"] == pytest.approx(1.5)
+
+
+def test_counters():
+    assert _metrics().counters() == [
+        {"metric": "cache_lookups_total", "result": "hit", "source": "CrossRef", "value": 3},
+        {"metric": "topk_pruned_total", "value": 1},
+    ]
+
+
+def test_prometheus_text_format():
+    lines = _metrics().to_prometheus().splitlines()
+    assert "# TYPE search_source_latency_seconds summary" in lines
+    assert 'search_source_latency_seconds{source="CrossRef",quantile="0.5"} 0.300000' in lines
+    assert 'search_source_latency_seconds_sum{source="CrossRef"} 1.500000' in lines
+    assert 'search_source_latency_seconds_count{source="CrossRef"} 5' in lines
+    assert "# TYPE search_cache_lookups_total counter" in lines
+    assert 'search_cache_lookups_total{result="hit",source="CrossRef"} 3' in lines
+    assert "search_topk_pruned_total 1" in lines
+
+
+def test_dump_jsonl_appends_snapshots(tmp_path):
+    metrics = _metrics()
+    path = str(tmp_path / "metrics.jsonl")
+    metrics.dump_jsonl(path)
+    with metrics.timer("stage_seconds", stage="dedup"):
+        pass
+    metrics.dump_jsonl(path)
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    assert records[0]["counters"] == metrics.counters()
+    assert [row["metric"] for row in records[1]["timings"]] == \
+        ["source_latency_seconds", "stage_seconds"]
+    metrics.reset()
+    assert metrics.timings() == [] and metrics.counters() == []
@@ -0,0 +1,102 @@
+from cache import make_key
+from query import INTERSECT, canonical_key, expand_query, parse_query, search_text
+from records import Reference
+from search import merge_references
+
+
+def test_expand_query_single_keyword():
+    assert expand_query("deep learning") == ("deep learning",)
+
+
+def test_expand_query_alternatives_and_groups():
+    assert expand_query("(deep OR machine) learning; transformer") == \
+        ("deep learning", "machine learning", "transformer")
+
+
+def test_expand_query_lowercase_or_is_a_word():
+    assert expand_query("black or white") == ("black or white",)
+
+
+def test_expand_query_drops_canonical_duplicates():
+    assert expand_query("Deep Learning | deep  learning") == ("Deep Learning",)
+
+
+def test_expand_query_keeps_fields_per_term():
+    assert expand_query("year:2020 deep | deep") == ("year:2020 deep", "deep")
+
+
+def test_canonical_key_ignores_term_order():
+    assert canonical_key("b | a") == canonical_key("a | b") == "a OR b"
+
+
+def test_key_ignores_case_and_spacing():
+    assert canonical_key("Deep  LEARNING") == canonical_key("deep learning") == "deep learning"
+
+
+def test_key_matches_search_text():
+    assert search_text("The Art of  Computer Programming") == "the art of computer programming"
+    assert parse_query("The Art of  Computer Programming").key == "the art of computer programming"
+    assert parse_query('"Deep Learning" for cats').key == '"deep learning" for cats'
+
+
+def test_short_words_keep_queries_apart():
+    # Kata pendek bisa mengubah makna; query ini tidak boleh berbagi cache atau hasil
+    for first, second in [("hepatitis A", "hepatitis"), ("vitamin A deficiency",
+                                                         "vitamin deficiency"),
+                          ("in vitro", "vitro"), ("The Deep Learning", "deep learning")]:
+        assert canonical_key(first) != canonical_key(second)
+        assert make_key("CrossRef", first, 10) != make_key("CrossRef", second, 10)
+    assert expand_query("hepatitis A; hepatitis") == ("hepatitis A", "hepatitis")
+
+
+def test_parse_query_fields():
+    query = parse_query('title:"Foo Bar" year:2019..2021 x')
+    assert query.fields == (("Title", "foo bar"), ("Year", "2019-2021"))
+    assert query.text == "x foo bar"
+    assert query.key == 'x foo bar title:"foo bar" year:"2019-2021"'
+
+
+def test_exact_title_ranks_first():
+    refs = [Reference(Title="Art Computer Programming Tools", Source="A"),
+            Reference(Title="The Art of Computer Programming", Source="B")]
+    results = merge_references(refs, "The Art of Computer Programming", 5)
+    assert results[0]["Title"] == "The Art of Computer Programming"
+    assert results[0]["Relevance"] == 100
+
+
+def _tagged(title, year, source):
+    return Reference(Title=title, Year=year, Source=source, Scores={"deep": 0})
+
+
+def test_merge_references_shared_search_text():
+    # Dua kata kunci dengan teks sumber yang sama ("deep") tetap menghasilkan data
+    refs = [_tagged("Deep nets", 2020, "A"), _tagged("Deep learning for cats", 2018, "B")]
+    union = merge_references(refs, "year:2020 deep | deep", 10)
+    assert [ref["Title"] for ref in union] == ["Deep nets", "Deep learning for cats"]
+    assert set(union[0]["Scores"]) == {"year:2020 deep", "deep"}
+
+    intersect = merge_references(refs, "year:2020 deep | deep", 10, combine=INTERSECT)
+    assert [ref["Title"] for ref in intersect] == ["Deep nets"]
+
+
+def test_merge_references_union_and_intersect():
+    refs = [
+        Reference(Title="Graph neural networks", Source="A", Scores={"graph": 0}),
+        Reference(Title="Graph transformer", Source="A", Scores={"graph": 0}),
+        Reference(Title="Graph transformer", Source="B", Scores={"transformer": 0}),
+    ]
+    union = merge_references(refs, "graph | transformer", 10)
+    assert sorted(ref["Title"] for ref in union) == ["Graph neural networks", "Graph transformer"]
+    merged = next(ref for ref in union if ref["Title"] == "Graph transformer")
+    assert set(merged["Scores"]) == {"graph", "transformer"}
+    assert merged["Relevance"] == max(merged["Scores"].values())
+    assert merged["Source"] == "A, B"
+
+    intersect = merge_references(refs, "graph | transformer", 10, combine=INTERSECT)
+    assert [ref["Title"] for ref in intersect] == ["Graph transformer"]
+    assert intersect[0]["Relevance"] == min(intersect[0]["Scores"].values())
+
+
+def test_merge_references_single_keyword_limits_results():
+    refs = [Reference(Title=f"Deep paper {i}", Source="A") for i in range(5)]
+    assert len(merge_references(refs, "deep", 3)) == 3
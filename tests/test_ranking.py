@@ -0,0 +1,66 @@
+import pytest
+
+from ranking import DEFAULT_SCORER, SCORERS, Scorer, get_scorer, rank_references, tokenize
+from records import Reference
+
+TITLES = ["Graph neural networks", "Neural networks for graphs", "Protein folding survey"]
+
+
+def _refs(*titles, journal="Unknown"):
+    return [Reference(Title=title, Journal=journal) for title in titles]
+
+
+def test_registry_order_and_default():
+    assert list(SCORERS) == ["Fuzzy judul", "BM25 judul + jurnal", "Gabungan (fuzzy + BM25)"]
+    assert get_scorer() is SCORERS[DEFAULT_SCORER]
+    assert [scorer.incremental for scorer in SCORERS.values()] == [True, False, False]
+
+
+def test_tokenize():
+    assert tokenize("Graph-Neural  Networks!") == ["graph", "neural", "networks"]
+    assert tokenize(None) == []
+
+
+def test_fuzzy_ignores_word_order_and_case():
+    scores = get_scorer("Fuzzy judul").score("graph neural networks", _refs(*TITLES))
+    assert scores[0] == 100
+    assert scores[0] > scores[1] > scores[2]
+    assert get_scorer("Fuzzy judul").score("x", []) == []
+
+
+def test_bm25_is_normalized_to_best_match():
+    refs = _refs(*TITLES) + _refs("Folding of graphs", journal="Graph Journal")
+    scores = get_scorer("BM25 judul + jurnal").score("graph", refs)
+    assert scores[0] == pytest.approx(100.0)
+    # Tanpa stemming: "graphs" bukan "graph"
+    assert scores[1] == scores[2] == 0.0
+    # Kata kunci di nama jurnal ikut dinilai, dokumen yang lebih panjang sedikit lebih rendah
+    assert 0 < scores[3] < 100
+    assert get_scorer("BM25 judul + jurnal").score("", refs) == [0.0] * len(refs)
+
+
+def test_weighted_combines_fuzzy_and_bm25():
+    refs = _refs(*TITLES)
+    fuzzy = get_scorer("Fuzzy judul").score("graph neural", refs)
+    bm25 = get_scorer("BM25 judul + jurnal").score("graph neural", refs)
+    combined = get_scorer("Gabungan (fuzzy + BM25)").score("graph neural", refs)
+    assert combined == pytest.approx([0.6 * f + 0.4 * b for f, b in zip(fuzzy, bm25)])
+
+
+def test_rank_references_fills_rounded_relevance():
+    refs = rank_references(_refs(*TITLES), "graph neural networks")
+    assert refs[0]["Relevance"] == 100
+    assert all(isinstance(ref["Relevance"], int) for ref in refs)
+    assert rank_references([], "x") == []
+
+
+def test_custom_scorer_can_be_plugged_in(monkeypatch):
+    class LengthScorer(Scorer):
+        name = "Panjang judul"
+
+        def score(self, keyword, references):
+            return [len(ref["Title"]) for ref in references]
+
+    monkeypatch.setitem(SCORERS, LengthScorer.name, LengthScorer())
+    refs = rank_references(_refs("ab", "abcd"), "x", "Panjang judul")
+    assert [ref["Relevance"] for ref in refs] == [2, 4]
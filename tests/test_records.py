@@ -0,0 +1,64 @@
+import pytest
+
+from records import FIELDS, SCORE_COLUMN, Reference, normalize_year, to_frame, to_references
+
+
+@pytest.mark.parametrize("value, expected", [
+    (2021, 2021), ("2021", 2021), ("2021-05-01", 2021), (2019.0, 2019),
+    ("N/A", None), (None, None), (0, None), (True, None), (float("nan"), None),
+])
+def test_normalize_year(value, expected):
+    assert normalize_year(value) == expected
+
+
+def test_reference_behaves_like_dict():
+    ref = Reference(Title="Deep nets", Year="2020-01-02", Source="CrossRef")
+    assert ref["Year"] == 2020
+    assert ref.get("DOI") is None and ref.get("DOI", "-") == "-"
+    assert dict(ref) == ref.to_dict()
+    assert list(ref) == list(FIELDS)
+    assert "Title" in ref and "Abstract" not in ref
+    ref["Year"] = "published 2018"
+    assert ref.Year == 2018
+    with pytest.raises(KeyError):
+        ref["Abstract"] = "x"
+    with pytest.raises(AttributeError):
+        ref.extra = 1
+
+
+def test_reference_round_trip():
+    data = {"Title": "Deep nets", "Authors": "A. B", "Year": 2020, "DOI": "10.1000/a1",
+            "Scores": {"deep": 90}, "Ignored": "x"}
+    ref = Reference.from_dict(data)
+    assert Reference.from_dict(ref.to_dict()) == ref
+    assert ref["Journal"] == "Unknown"
+    assert to_references([data, ref]) == [ref, ref]
+
+
+def test_copy_does_not_share_scores():
+    ref = Reference(Title="Deep nets", Scores={"deep": 90})
+    copy = ref.copy()
+    copy["Scores"]["deep"] = 10
+    assert ref["Scores"] == {"deep": 90}
+
+
+def test_to_frame_columns_and_dtypes():
+    results = [Reference(Title="A", Year=2020, Source="CrossRef", Relevance=90,
+                         Scores={"deep": 90}),
+               {"Title": "B", "Year": "N/A", "Source": "IEEE Xplore", "Relevance": 40,
+                "Scores": {"deep": 10, "nets": 40}}]
+    frame = to_frame(results)
+    score_deep, score_nets = SCORE_COLUMN.format("deep"), SCORE_COLUMN.format("nets")
+    assert list(frame.columns) == [field for field in FIELDS if field != "Scores"] + \
+        [score_deep, score_nets]
+    assert str(frame["Source"].dtype) == "category"
+    assert str(frame["Year"].dtype) == "Int16"
+    assert frame["Year"].isna().tolist() == [False, True]
+    assert frame["Relevance"].tolist() == [90, 40]
+    assert frame[score_nets].isna().tolist() == [True, False]
+
+
+def test_to_frame_subset_and_empty():
+    frame = to_frame([Reference(Title="A")], columns=("Title", "Year"))
+    assert list(frame.columns) == ["Title", "Year"]
+    assert len(to_frame([])) == 0
@@ -0,0 +1,128 @@
+import time
+
+import pytest
+
+from resilience import CircuitBreaker, ServiceClock, parse_retry_after
+
+
+def _fail(breaker, times):
+    for _ in range(times):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    _fail(breaker, 1)
+    breaker.record_success()
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.02)
+    _fail(breaker, 1)
+    time.sleep(0.03)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.is_open()
+    assert breaker.allow()
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+
+def test_probe_success_closes():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.02)
+    _fail(breaker, 1)
+    time.sleep(0.03)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.02)
+    _fail(breaker, 5)
+    time.sleep(0.03)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_release_unlocks_cancelled_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.02)
+    _fail(breaker, 1)
+    time.sleep(0.03)
+    probe = breaker.allow()
+    assert probe
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_cancelled_request_does_not_release_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.02)
+    # Permintaan biasa dimulai saat breaker masih tertutup
+    ticket = breaker.allow()
+    breaker.record_failure()
+    time.sleep(0.03)
+    probe = breaker.allow()
+    assert probe
+    # Permintaan biasa tadi dibatalkan saat percobaan half-open masih berjalan
+    breaker.release(ticket)
+    assert breaker.is_open()
+    assert not breaker.allow()
+    breaker.release(probe)
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize("value, expected", [("3", 3.0), (None, None), ("soon", None)])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_service_clock_not_started():
+    clock = ServiceClock()
+    assert clock.elapsed() == 0.0
+    assert clock.remaining(7) == 7
+
+
+def test_service_clock_pauses_while_only_queued():
+    clock = ServiceClock()
+    clock.start(10)
+    clock.queue()
+    time.sleep(0.05)
+    assert clock.elapsed() < 0.02
+    clock.serve()
+    time.sleep(0.05)
+    assert 0.04 <= clock.elapsed() < 0.08
+    clock.finish(True)
+    assert clock.remaining(30) == pytest.approx(10 - clock.elapsed(), abs=0.01)
+    assert clock.remaining(1) == 1
+
+
+def test_service_clock_runs_while_a_page_is_served():
+    clock = ServiceClock()
+    clock.start(10)
+    clock.queue()
+    clock.serve()
+    clock.queue()
+    time.sleep(0.05)
+    assert clock.elapsed() >= 0.04
+    # Halaman yang batal saat mengantre tidak menahan jam
+    clock.finish(False)
+    clock.finish(True)
+    before = clock.elapsed()
+    time.sleep(0.02)
+    assert clock.elapsed() > before
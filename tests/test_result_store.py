@@ -0,0 +1,70 @@
+import time
+
+import result_store
+from records import Reference
+from result_store import ResultEntry, ResultStore, query_key
+
+
+def test_query_key_separates_api_key_credentials():
+    sources = ["CrossRef", "ScienceDirect"]
+    base = query_key("deep learning", 20, sources, None, api_keys={"ScienceDirect": "key-1"})
+    assert base == query_key("Deep  Learning", 20, sources[::-1], None,
+                             api_keys={"ScienceDirect": "key-1"})
+    assert base != query_key("deep learning", 20, sources, None,
+                             api_keys={"ScienceDirect": "key-2"})
+    assert "key-1" not in base
+    # Key untuk sumber yang tidak dipilih atau tanpa API key tidak mengubah kunci
+    assert query_key("deep learning", 20, ["CrossRef"], None) == \
+        query_key("deep learning", 20, ["CrossRef"], None,
+                  api_keys={"ScienceDirect": "key-1", "CrossRef": "x"})
+
+
+def test_query_key_separates_approximate_topk():
+    assert query_key("deep learning", 20, ["CrossRef"], None) != \
+        query_key("deep learning", 20, ["CrossRef"], None, approximate=True)
+
+
+def _entry():
+    return ResultEntry([
+        Reference(Title="Graph networks", Year=2021, Source="CrossRef", Relevance=60),
+        Reference(Title="Deep graphs", Year=2018, Source="CrossRef, Semantic Scholar",
+                  Relevance=90),
+        Reference(Title="Protein folding", Source="Semantic Scholar", Relevance=30),
+    ])
+
+
+def test_view_sorts_and_filters_without_refetching():
+    entry = _entry()
+    assert [ref["Title"] for ref in entry.view().results] == \
+        ["Deep graphs", "Graph networks", "Protein folding"]
+    # Tahun kosong di akhir, apa pun arahnya
+    assert [ref["Title"] for ref in entry.view("Tahun terlama").results] == \
+        ["Deep graphs", "Graph networks", "Protein folding"]
+    # Sumber gabungan cocok jika salah satu sumbernya dipilih
+    assert [ref["Title"] for ref in entry.view(sources=["Semantic Scholar"]).results] == \
+        ["Deep graphs", "Protein folding"]
+    assert [ref["Title"] for ref in entry.view(years=(2020, 2022), text="GRAPH").results] == \
+        ["Graph networks"]
+    assert entry.sources() == ["CrossRef", "Semantic Scholar"]
+    assert entry.year_range() == (2018, 2021)
+
+
+def test_view_cache_is_dropped_after_enrichment():
+    entry = _entry()
+    first = entry.view("Judul (A-Z)")
+    assert entry.view("Judul (A-Z)") is first
+    entry._on_enriched(1)
+    second = entry.view("Judul (A-Z)")
+    assert second is not first
+    assert second.filter_key == first.filter_key and second.key != first.key
+
+
+def test_store_is_lru_with_ttl(monkeypatch):
+    store = ResultStore(2, ttl=60)
+    entries = [store.put(key, _entry()) for key in ("a", "b")]
+    assert store.get("a") is entries[0]
+    store.put("c", _entry())
+    assert store.get("b") is None and store.get("a") is entries[0]
+    now = time.time()
+    monkeypatch.setattr(result_store.time, "time", lambda: now + 61)
+    assert store.get("a") is None
@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+
+from resilience import UpstreamError
+from scholar_pool import ProxyPool, ScholarPool, ScholarWorker, _WorkerHandle
+
+
+def _pool(*proxies, checker=lambda proxy: False):
+    return ProxyPool(proxies, cooldown=60, checker=checker)
+
+
+def test_proxies_rotate_round_robin():
+    proxies = _pool("p1", "p2", "p3")
+    assert [proxies.acquire() for _ in range(4)] == ["p1", "p2", "p3", "p1"]
+    assert _pool().acquire() is None
+
+
+def test_bad_proxy_is_skipped_then_rechecked(monkeypatch):
+    checked = []
+    proxies = _pool("p1", "p2", checker=lambda proxy: checked.append(proxy) or True)
+    proxies.mark_bad("p1")
+    assert [proxies.acquire() for _ in range(3)] == ["p2", "p2", "p2"]
+    assert proxies.status() == [{"proxy": "p1", "healthy": False},
+                                {"proxy": "p2", "healthy": True}]
+    # Setelah cooldown, p1 diperiksa ulang dan dipakai lagi jika lolos
+    now = time.monotonic()
+    monkeypatch.setattr("scholar_pool.time.monotonic", lambda: now + 61)
+    assert [proxies.acquire() for _ in range(2)] == ["p1", "p2"]
+    assert checked == ["p1"]
+
+
+def test_acquire_without_wait_rechecks_in_background(monkeypatch):
+    release, checked = threading.Event(), threading.Event()
+
+    def checker(proxy):
+        release.wait(5)
+        checked.set()
+        return True
+
+    proxies = _pool("p1", "p2", checker=checker)
+    proxies.mark_bad("p1")
+    now = time.monotonic()
+    monkeypatch.setattr("scholar_pool.time.monotonic", lambda: now + 61)
+    # Pemeriksaan p1 yang lambat tidak menahan pemanggil (mis. thread dispatch)
+    assert proxies.acquire(wait=False) == "p2"
+    release.set()
+    assert checked.wait(5)
+    for _ in range(100):
+        if proxies.status()[0]["healthy"]:
+            break
+        time.sleep(0.01)
+    assert [proxies.acquire(wait=False) for _ in range(2)] == ["p1", "p2"]
+
+
+def test_all_proxies_bad_means_direct_connection():
+    proxies = _pool("p1")
+    proxies.mark_bad("p1")
+    assert proxies.acquire() is None
+
+
+class _FakeProcess:
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.alive = False
+
+
+# Pool tanpa proses: satu handle dengan antrean biasa, dijawab oleh thread "worker";
+# reply None = worker macet (tidak pernah menjawab)
+def _fake_pool(proxies, reply, timeout=5):
+    pool = ScholarPool(workers=1, proxies=proxies, timeout=timeout)
+    tasks = queue.Queue()
+    pool._handles = [_WorkerHandle(_FakeProcess(), tasks, None, pool.proxies.acquire())]
+
+    def worker():
+        message = tasks.get(timeout=5)
+        if reply is None:
+            return
+        with pool._lock:
+            future, _ = pool._futures.pop(message[1])
+        future.set_result(reply(message))
+
+    threading.Thread(target=worker, daemon=True).start()
+    return pool, tasks
+
+
+def test_fetch_page_returns_worker_records():
+    pool, _ = _fake_pool([], lambda message: ("ok", [{"Title": message[2]}]))
+    assert pool.fetch_page("graph", 10, 0) == [{"Title": "graph"}]
+
+
+def test_hung_worker_is_terminated_on_timeout():
+    pool, _ = _fake_pool([], None, timeout=0.05)
+    process = pool._handles[0].process
+    with pytest.raises(TimeoutError):
+        pool.fetch_page("graph", 10, 0)
+    # Thread dispatch melihat proses berhenti dan menggantinya (_restart)
+    assert not process.is_alive()
+    assert pool._futures == {}
+
+
+def test_blocked_worker_rotates_proxy():
+    pool, tasks = _fake_pool(["p1", "p2"], lambda message: ("blocked", "captcha"))
+    with pytest.raises(UpstreamError):
+        pool.fetch_page("graph", 10, 0)
+    assert pool._handles[0].proxy == "p2"
+    assert tasks.get_nowait() == ("proxy", "p2")
+    assert pool.proxies.status()[0] == {"proxy": "p1", "healthy": False}
+
+
+def test_blocked_worker_without_healthy_proxy_goes_direct():
+    pool, tasks = _fake_pool(["p1"], lambda message: ("blocked", "captcha"))
+    with pytest.raises(UpstreamError):
+        pool.fetch_page("graph", 10, 0)
+    assert pool._handles[0].proxy is None
+    assert tasks.get_nowait() == ("proxy", None)
+
+
+# scholarly palsu: search_pubs menghasilkan paper bernomor mulai dari start_index
+class _FakeScholarly:
+    def __init__(self):
+        self.searches = []
+
+    def search_pubs(self, keyword, start_index=0):
+        self.searches.append((keyword, start_index))
+        for i in range(start_index, 25):
+            yield {"bib": {"title": f"{keyword} {i}", "author": ["Ada Lovelace"]}}
+
+
+def _worker(prefetch=1):
+    worker = ScholarWorker.__new__(ScholarWorker)
+    worker.scholarly = _FakeScholarly()
+    worker.prefetch = prefetch
+    worker._cursors = OrderedDict()
+    return worker
+
+
+def test_worker_reuses_warm_cursor_for_next_pages():
+    worker = _worker()
+    first = worker.fetch("graph", 10, 0)
+    assert [record["Title"] for record in first] == [f"graph {i}" for i in range(10)]
+    assert first[0]["Authors"] == "Ada Lovelace"
+    # Prefetch mengisi halaman berikutnya saat worker menganggur
+    while worker.prefetch_step():
+        pass
+    assert len(worker._cursors["graph"].records) == 20
+    assert [record["Title"] for record in worker.fetch("graph", 10, 10)][:1] == ["graph 10"]
+    assert len(worker.fetch("graph", 10, 20)) == 5
+    assert worker.fetch("graph", 5, 0) == first[:5]
+    assert worker.scholarly.searches == [("graph", 0)]
+
+
+def test_worker_starts_new_search_behind_or_far_ahead_of_cursor():
+    worker = _worker(prefetch=0)
+    worker.fetch("graph", 5, 10)
+    worker.fetch("graph", 5, 0)
+    worker.fetch("graph", 5, 20)
+    assert worker.scholarly.searches == [("graph", 10), ("graph", 0), ("graph", 20)]
@@ -0,0 +1,162 @@
+from query import UNION
+from records import Reference
+from search import MAX_SCORE, TopKMerge, merge_references
+from sources import SourceBatch
+
+QUERY = "graph neural networks drug discovery"
+SEMANTIC = ["Graph neural networks in drug discovery", "Graph networks for drug discovery",
+            "Graph neural network drug discovery review",
+            "Graph neural networks for molecule discovery",
+            "Deep graph neural networks for chemistry", "Neural networks for drug design",
+            "Neural graph networks for drug screening"]
+CROSSREF_PAGES = [["A survey of protein folding", "Crystal structures of enzymes"],
+                  ["Drug discovery with graph neural networks"]]
+
+
+def _batches():
+    yield SourceBatch("Semantic Scholar", [Reference(Title=t, Source="Semantic Scholar")
+                                           for t in SEMANTIC], None, 0.1)
+    for page in CROSSREF_PAGES:
+        yield SourceBatch("CrossRef", [Reference(Title=t, Source="CrossRef") for t in page],
+                          None, 0.1, False)
+
+
+# Seperti engine: sumber yang diminta berhenti tidak mengirim halaman berikutnya
+def _run(merger):
+    stopped, references = set(), []
+    for batch in _batches():
+        if batch.source in stopped:
+            continue
+        references.extend(ref.copy() for ref in batch.results)
+        merger.add(batch)
+        if merger.should_stop(batch.source):
+            stopped.add(batch.source)
+    return references, stopped
+
+
+def _titles(results):
+    return [(ref["Title"], ref["Relevance"]) for ref in results]
+
+
+def test_topk_matches_full_merge():
+    merger = TopKMerge(QUERY, 5)
+    references, stopped = _run(merger)
+    assert not stopped
+    expected = merge_references(references, QUERY, 5)
+    assert _titles(merger.results()) == _titles(expected)
+    assert expected[1]["Title"] == "Drug discovery with graph neural networks"
+
+
+def test_topk_stops_only_at_max_score():
+    merger = TopKMerge(QUERY, 2)
+    batch = SourceBatch("Semantic Scholar",
+                        [Reference(Title=QUERY, DOI=f"10.1000/{i}") for i in range(3)], None, 0.1)
+    merger.add(batch)
+    assert merger.threshold == MAX_SCORE
+    assert merger.should_stop("CrossRef")
+
+
+def test_approximate_topk_is_opt_in():
+    merger = TopKMerge(QUERY, 5, approximate=True)
+    _, stopped = _run(merger)
+    assert stopped == {"CrossRef"}
+    assert "Drug discovery with graph neural networks" not in \
+        [ref["Title"] for ref in merger.results()]
+
+
+def test_results_cache_is_refreshed_by_new_batches():
+    merger = TopKMerge(QUERY, 5)
+    batches = list(_batches())
+    merger.add(batches[0])
+    first = merger.results()
+    first.clear()
+    assert len(merger.results()) == 5
+    merger.add(batches[2])
+    assert "Drug discovery with graph neural networks" in \
+        [ref["Title"] for ref in merger.results()]
+
+
+def test_multi_keyword_uses_full_merge():
+    refs = [Reference(Title="Graph transformer", Source="A", Scores={"graph": 0}),
+            Reference(Title="Graph transformer", Source="B", Scores={"transformer": 0})]
+    merger = TopKMerge("graph | transformer", 5, combine=UNION)
+    assert not merger.incremental
+    merger.add(SourceBatch("CrossRef", refs, None, 0.1))
+    assert _titles(merger.results()) == \
+        _titles(merge_references([ref.copy() for ref in refs], "graph | transformer", 5))
+
+
+def _dual_batches(n):
+    titles = [f"Graph neural networks study number {i}" for i in range(n)]
+    yield SourceBatch("CrossRef", [Reference(Title=t, DOI=f"10.1234/abc{i}", Source="CrossRef")
+                                   for i, t in enumerate(titles)], None, 0.1)
+    yield SourceBatch("Google Scholar", [Reference(Title=t, Source="Google Scholar")
+                                         for t in titles], None, 0.1)
+
+
+def test_paper_with_and_without_doi_shares_one_group():
+    for k in (5, 8):
+        merger = TopKMerge("graph neural networks", k)
+        references = []
+        for batch in _dual_batches(12):
+            references.extend(ref.copy() for ref in batch.results)
+            merger.add(batch)
+        expected = merge_references(references, "graph neural networks", k)
+        results = merger.results()
+        assert len(results) == k
+        assert [(ref["Title"], ref["DOI"], ref["Source"]) for ref in results] == \
+            [(ref["Title"], ref["DOI"], ref["Source"]) for ref in expected]
+        assert all(ref["Source"] == "CrossRef, Google Scholar" for ref in results)
+
+
+def test_doi_bridges_title_groups():
+    merger = TopKMerge(QUERY, 5)
+    merger.add(SourceBatch("A", [Reference(Title=SEMANTIC[0], Source="A"),
+                                 Reference(Title=SEMANTIC[4], DOI="10.1000/x", Source="A")],
+                           None, 0.1))
+    # Judul SEMANTIC[0] dengan DOI milik record kedua: ketiganya makalah yang sama
+    merger.add(SourceBatch("B", [Reference(Title=SEMANTIC[0], DOI="10.1000/x", Source="B")],
+                           None, 0.1))
+    assert len(merger.results()) == 1
+
+
+def test_ties_keep_source_order():
+    # Judul berbeda dengan skor yang sama: merge_references mempertahankan urutan tiba
+    titles = [f"graph networks {word}" for word in
+              ("alpha", "bravo", "delta", "gamma", "omega", "sigma", "kappa", "theta")]
+    batches = [SourceBatch("CrossRef", [Reference(Title=t, Source="CrossRef") for t in titles[:4]],
+                           None, 0.1),
+               # Skor lebih tinggi yang tiba belakangan menggeser salah satu skor yang sama
+               SourceBatch("Semantic Scholar", [Reference(Title=t, Source="Semantic Scholar")
+                                                for t in ["Graph networks"] + titles[4:]],
+                           None, 0.1)]
+    merger = TopKMerge("graph networks", 3)
+    references = []
+    for batch in batches:
+        references.extend(ref.copy() for ref in batch.results)
+        merger.add(batch)
+    expected = merge_references(references, "graph networks", 3)
+    assert len({ref["Relevance"] for ref in expected[1:]}) == 1
+    assert _titles(merger.results()) == _titles(expected)
+    assert [ref["Title"] for ref in merger.results()] == ["Graph networks"] + titles[:2]
+
+
+def test_fuzzy_variants_match_full_merge():
+    # Varian judul fuzzy dari tiga sumber: record yang tidak masuk heap tetap mengubah
+    # frekuensi token dan blocking LSH dedup, jadi ikut dedup akhir
+    pages = {"CrossRef": ["delta deep alpha", "graph graph deeps",
+                          "bravo model alpha survey neural charlie.", "graph graph deeps",
+                          "graph delta delta survey graph models"],
+             "Semantic Scholar": ["bravo model alpha survey neural charlie a",
+                                  "survey neural bravo neural.", "graph graph deep"],
+             "OpenAlex": ["delta deep alpha a", "survey neural bravo neural a", "delta deep alpha."]}
+    merger = TopKMerge("graph neural networks", 3)
+    references = []
+    for source, titles in pages.items():
+        batch = SourceBatch(source, [Reference(Title=t, Source=source) for t in titles], None, 0.1)
+        references.extend(ref.copy() for ref in batch.results)
+        merger.add(batch)
+    expected = merge_references(references, "graph neural networks", 3)
+    assert [(ref["Title"], ref["Relevance"], ref["Source"]) for ref in merger.results()] == \
+        [(ref["Title"], ref["Relevance"], ref["Source"]) for ref in expected]
+    assert expected[0]["Source"] == "Semantic Scholar, OpenAlex"
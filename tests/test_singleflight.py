@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _slow(calls, release, value):
+    calls.append(value)
+    release.wait(5)
+    return value
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_same_key_calls_upstream_once():
+    flight = SingleFlight()
+    calls, release = [], threading.Event()
+    key = ("CrossRef", "deep learning", 20, 0)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.call, key, _slow, calls, release, "hasil", timeout=5)
+                   for _ in range(4)]
+        _wait_for(lambda: len(calls) == 1)
+        release.set()
+        results = [future.result() for future in futures]
+    assert results == ["hasil"] * 4
+    assert calls == ["hasil"]
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_call_upstream_separately():
+    flight = SingleFlight()
+    calls, release = [], threading.Event()
+    release.set()
+    assert flight.call(("CrossRef", "a", 20, 0), _slow, calls, release, "a") == "a"
+    assert flight.call(("CrossRef", "a", 20, 20), _slow, calls, release, "b") == "b"
+    assert calls == ["a", "b"]
+
+
+def test_error_reaches_every_caller_and_is_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+    key = ("Semantic Scholar", "x", 10, 0)
+
+    def fail():
+        release.wait(5)
+        raise ValueError("upstream")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flight.call, key, fail, timeout=5) for _ in range(2)]
+        _wait_for(lambda: flight.in_flight() == 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.call(key, lambda: "lagi") == "lagi"
+
+
+def test_caller_timeout_does_not_cancel_other_callers():
+    flight = SingleFlight()
+    calls, release = [], threading.Event()
+    key = ("CrossRef", "y", 20, 0)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        patient = pool.submit(flight.call, key, _slow, calls, release, "y", timeout=5)
+        _wait_for(lambda: len(calls) == 1)
+        with pytest.raises(FuturesTimeout):
+            flight.call(key, _slow, calls, release, "y", timeout=0.01)
+        release.set()
+        assert patient.result() == "y"
+    assert calls == ["y"]
+
+
+def test_acall_shares_one_coroutine():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main():
+        key = ("IEEE Xplore", "z", 25, 0)
+        return await asyncio.gather(*(flight.acall(key, fetch, "z", timeout=5) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["z", "z", "z"]
+    assert calls == ["z"]
+
+
+def test_acall_cancels_upstream_when_every_caller_leaves():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def fetch():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.acall(("IEEE Xplore", "w", 25, 0), fetch, timeout=0.01)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert cancelled == [True]
+    assert flight.in_flight() == 0
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from resilience import RateLimiter
+from sources import DEADLINE_FACTOR, MIN_SOURCE_DEADLINE, CrossRefSource, GoogleScholarSource
+
+
+# CrossRef tanpa jaringan: tiap panggilan afetch_page menunggu delays[i] lalu
+# mengembalikan nomor panggilannya
+class _StubCrossRef(CrossRefSource):
+    def __init__(self, *delays):
+        super().__init__()
+        self.limiter = None
+        self.delays = delays
+        self.calls = 0
+
+    async def afetch_page(self, keyword, count, offset, api_key=None):
+        call = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.delays[min(call, len(self.delays) - 1)])
+        return [call], None
+
+
+# CrossRef sinkron dengan `total` hasil di upstream; mencatat (count, offset) yang diminta
+class _PagedCrossRef(CrossRefSource):
+    def __init__(self, total, report_total=True):
+        super().__init__()
+        self.limiter = None
+        self.total = total
+        self.report_total = report_total
+        self.requested = []
+
+    def fetch_page(self, keyword, count, offset, api_key=None):
+        self.requested.append((count, offset))
+        results = list(range(offset, min(offset + count, self.total)))
+        return results, self.total if self.report_total else None
+
+    async def afetch_page(self, keyword, count, offset, api_key=None):
+        return self.fetch_page(keyword, count, offset, api_key)
+
+
+def _observe(source, seconds, times=20):
+    for _ in range(times):
+        source.latency.observe(seconds)
+
+
+def test_completed_page_is_latency_sample():
+    source = _StubCrossRef(0.01)
+    assert asyncio.run(source._arequest_page("x", 10, 0, None)) == ([0], None)
+    assert len(source.latency) == 1
+
+
+def test_cancelled_page_is_not_latency_sample():
+    source = _StubCrossRef(1.0)
+    for _ in range(5):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(source._arequest_page("x", 10, 0, None), 0.02))
+    assert len(source.latency) == 0
+    assert source.breaker.allow()
+
+
+def test_slow_page_is_hedged_and_first_answer_wins():
+    source = _StubCrossRef(1.0, 0.0)
+    _observe(source, 0.02)
+    assert asyncio.run(source._ahedged_page("x", 10, 0, None)) == ([1], None)
+    assert source.calls == 2
+    # Permintaan pertama yang kalah dibatalkan dan tidak ikut dicatat
+    assert len(source.latency) == 21
+
+
+def test_fast_page_is_not_hedged():
+    source = _StubCrossRef(0.0)
+    _observe(source, 0.05)
+    assert asyncio.run(source._ahedged_page("x", 10, 0, None)) == ([0], None)
+    assert source.calls == 1
+
+
+def test_hedging_needs_samples_and_opt_in():
+    source = _StubCrossRef(0.05, 0.0)
+    assert asyncio.run(source._ahedged_page("x", 10, 0, None)) == ([0], None)
+    source.hedged = False
+    _observe(source, 0.001)
+    assert asyncio.run(source._ahedged_page("x", 10, 0, None)) == ([1], None)
+    assert source.calls == 2
+
+
+def test_deadline_without_samples_is_limit():
+    assert _StubCrossRef(0).deadline(1000, 30) == 30
+
+
+def test_deadline_scales_with_page_rounds():
+    source = _StubCrossRef(0)
+    _observe(source, 2.0)
+    # 1 halaman: satu putaran; 5 halaman dengan page_concurrency 4: dua putaran
+    assert source.deadline(200, 60) == pytest.approx(2.0 * DEADLINE_FACTOR)
+    assert source.deadline(1000, 60) == pytest.approx(2.0 * DEADLINE_FACTOR * 2)
+    assert source.deadline(1000, 10) == 10
+
+
+def test_deadline_has_floor():
+    source = _StubCrossRef(0)
+    _observe(source, 0.01)
+    assert source.deadline(1000, 60) == MIN_SOURCE_DEADLINE
+
+
+def test_deadline_includes_rate_limiter_queue():
+    source = _StubCrossRef(0)
+    _observe(source, 2.0)
+    source.limiter = RateLimiter(20, 10)
+    # 20 halaman: 6 putaran, 10 halaman di atas burst menunggu token 0.5 detik
+    assert source.deadline(4000, 100) == pytest.approx(2.0 * DEADLINE_FACTOR * 6 + 0.5, abs=0.01)
+
+
+def test_page_plan():
+    source = CrossRefSource()
+    assert source.page_plan(150) == [(150, 0)]
+    assert source.page_plan(500) == [(200, 0), (200, 200), (100, 400)]
+    assert GoogleScholarSource().page_plan(25) == [(10, 0), (10, 10), (5, 20)]
+
+
+def test_remaining_pages():
+    source = CrossRefSource()
+    plan = source.page_plan(1000)
+    assert source._remaining_pages(plan, 200, None) == plan[1:]
+    # Halaman pertama tidak penuh: hasil sudah habis
+    assert source._remaining_pages(plan, 120, None) == []
+    # Total dari sumber memangkas halaman di luar jumlah hasil
+    assert source._remaining_pages(plan, 200, 450) == [(200, 200), (200, 400)]
+
+
+def test_search_fetches_pages_up_to_total():
+    source = _PagedCrossRef(450)
+    assert source.search("paging total", 1000) == list(range(450))
+    assert sorted(source.requested) == [(200, 0), (200, 200), (200, 400)]
+
+
+def test_search_without_total_stops_at_short_page():
+    source = _PagedCrossRef(150, report_total=False)
+    assert source.search("paging short", 1000) == list(range(150))
+    assert source.requested == [(200, 0)]
+
+
+def test_asearch_matches_search():
+    source = _PagedCrossRef(700)
+    assert asyncio.run(source.asearch("paging async", 500)) == list(range(500))
+    assert sorted(source.requested) == [(100, 400), (200, 0), (200, 200)]